@@ -0,0 +1,228 @@
+"""
+Scaling of the Testingaide epic/story loader with project size.
+
+Seeds projects of growing size into in-memory SQLite and MongoDB (mongomock)
+and loads them with EpicController.iter_project_epics_and_stories and with
+the previous per-row loader (one stories query per epic, one find_one per
+epic and per story). Every SQL statement and MongoDB call is delayed by a
+simulated network round trip, so the totals reflect what the query counts
+cost against real servers.
+
+Usage:
+    python benchmarks/epic_story_loader.py --stories 100,500,1000,2000 --rtt-ms 1
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+import mongomock
+import pymongo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# database.connection queries MongoDB at import time; seed an in-memory one
+pymongo.MongoClient = mongomock.MongoClient
+# Controllers build their LLM clients on creation; no request is sent
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import controllers.epic as epic_controller  # noqa: E402
+import database.models as models  # noqa: E402
+from controllers.epic import EpicController  # noqa: E402
+from database.connection import Base  # noqa: E402
+from database.models import Epic, Feature, Project, Story  # noqa: E402
+
+STORIES_PER_EPIC = 5
+
+
+class RoundTrips:
+    """Counts SQL statements and MongoDB calls, delaying each by the RTT"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.sql = 0
+        self.mongo = 0
+
+    def on_sql(self, *args) -> None:
+        self.sql += 1
+        time.sleep(self.rtt)
+
+    def on_mongo(self) -> None:
+        self.mongo += 1
+        time.sleep(self.rtt)
+
+
+class SlowCollection:
+    """MongoDB collection whose queries cost one round trip"""
+
+    def __init__(self, collection, trips: RoundTrips):
+        self._collection = collection
+        self._trips = trips
+
+    def find(self, *args, **kwargs):
+        self._trips.on_mongo()
+        return self._collection.find(*args, **kwargs)
+
+    def find_one(self, *args, **kwargs):
+        self._trips.on_mongo()
+        return self._collection.find_one(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+def seed(session, stories: int) -> int:
+    """Create a finalized project with `stories` stories; returns its ID"""
+    project = Project(name=f"Benchmark {stories}")
+    session.add(project)
+    session.flush()
+
+    epics = max(stories // STORIES_PER_EPIC, 1)
+    epic_docs = models.epic_description_collection.insert_many(
+        [{"description": f"Epic description {i}"} for i in range(epics)]
+    ).inserted_ids
+    story_docs = models.story_description_collection.insert_many(
+        [{"description": f"Story description {i}"} for i in range(stories)]
+    ).inserted_ids
+
+    story_index = 0
+    for index in range(epics):
+        feature = Feature(project_id=project.id, name=f"Feature {index}", is_finalized=True)
+        session.add(feature)
+        session.flush()
+        epic = Epic(
+            feature_id=feature.id,
+            name=f"Epic {index}",
+            mongo_description_id=str(epic_docs[index]),
+        )
+        session.add(epic)
+        session.flush()
+        count = stories // epics + (1 if index < stories % epics else 0)
+        for _ in range(count):
+            session.add(
+                Story(
+                    epic_id=epic.id,
+                    title=f"Story {story_index}",
+                    mongo_description_id=str(story_docs[story_index]),
+                )
+            )
+            story_index += 1
+    session.commit()
+    return project.id
+
+
+def per_row_loader(session, project_id: int) -> List[Dict]:
+    """The loader the Testingaide sync used before the single-pass one"""
+    epics = (
+        session.query(Epic)
+        .join(Feature)
+        .filter(Feature.project_id == project_id, Feature.is_finalized == True)  # noqa: E712
+        .all()
+    )
+    formatted_epics = []
+    for epic in epics:
+        epic_dict = {"id": epic.id, "name": epic.name, "description": ""}
+        epic_content = epic.get_description()
+        if epic_content and "description" in epic_content:
+            epic_dict["description"] = epic_content["description"]
+
+        stories = session.query(Story).filter(Story.epic_id == epic.id).all()
+        formatted_stories = []
+        for story in stories:
+            story_dict = {"id": story.id, "name": story.title, "description": ""}
+            story_content = story.get_description()
+            if story_content and "description" in story_content:
+                story_dict["description"] = story_content["description"]
+            formatted_stories.append(story_dict)
+
+        epic_dict["stories"] = formatted_stories
+        formatted_epics.append(epic_dict)
+    return formatted_epics
+
+
+def measure(name: str, load, trips: RoundTrips) -> Dict:
+    trips.sql = trips.mongo = 0
+    started = time.perf_counter()
+    first_epic = None
+    epics = []
+    for epic in load():
+        if first_epic is None:
+            first_epic = time.perf_counter() - started
+        epics.append(epic)
+    total = time.perf_counter() - started
+    return {
+        "loader": name,
+        "epics": epics,
+        "ms": round(total * 1000, 1),
+        "first_ms": round((first_epic or total) * 1000, 1),
+        "sql": trips.sql,
+        "mongo": trips.mongo,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--stories", default="100,500,1000,2000", help="Comma-separated story counts"
+    )
+    parser.add_argument(
+        "--rtt-ms", type=float, default=1.0, help="Simulated round trip per query"
+    )
+    args = parser.parse_args()
+
+    trips = RoundTrips(args.rtt_ms / 1000)
+    for name in ("epic_description_collection", "story_description_collection"):
+        slow = SlowCollection(getattr(models, name), trips)
+        setattr(models, name, slow)
+        setattr(epic_controller, name, slow)
+
+    print(f"{STORIES_PER_EPIC} stories per epic, {args.rtt_ms} ms per round trip")
+    print(
+        f"{'stories':>8} {'loader':>10} {'total ms':>10} {'first ms':>10} "
+        f"{'sql':>6} {'mongo':>6} {'speedup':>8}"
+    )
+
+    for stories in [int(n) for n in args.stories.split(",")]:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        event.listen(engine, "before_cursor_execute", trips.on_sql)
+        session = sessionmaker(bind=engine)()
+        try:
+            # Seeding is not measured
+            rtt, trips.rtt = trips.rtt, 0
+            project_id = seed(session, stories)
+            session.expire_all()
+            trips.rtt = rtt
+
+            controller = EpicController(session=session)
+            results = [
+                measure("per-row", lambda: per_row_loader(session, project_id), trips),
+                measure(
+                    "tree",
+                    lambda: controller.iter_project_epics_and_stories(project_id),
+                    trips,
+                ),
+            ]
+        finally:
+            session.close()
+            engine.dispose()
+
+        if results[0]["epics"] != results[1]["epics"]:
+            raise AssertionError(f"Loaders disagree for {stories} stories")
+
+        for result in results:
+            speedup = results[0]["ms"] / result["ms"] if result["ms"] else 0
+            print(
+                f"{stories:>8} {result['loader']:>10} {result['ms']:>10} "
+                f"{result['first_ms']:>10} {result['sql']:>6} {result['mongo']:>6} "
+                f"{speedup:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
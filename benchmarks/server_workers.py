@@ -0,0 +1,168 @@
+"""
+Throughput of the production server by number of worker processes.
+
+Starts server.py with DEBUG=False for each worker count, drives a GET
+endpoint from several client processes over keep-alive connections and
+reports requests per second and latency percentiles.
+
+The server needs the same environment as in production (.env with the API
+keys, reachable MySQL and MongoDB). The default endpoint, the DB pool stats,
+touches neither database per request, so the numbers show the HTTP stack's
+scaling rather than the databases'.
+
+Usage:
+    python benchmarks/server_workers.py --workers 1,2,4,8 --duration 10
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from constants import urls_v1  # noqa: E402
+
+
+def wait_until_ready(port: int, path: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", path)
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server did not answer {path} on port {port} in {timeout}s")
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DEBUG="False",
+        SERVER_WORKERS=str(workers),
+        SERVER_PORT=str(port),
+    )
+    # Own session: the server forwards signals to its whole process group
+    return subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def client(port: int, path: str, connections: int, duration: float) -> List[float]:
+    """Request `path` over `connections` keep-alive connections; latencies in seconds"""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run() -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        local = []
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            if response.status == 200:
+                local.append(time.monotonic() - started)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=run) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def measure(port: int, path: str, clients: int, concurrency: int, duration: float) -> Dict:
+    per_client = max(concurrency // clients, 1)
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.starmap(
+            client, [(port, path, per_client, duration)] * clients
+        )
+    latencies = sorted(latency for result in results for latency in result)
+    if not latencies:
+        return {"rps": 0.0, "p50_ms": None, "p99_ms": None}
+
+    def percentile(value: float) -> float:
+        return round(latencies[int(value * (len(latencies) - 1))] * 1000, 2)
+
+    return {
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": percentile(0.5),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in default_workers),
+        help="Comma-separated worker counts to benchmark",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    parser.add_argument("--concurrency", type=int, default=64, help="Open connections")
+    parser.add_argument("--clients", type=int, default=cores, help="Client processes")
+    parser.add_argument("--path", default=urls_v1.db_pool_stats)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{cores} cores, {args.concurrency} connections from {args.clients} client processes")
+    print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+
+    baseline = None
+    for workers in [int(n) for n in args.workers.split(",")]:
+        server = start_server(workers, args.port)
+        try:
+            wait_until_ready(args.port, args.path, timeout=60)
+            result = measure(
+                args.port, args.path, args.clients, args.concurrency, args.duration
+            )
+        finally:
+            stop_server(server)
+
+        baseline = baseline or result["rps"]
+        speedup = result["rps"] / baseline if baseline else 0
+        print(
+            f"{workers:>8} {result['rps']:>10} {result['p50_ms']!s:>8} "
+            f"{result['p99_ms']!s:>8} {speedup:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
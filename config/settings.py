@@ -7,6 +7,9 @@ MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
 MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', 'password')
 MYSQL_DB = os.environ.get('MYSQL_DB', 'my_database')
 MYSQL_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', 5))
+MYSQL_MAX_OVERFLOW = int(os.environ.get('MYSQL_MAX_OVERFLOW', 10))
+MYSQL_POOL_TIMEOUT = int(os.environ.get('MYSQL_POOL_TIMEOUT', 30))
 
 # MongoDB settings
 MONGO_HOST = os.environ.get('MONGO_HOST', 'localhost')
@@ -18,5 +21,77 @@ MONGO_URL = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB}"
 DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
 API_VERSION = 'v1'
 
+# Background job settings
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 2))
+
+# Server runtime settings (used when DEBUG is off)
+SERVER_PORT = int(os.environ.get('SERVER_PORT', 8000))
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 0))  # 0 = one per CPU core
+SHUTDOWN_GRACE_SECONDS = int(os.environ.get('SHUTDOWN_GRACE_SECONDS', 30))
+
+# LLM execution settings
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+LLM_EXECUTOR_WORKERS = int(os.environ.get('LLM_EXECUTOR_WORKERS', LLM_MAX_CONCURRENCY))
+LLM_HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', 50))
+LLM_HTTP_KEEPALIVE_CONNECTIONS = int(os.environ.get('LLM_HTTP_KEEPALIVE_CONNECTIONS', 20))
+LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+LLM_CACHE_TTL_SECONDS = int(os.environ.get('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 5000))
+
+# Document upload settings
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 50 * 1024 * 1024))
+DOCUMENT_PARSER_WORKERS = int(os.environ.get('DOCUMENT_PARSER_WORKERS', 0))  # 0 = one per CPU core
+PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK', 16))
+
+# Feature extraction settings. Documents longer than the threshold are split
+# into chunks of about FEATURE_CHUNK_CHARS and extracted in parallel.
+FEATURE_CHUNK_CHARS = int(os.environ.get('FEATURE_CHUNK_CHARS', 12000))
+FEATURE_CHUNK_CONCURRENCY = int(os.environ.get('FEATURE_CHUNK_CONCURRENCY', 4))
+FEATURE_CHUNKED_THRESHOLD_CHARS = int(os.environ.get('FEATURE_CHUNKED_THRESHOLD_CHARS', 24000))
+
+# Maximum epics generated at the same time by bulk generation
+EPIC_GENERATION_CONCURRENCY = int(os.environ.get('EPIC_GENERATION_CONCURRENCY', 5))
+
+# Maximum epics whose stories are generated at the same time by bulk generation
+STORY_GENERATION_CONCURRENCY = int(os.environ.get('STORY_GENERATION_CONCURRENCY', 5))
+
+# LLM fallback for ERD to SQL generation
+SQL_GENERATION_CONCURRENCY = int(os.environ.get('SQL_GENERATION_CONCURRENCY', 8))
+SQL_GENERATION_RETRIES = int(os.environ.get('SQL_GENERATION_RETRIES', 2))
+
+# Codegen agent runs. Each project uses two workers, one per side.
+CODEGEN_MODEL = os.environ.get('CODEGEN_MODEL', 'gpt-4o-2024-11-20')
+CODEGEN_WORKERS = int(os.environ.get('CODEGEN_WORKERS', 8))
+CODEGEN_RECURSION_LIMIT = int(os.environ.get('CODEGEN_RECURSION_LIMIT', 200))
+
+# Codegen agent context window. History beyond the token budget is folded
+# into a summary; tool outputs are cut to the size limits.
+CODEGEN_CONTEXT_TOKEN_BUDGET = int(os.environ.get('CODEGEN_CONTEXT_TOKEN_BUDGET', 60000))
+CODEGEN_KEEP_RECENT_MESSAGES = int(os.environ.get('CODEGEN_KEEP_RECENT_MESSAGES', 12))
+CODEGEN_TOOL_OUTPUT_MAX_CHARS = int(os.environ.get('CODEGEN_TOOL_OUTPUT_MAX_CHARS', 20000))
+CODEGEN_OLD_TOOL_OUTPUT_MAX_CHARS = int(os.environ.get('CODEGEN_OLD_TOOL_OUTPUT_MAX_CHARS', 2000))
+
+# Agent turns between flushes of buffered file writes to the workspace
+CODEGEN_FLUSH_EVERY_TURNS = int(os.environ.get('CODEGEN_FLUSH_EVERY_TURNS', 5))
+
+# Limits of list_files output in codegen runs
+CODEGEN_LIST_MAX_DEPTH = int(os.environ.get('CODEGEN_LIST_MAX_DEPTH', 6))
+CODEGEN_LIST_MAX_ENTRIES = int(os.environ.get('CODEGEN_LIST_MAX_ENTRIES', 300))
+
+# Shell commands of codegen runs: default and maximum seconds before a
+# command is killed, and characters of its output passed to the model
+CODEGEN_COMMAND_TIMEOUT = int(os.environ.get('CODEGEN_COMMAND_TIMEOUT', 300))
+CODEGEN_COMMAND_MAX_TIMEOUT = int(os.environ.get('CODEGEN_COMMAND_MAX_TIMEOUT', 1800))
+CODEGEN_COMMAND_OUTPUT_MAX_CHARS = int(os.environ.get('CODEGEN_COMMAND_OUTPUT_MAX_CHARS', 8000))
+
+# Maximum tool calls of one agent turn executed at the same time
+CODEGEN_TOOL_CONCURRENCY = int(os.environ.get('CODEGEN_TOOL_CONCURRENCY', 8))
+
 BASE_PATH = os.path.dirname('.')
-PROJECTS_PATH = os.path.join(BASE_PATH, 'projects_folder')
\ No newline at end of file
+PROJECTS_PATH = os.path.join(BASE_PATH, 'projects_folder')
+
+# SQLite database holding the checkpoints of codegen graph runs
+CODEGEN_CHECKPOINT_DB = os.environ.get(
+    'CODEGEN_CHECKPOINT_DB', os.path.join(PROJECTS_PATH, 'checkpoints.sqlite')
+)
@@ -58,6 +58,8 @@ class UrlsV1(Urls):
     urls_map = dict(
         **{
             "codegen": r"%s/codegen/(\d+)",
+            "codegen_runs": r"%s/codegen/(\d+)/runs",
+            "codegen_run": r"%s/codegen/runs/([\w-]+)",
             "data_models": r"%s/data_models",
             "data_model": r"%s/data_models/(\d+)",
             "deployments": r"%s/deployments",
@@ -70,7 +72,9 @@ class UrlsV1(Urls):
             "project_tech_bundle": r"%s/projects/(\d+)/tech-bundle",
             "epic": r"%s/projects/(\d+)/epics(?:/(\d+))?",
             "epic_generation": r"%s/projects/(\d+)/features/(\d+)/epic",
+            "epic_bulk_generation": r"%s/projects/(\d+)/epics/generate",
             "story_generation": r"%s/projects/(\d+)/epics/(\d+)/stories/generate",
+            "story_bulk_generation": r"%s/projects/(\d+)/stories/generate",
             "story": r"%s/projects/(\d+)/epics/(\d+)/stories(?:/(\d+))?",
             "erd": r"%s/projects/(\d+)/erd",
             "theme": r"%s/projects/(\d+)/theme",
@@ -84,6 +88,10 @@ class UrlsV1(Urls):
             "execute": r"%s/execute/(\d+)",
             "test_credentials": r"%s/projects/(\d+)/test-credentials",
             "testingaide_sync": r"%s/projects/(\d+)/testingaide/sync",
+            "job": r"%s/jobs/([0-9a-f]{24})",
+            "ws_job": r"%s/ws/jobs/([0-9a-f]{24})",
+            "db_pool_stats": r"%s/health/db-pool",
+            "llm_cache_stats": r"%s/health/llm-cache",
         }
     )
 
@@ -2,6 +2,24 @@ from database.connection import SessionLocal
 
 
 class BaseController:
-    def __init__(self):
+    def __init__(self, session=None):
+        """
+        Initialize the controller with a database session.
+
+        Args:
+            session (Session, optional): Session to share with a parent
+                controller. The controller that opened a session owns it
+                and is the only one that closes it.
+        """
         super().__init__()
-        self.session = SessionLocal()
+        self._owns_session = session is None
+        self.session = session if session is not None else SessionLocal()
+
+    def close(self):
+        """Roll back anything uncommitted and return the connection to the pool"""
+        if not self._owns_session:
+            return
+        try:
+            self.session.rollback()
+        finally:
+            self.session.close()
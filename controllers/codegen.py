@@ -1,149 +1,433 @@
+import asyncio
+import fcntl
 import json
 import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
 from controllers.base import BaseController
 from controllers.data_model import DataModelController
 from database.models import Project
-from utils.db_generator import MermaidToSQLAgent
+from database.connection import codegen_collection
 from config import settings
 from utils.code_generation.system_prompts import get_frontend_system_message, get_backend_system_message
 from utils.code_generation.graphs import AnthropicGraph, OpenAIGraph
+from utils.code_generation.checkpoints import CodegenCheckpoints, restore_workspace
+from utils.code_generation.overlay import OverlayFS
+from utils.code_generation.file_index import FileIndex
 from utils.code_generation.tests import frontend_prompt
 from langchain_core.messages import HumanMessage
-from config.settings import PROJECTS_PATH
+from config.settings import (
+    PROJECTS_PATH,
+    CODEGEN_MODEL,
+    CODEGEN_RECURSION_LIMIT,
+    CODEGEN_WORKERS,
+)
+from config.llm_config import LLM_MODELS
+
+CODEGEN_SIDES = ("frontend", "backend")
+
 class CodeGenController(BaseController):
 
+    # Projects with a running generation in this process, mapped to the
+    # descriptor of their lock file. The file lock is what the other server
+    # processes see; the kernel releases it if this process dies
+    _project_locks: Dict[int, int] = {}
+    _active_lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+
     def __init__(self):
         super().__init__()
 
-    def start_flow(
-        self, project_id: str
-    ):
-        # Based on project id, fetch frontend and backend prompt
-        print(project_id)
+    def prepare_flow(self, project_id: int, run_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Check that code can be generated for a project and take its
+        generation lock, before a stream or job is started.
 
+        The returned state is passed to start_flow, which releases the lock
+        when it ends. If start_flow never runs, release_flow must be called.
 
-        project = self.session.query(Project).filter(Project.id == project_id).first()
+        Args:
+            project_id (int): ID of the project
+            run_id (str, optional): Run to resume instead of starting anew
+
+        Returns:
+            The state start_flow runs with, or None if code is already being
+            generated for the project
 
+        Raises:
+            ValueError: If the project, its prompts or the run are not found
+        """
+        project_id = int(project_id)
+        project = self.session.query(Project).filter(Project.id == project_id).first()
         if not project:
-            return {"message": "Project not found", "code": 404}
+            raise ValueError(f"Project {project_id} not found")
 
         prompts = project.get_prompts()
-
         if not prompts:
-            return {"message": "Prompts not found", "code": 404}
-
-        frontend_document = prompts.get("frontend_prompt")
-        backend_document = prompts.get("backend_prompt")
-
-        print(frontend_document)
-        print(backend_document)
-        # Add this config to backend prompt
-        # config = self.generate_db(project_id)
-
-        base_path = self.get_base_path()
-
-        backend_system_message = get_backend_system_message(base_path)
-        # backend_graph = AnthropicGraph(backend_system_message, model_name='us.anthropic.claude-3-5-haiku-20241022-v1:0').generate_graph()
-        # backend_graph = OpenAIGraph(backend_system_message, model_name='gpt-4o-2024-11-20').generate_graph()
-
-
-        # backend_inputs = {
-        #     "messages": [
-        #         HumanMessage(
-        #             content=backend_document
-        #         )
-        #     ],
-        #     "base_path": base_path + "/backend"
-        # }
-        # try:
-        #     result = backend_graph.invoke(backend_inputs)
-        # except Exception as e:
-        #     print("BACKEND FAILED....")
-
-        # frontend_system_message = get_frontend_system_message(base_path)
-        # # frontend_graph = AnthropicGraph(frontend_system_message, model_name='us.anthropic.claude-3-5-haiku-20241022-v1:0').generate_graph()
-        # frontend_graph = OpenAIGraph(frontend_system_message, model_name='gpt-4o-2024-11-20').generate_graph()
-
-        # frontend_inputs = {
-        #     "messages": [
-        #         HumanMessage(
-        #             content=frontend_document
-        #         )
-        #     ],
-        #     "base_path": base_path + "/frontend"
-        # }
-        # try:
-        #     result = frontend_graph.invoke(frontend_inputs)
-        # except Exception as e:
-        #     print("FRONTEND FAILED....")
+            raise ValueError(f"Prompts not found for project {project_id}")
+
+        run = None
+        if run_id:
+            run = codegen_collection.find_one({"_id": run_id, "project_id": project_id})
+            if not run:
+                raise ValueError(f"Codegen run {run_id} not found for project {project_id}")
+
+        if not self._acquire(project_id):
+            return None
+        return {"project_id": project_id, "prompts": prompts, "run": run, "started": False}
+
+    @classmethod
+    def release_flow(cls, flow: Dict) -> None:
+        """Release the lock of a prepared flow that start_flow never ran"""
+        if not flow["started"]:
+            flow["started"] = True
+            cls._release(flow["project_id"])
+
+    async def start_flow(self, flow: Dict) -> AsyncIterator[Dict]:
+        """
+        Generate the frontend and backend of a project concurrently.
+
+        Each side runs its own agent graph on a worker thread, in its own
+        directory of the project's workspace, so the IOLoop stays free and
+        several projects can be generated at the same time. A side failing
+        does not stop the other one.
+
+        Graph state is checkpointed after every step. Resuming the run of an
+        earlier call restores the files written by the agent in the
+        workspace, skips finished sides and continues unfinished ones from
+        their last checkpoint.
+
+        Args:
+            flow (Dict): State returned by prepare_flow; the project's lock
+                is released when the flow ends
+
+        Yields:
+            A "progress" event whenever a side starts or finishes, then a
+            "complete" event with the workspace and each side's status
+        """
+        flow["started"] = True
+        project_id = flow["project_id"]
+        prompts = flow["prompts"]
+        run = flow["run"]
+
+        tasks = {}
+        try:
+            if run is None:
+                base_path = self.get_base_path(project_id)
+                run_id = self._create_run(project_id, base_path)
+            else:
+                run_id = run["_id"]
+                base_path = run["base_path"]
+
+            documents = {
+                "frontend": prompts.get("frontend_prompt"),
+                "backend": prompts.get("backend_prompt"),
+            }
+            sides = {
+                side: {"status": "PENDING", "seconds": None, "error": None}
+                for side in documents
+            }
+
+            loop = asyncio.get_running_loop()
+            for side, document in documents.items():
+                if not document:
+                    sides[side].update(status="SKIPPED", error="Prompt not found")
+                    continue
+                tasks[
+                    loop.run_in_executor(
+                        self._get_executor(),
+                        self._run_graph,
+                        run_id,
+                        side,
+                        document,
+                        os.path.join(base_path, side),
+                    )
+                ] = side
+                sides[side]["status"] = "RUNNING"
+                self._update_run(run_id, sides)
+                yield {"event": "progress", "data": {"side": side, **sides[side]}}
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    side = tasks[task]
+                    try:
+                        sides[side].update(status="COMPLETED", **task.result())
+                    except Exception as e:
+                        print(f"{side.capitalize()} generation failed for project {project_id}: {e}")
+                        sides[side].update(status="FAILED", error=str(e))
+                    self._update_run(run_id, sides)
+                    yield {"event": "progress", "data": {"side": side, **sides[side]}}
+
+            failed = [side for side, state in sides.items() if state["status"] != "COMPLETED"]
+            yield {
+                "event": "complete",
+                "data": {
+                    "message": (
+                        f"Code generation failed for: {', '.join(failed)}"
+                        if failed
+                        else "Code generation successful"
+                    ),
+                    "run_id": run_id,
+                    "base_path": base_path,
+                    "sides": sides,
+                },
+            }
+        finally:
+            # Threads can't be interrupted; a cancelled run keeps the project
+            # locked until its graphs return
+            running = [task for task in tasks if not task.done()]
+            if running:
+                asyncio.gather(*running, return_exceptions=True).add_done_callback(
+                    lambda _: self._release(project_id)
+                )
+            else:
+                self._release(project_id)
+
+    @staticmethod
+    def _lock_path(project_id: int) -> str:
+        return os.path.join(PROJECTS_PATH, f".codegen-{project_id}.lock")
+
+    @classmethod
+    def _acquire(cls, project_id: int) -> bool:
+        """Take a project's generation lock; False if any process holds it"""
+        os.makedirs(PROJECTS_PATH, exist_ok=True)
+        fd = os.open(cls._lock_path(project_id), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        with cls._active_lock:
+            cls._project_locks[project_id] = fd
+        return True
+
+    @classmethod
+    def _release(cls, project_id: int) -> None:
+        with cls._active_lock:
+            fd = cls._project_locks.pop(project_id, None)
+        if fd is not None:
+            # Closing the descriptor drops the lock
+            os.close(fd)
+
+    @classmethod
+    def _is_generating(cls, project_id: int) -> bool:
+        with cls._active_lock:
+            if project_id in cls._project_locks:
+                return True
+        if not os.path.exists(cls._lock_path(project_id)):
+            return False
+        if not cls._acquire(project_id):
+            return True
+        cls._release(project_id)
+        return False
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._active_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=CODEGEN_WORKERS, thread_name_prefix="codegen"
+                )
+            return cls._executor
+
+    @staticmethod
+    def _run_graph(run_id: str, side: str, document: str, workspace: str) -> Dict:
+        """
+        Run one side's agent graph to completion, resuming from its last
+        checkpoint if it has one.
+
+        Returns:
+            Seconds taken, how the checkpoint was used ("new", "resumed" or
+            "finished"), the number of workspace files restored and the
+            tool latency and disk write stats of the run
+        """
+        started = time.monotonic()
+        if side == "frontend":
+            system_message = get_frontend_system_message(workspace)
+        else:
+            system_message = get_backend_system_message(workspace)
+
+        graph_class = (
+            OpenAIGraph
+            if LLM_MODELS[CODEGEN_MODEL]["provider"] == "openai"
+            else AnthropicGraph
+        )
+        graph = graph_class(system_message, model_name=CODEGEN_MODEL).generate_graph(
+            checkpointer=CodegenCheckpoints.get_saver()
+        )
+        config = {
+            **CodegenCheckpoints.config(run_id, side),
+            "recursion_limit": CODEGEN_RECURSION_LIMIT,
+        }
+
+        os.makedirs(workspace, exist_ok=True)
+        state = graph.get_state(config)
+        restored = []
+        if state.values:
+            restored = restore_workspace(state.values.get("messages", []), workspace)
+
+        # File tools work in memory and flush periodically; anything not
+        # flushed when a run dies is restored from its checkpoint on resume
+        OverlayFS.open(workspace)
+        try:
+            if not state.values:
+                checkpoint = "new"
+                graph.invoke(
+                    {"messages": [HumanMessage(content=document)], "base_path": workspace},
+                    config=config,
+                )
+            else:
+                checkpoint = "resumed" if state.next else "finished"
+                if state.next:
+                    graph.invoke(None, config=config)
+        finally:
+            filesystem = OverlayFS.close(workspace)
+            FileIndex.drop(workspace)
+        print(f"Codegen {run_id} {side} filesystem: {filesystem}")
+
+        return {
+            "seconds": round(time.monotonic() - started, 2),
+            "checkpoint": checkpoint,
+            "restored_files": len(restored),
+            "filesystem": filesystem,
+        }
+
+    @staticmethod
+    def _create_run(project_id: int, base_path: str) -> str:
+        """Record a new run; its id also names the graph checkpoints"""
+        run_id = f"{project_id}-{uuid.uuid4().hex[:12]}"
+        now = datetime.now(timezone.utc)
+        codegen_collection.insert_one(
+            {
+                "_id": run_id,
+                "project_id": project_id,
+                "base_path": base_path,
+                "sides": {},
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        return run_id
 
+    @staticmethod
+    def _update_run(run_id: str, sides: Dict) -> None:
+        codegen_collection.update_one(
+            {"_id": run_id},
+            {"$set": {"sides": sides, "updated_at": datetime.now(timezone.utc)}},
+        )
 
-    def generate_db(self, project_id: int):
-        """Add shreyas code"""
-        # agent = MermaidToSQLAgent()
+    def list_runs(self, project_id: int) -> Dict:
+        """
+        List the codegen runs of a project, newest first, with the number of
+        checkpoints stored for each side.
+        """
+        runs = list(
+            codegen_collection.find({"project_id": int(project_id)}).sort(
+                "created_at", -1
+            )
+        )
+        thread_ids = [
+            CodegenCheckpoints.thread_id(run["_id"], side)
+            for run in runs
+            for side in CODEGEN_SIDES
+        ]
+        counts = CodegenCheckpoints.count(thread_ids)
+
+        for run in runs:
+            run["run_id"] = run.pop("_id")
+            run["checkpoints"] = {
+                side: counts[CodegenCheckpoints.thread_id(run["run_id"], side)]
+                for side in CODEGEN_SIDES
+            }
+        return {"runs": runs}
+
+    def delete_run(self, run_id: str) -> Dict:
+        """
+        Delete a run and its checkpoints. The workspace is left in place.
+
+        Raises:
+            ValueError: If the run is not found or its project is generating
+        """
+        run = codegen_collection.find_one({"_id": run_id})
+        if not run:
+            raise ValueError(f"Codegen run {run_id} not found")
+        return self._delete_runs([run])
+
+    def delete_runs(
+        self, project_id: int, older_than_days: Optional[float] = None
+    ) -> Dict:
+        """
+        Delete the runs of a project and their checkpoints, optionally only
+        those created more than `older_than_days` days ago.
+
+        Raises:
+            ValueError: If code is being generated for the project
+        """
+        query = {"project_id": int(project_id)}
+        if older_than_days is not None:
+            query["created_at"] = {
+                "$lt": datetime.now(timezone.utc) - timedelta(days=older_than_days)
+            }
+        return self._delete_runs(list(codegen_collection.find(query)))
+
+    def _delete_runs(self, runs: List[Dict]) -> Dict:
+        for project_id in {run["project_id"] for run in runs}:
+            if self._is_generating(project_id):
+                raise ValueError(f"Code is being generated for project {project_id}")
+
+        deleted = CodegenCheckpoints.delete(
+            [
+                CodegenCheckpoints.thread_id(run["_id"], side)
+                for run in runs
+                for side in CODEGEN_SIDES
+            ]
+        )
+        run_ids = [run["_id"] for run in runs]
+        if run_ids:
+            codegen_collection.delete_many({"_id": {"$in": run_ids}})
 
-        # # Initialize and execute SQLAgent
-        # statements = agent.process_mermaid(erd_schema)
-        # agent.write_schema_file(statements)
-        # agent.execute_sql_file()
+        return {
+            "message": f"Deleted {len(run_ids)} codegen run(s)",
+            "run_ids": run_ids,
+            "deleted_checkpoints": deleted,
+        }
 
-        data_model_controller = DataModelController()
+    def generate_db(self, project_id: int):
+        """Create the project's database from its ERD schema, see DataModelController.generate_db"""
+        data_model_controller = DataModelController(session=self.session)
         config = data_model_controller.generate_db(project_id=project_id)
 
         return json.dumps(config, indent=4)
 
-    def generate_code(
-        self,
-        frontend_document: str,
-        backend_document: str,
-        erd_schema: str,
-        config: dict,
-    ):
-        """Add akhil code"""
-
-        # Gets project id too
-        base_path, project_id = self.get_base_path()
-
-        # Generate frontend code
-        if not self.gen_frontend(frontend_document, project_id, base_path):
-            return "", 0, {"message": "Code generation failed", "code": 500}
-
-        # Generate backend code
-        if not self.gen_backend(
-            backend_document, erd_schema, project_id, base_path, config
-        ):
-            return "", 0, {"message": "Code generation failed", "code": 500}
-
-        return (
-            base_path,
-            project_id,
-            {"message": "Code generation successful", "code": 200},
-        )
-
-    def get_base_path(self, project_id: int = 1):
+    def get_base_path(self, project_id: int) -> str:
+        """
+        Create an empty workspace for a project under PROJECTS_PATH.
 
-        # Code to get a base path for a particular project id, delete existing directory if it exists
-        base_path = PROJECTS_PATH
-        if not os.path.exists(base_path):
-            os.makedirs(base_path)
+        Any previous output of the project is removed; each side gets its
+        own subdirectory.
 
-        if os.path.exists(base_path + "/" + str(project_id)):
-            os.system("rm -rf " + base_path + "/" + str(project_id))
+        Returns:
+            Path of the project's workspace
+        """
+        base_path = os.path.join(PROJECTS_PATH, str(int(project_id)))
+        if os.path.exists(base_path):
+            shutil.rmtree(base_path)
+        for side in CODEGEN_SIDES:
+            FileIndex.drop(os.path.join(base_path, side))
 
-        return base_path + "/" + str(project_id)
+        for side in CODEGEN_SIDES:
+            os.makedirs(os.path.join(base_path, side))
 
-    def gen_frontend(self, frontend_document: str, project_id: int, base_path: str):
-        return True
-
-    def gen_backend(
-        self,
-        backend_document: str,
-        erd_schema: str,
-        project_id: int,
-        base_path: str,
-        config: dict,
-    ):
-        return True
+        return base_path
 
 
 # class CodeGenAsyncController(BaseAsyncController):
\ No newline at end of file
@@ -4,6 +4,7 @@ import pymysql
 from controllers.base import BaseController
 from database.models import Project, DataModel, DataColumn
 from utils.db_generator import MermaidToSQLAgent
+from utils.schema_introspection import SchemaIntrospector
 
 class DataModelController(BaseController):
 
@@ -15,6 +16,8 @@ class DataModelController(BaseController):
             "password": os.getenv("DB_PASSWORD"),
             "database": os.getenv("DB_NAME"),
         }
+        # Per-statement results of the last generate_db run
+        self.execution_report = None
 
     def generate_db(self, project_id):
         """Generates a database schema from a project's ERD schema."""
@@ -43,9 +46,9 @@ class DataModelController(BaseController):
 
             # Initialize and execute SQLAgent
             statements = agent.process_mermaid(erd_schema)
-            agent.write_schema_file(statements)
-            agent.execute_sql_file()
-
+            report = agent.execute_schema(statements, db_config)
+            self.execution_report = report.dict()
+            SchemaIntrospector.invalidate(db_config)
 
             self.store_data(db_config, project_id)
 
@@ -89,209 +92,151 @@ class DataModelController(BaseController):
         return {"tables": tables_metadata}
 
     def store_data(self, config, project_id):
-        """Stores metadata of tables and columns in the database for a project."""
-        try:
-            # Delete existing records
-            self.session.query(DataColumn).filter(
-                DataColumn.table_id.in_(
-                    self.session.query(DataModel.id).filter(DataModel.project_id == project_id)
-                )
-            ).delete(synchronize_session=False)
-
-            self.session.query(DataModel).filter(DataModel.project_id == project_id).delete(synchronize_session=False)
-            self.session.commit()
-
-        except Exception as e:
-            self.session.rollback()
-            print(f"Error deleting previous records for project {project_id}: {e}")
-            return None
-
-        column_query = """
-        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY
-        FROM information_schema.columns
-        WHERE TABLE_SCHEMA = %s
-        """
-
-        primary_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME
-        FROM information_schema.columns
-        WHERE TABLE_SCHEMA = %s AND COLUMN_KEY = 'PRI'
         """
+        Stores metadata of tables and columns in the database for a project.
 
-        foreign_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
-        FROM information_schema.KEY_COLUMN_USAGE
-        WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL
-        """
-
-        unique_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME
-        FROM information_schema.columns
-        WHERE TABLE_SCHEMA = %s AND COLUMN_KEY = 'UNI'
+        Stored metadata is diffed against the live schema and only the
+        differences are written, in one transaction.
         """
         try:
-            with self.connect_db_with_config(config) as connection:
-                with connection.cursor() as cursor:
-                    cursor.execute(column_query, (config["database"],))
-                    columns = cursor.fetchall()
-
-                    cursor.execute(primary_key_query, (config["database"],))
-                    primary_keys = {f"{row['TABLE_NAME']}.{row['COLUMN_NAME']}" for row in cursor.fetchall()}
-
-                    cursor.execute(foreign_key_query, (config["database"],))
-                    foreign_keys = cursor.fetchall()
-
-                    cursor.execute(unique_key_query, (config["database"],))
-                    unique_keys = {f"{row['TABLE_NAME']}.{row['COLUMN_NAME']}" for row in cursor.fetchall()}
-
+            tables_metadata = SchemaIntrospector.get_tables(config)
         except Exception as e:
             print(f"Error fetching schema metadata from MySQL: {e}")
             return None
 
-        # Organizing table metadata
-        tables_metadata = {}
-
-        for col in columns:
-            table_name = col["TABLE_NAME"]
-            column_name = col["COLUMN_NAME"]
-
-            if table_name not in tables_metadata:
-                tables_metadata[table_name] = {"columns": []}
-
-            relation = None
-            key = f"{table_name}.{column_name}"
-            is_unique = key in unique_keys
-            
-            if key in primary_keys:
-                relation = "PRIMARY"
-
-            for fk in foreign_keys:
-                if fk["TABLE_NAME"] == table_name and fk["COLUMN_NAME"] == column_name:
-                    relation = f"FOREIGN KEY {fk['TABLE_NAME']}({column_name}) -> {fk['REFERENCED_TABLE_NAME']}({fk['REFERENCED_COLUMN_NAME']})"
-
-            tables_metadata[table_name]["columns"].append(
-                {
-                    "column_name": column_name,
-                    "column_type": col["COLUMN_TYPE"],
-                    "is_nullable": col["IS_NULLABLE"],
-                    "is_unique": is_unique,
-                    "relation": relation,
-                }
-            )
-        
-        print(tables_metadata)    
-        # Insert tables and columns into database
         try:
-            for table_name, metadata in tables_metadata.items():
-                new_table = DataModel(project_id=project_id, table_name=table_name)
-                self.session.add(new_table)
-                self.session.commit()
-
-                for column in metadata["columns"]:
-                    new_column = DataColumn(
-                        table_id=new_table.id,
-                        column_name=column["column_name"],
-                        column_type=column["column_type"],
-                        is_nullable=(column["is_nullable"] == "YES"),
-                        is_unique=column["is_unique"],
-                        relationships=column["relation"]
-                    )
-                    self.session.add(new_column)
-
-            self.session.commit()
-
+            changes = self._sync_metadata(project_id, tables_metadata)
         except Exception as e:
             self.session.rollback()
             print(f"Error storing metadata for project {project_id}: {e}")
             return None
 
-        return {"tables": tables_metadata}
-
-    def get_many(self):
-        """Returns metadata for all tables, including primary keys and relationships directly in columns."""
+        return {"tables": tables_metadata, "changes": changes}
 
-        # Query to get all table columns
-        column_query = """
-        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY
-        FROM information_schema.columns 
-        WHERE TABLE_SCHEMA = %s
+    def _sync_metadata(self, project_id, tables_metadata):
         """
+        Apply the difference between stored and live table metadata.
 
-        # Query to get primary keys
-        primary_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME
-        FROM information_schema.columns
-        WHERE TABLE_SCHEMA = %s AND COLUMN_KEY = 'PRI'
-        """
+        Rows are compared by table and column name; unchanged rows are not
+        touched, so syncing an unchanged schema only costs the two reads.
 
-        # Query to get foreign keys
-        foreign_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
-        FROM information_schema.KEY_COLUMN_USAGE
-        WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL
-        """
-        
-        unique_key_query = """
-        SELECT TABLE_NAME, COLUMN_NAME
-        FROM information_schema.columns
-        WHERE TABLE_SCHEMA = %s AND COLUMN_KEY = 'UNI'
+        Returns:
+            Dict counting inserted, updated and deleted tables and columns
         """
+        changes = {
+            "tables_inserted": 0,
+            "tables_deleted": 0,
+            "columns_inserted": 0,
+            "columns_updated": 0,
+            "columns_deleted": 0,
+        }
 
-        connection = self._connect_db()
-        with connection.cursor() as cursor:
-            # Fetch all table column metadata
-            cursor.execute(column_query, (self.db_config["database"],))
-            columns = cursor.fetchall()
-
-            # Fetch primary keys
-            cursor.execute(primary_key_query, (self.db_config["database"],))
-            primary_keys = {
-                f"{row['TABLE_NAME']}.{row['COLUMN_NAME']}" for row in cursor.fetchall()
-            }  # Set for quick lookup
-
-            # Fetch foreign keys
-            cursor.execute(foreign_key_query, (self.db_config["database"],))
-            foreign_keys = cursor.fetchall()
+        stored_tables = {}
+        stale_table_ids = []
+        for table_id, table_name in (
+            self.session.query(DataModel.id, DataModel.table_name)
+            .filter(DataModel.project_id == project_id)
+            .order_by(DataModel.id)
+        ):
+            if table_name in tables_metadata and table_name not in stored_tables:
+                stored_tables[table_name] = table_id
+            else:
+                stale_table_ids.append(table_id)
+
+        stored_columns = {}
+        stale_column_ids = []
+        if stored_tables:
+            for row in (
+                self.session.query(
+                    DataColumn.id,
+                    DataColumn.table_id,
+                    DataColumn.column_name,
+                    DataColumn.column_type,
+                    DataColumn.is_nullable,
+                    DataColumn.is_unique,
+                    DataColumn.relationships,
+                )
+                .filter(DataColumn.table_id.in_(list(stored_tables.values())))
+                .order_by(DataColumn.id)
+            ):
+                key = (row.table_id, row.column_name)
+                if key in stored_columns:
+                    stale_column_ids.append(row.id)
+                else:
+                    stored_columns[key] = row
+
+        # New tables first, so their columns can be diffed like the others
+        new_tables = [name for name in tables_metadata if name not in stored_tables]
+        if new_tables:
+            self.session.bulk_insert_mappings(
+                DataModel,
+                [{"project_id": project_id, "table_name": name} for name in new_tables],
+            )
+            for table_id, table_name in (
+                self.session.query(DataModel.id, DataModel.table_name)
+                .filter(
+                    DataModel.project_id == project_id,
+                    DataModel.table_name.in_(new_tables),
+                    ~DataModel.id.in_(list(stored_tables.values()) + stale_table_ids),
+                )
+            ):
+                stored_tables[table_name] = table_id
+            changes["tables_inserted"] = len(new_tables)
+
+        column_inserts, column_updates = [], []
+        live_keys = set()
+        for table_name, metadata in tables_metadata.items():
+            table_id = stored_tables[table_name]
+            for column in metadata["columns"]:
+                key = (table_id, column["column_name"])
+                live_keys.add(key)
+                values = {
+                    "column_type": column["column_type"],
+                    "is_nullable": column["is_nullable"] == "YES",
+                    "is_unique": bool(column["is_unique"]),
+                    "relationships": column["relation"],
+                }
 
-            cursor.execute(unique_key_query, (self.db_config["database"],))
-            unique_keys = {f"{row['TABLE_NAME']}.{row['COLUMN_NAME']}" for row in cursor.fetchall()}
-        connection.close()
+                stored = stored_columns.get(key)
+                if stored is None:
+                    column_inserts.append(
+                        {"table_id": table_id, "column_name": column["column_name"], **values}
+                    )
+                elif any(getattr(stored, field) != value for field, value in values.items()):
+                    column_updates.append({"id": stored.id, **values})
+
+        stale_column_ids.extend(
+            row.id for key, row in stored_columns.items() if key not in live_keys
+        )
+
+        if column_inserts:
+            self.session.bulk_insert_mappings(DataColumn, column_inserts)
+        if column_updates:
+            self.session.bulk_update_mappings(DataColumn, column_updates)
+        if stale_column_ids:
+            self.session.query(DataColumn).filter(
+                DataColumn.id.in_(stale_column_ids)
+            ).delete(synchronize_session=False)
+        if stale_table_ids:
+            self.session.query(DataColumn).filter(
+                DataColumn.table_id.in_(stale_table_ids)
+            ).delete(synchronize_session=False)
+            self.session.query(DataModel).filter(
+                DataModel.id.in_(stale_table_ids)
+            ).delete(synchronize_session=False)
 
-        # Organizing data by table
-        tables_metadata = {}
+        changes["tables_deleted"] = len(stale_table_ids)
+        changes["columns_inserted"] = len(column_inserts)
+        changes["columns_updated"] = len(column_updates)
+        changes["columns_deleted"] = len(stale_column_ids)
 
+        self.session.commit()
+        return changes
 
-        for col in columns:
-            table_name = col["TABLE_NAME"]
-            column_name = col["COLUMN_NAME"]
-
-            # Initialize table entry if not present
-            if table_name not in tables_metadata:
-                tables_metadata[table_name] = {"columns": []}
-
-            # Determine relation type
-            relation = None
-            key = f"{table_name}.{column_name}"
-            is_unique = key in unique_keys
-            if key in primary_keys:
-                relation = "PRIMARY"
-
-            for fk in foreign_keys:
-                if fk["TABLE_NAME"] == table_name and fk["COLUMN_NAME"] == column_name:
-                    relation = f"FOREIGN KEY {fk['TABLE_NAME']}({column_name}) -> {fk['REFERENCED_TABLE_NAME']}({fk['REFERENCED_COLUMN_NAME']})"
-
-            # Add column metadata
-            tables_metadata[table_name]["columns"].append(
-                {
-                    "column_name": column_name,
-                    "column_type": col["COLUMN_TYPE"],
-                    "is_nullable": col["IS_NULLABLE"],
-                    "is_unique": is_unique,
-                    "relation": relation,  # Add relation inside column
-                }
-            )
+    def get_many(self):
+        """Returns metadata for all tables, including primary keys and relationships directly in columns."""
 
-        return {"tables": tables_metadata}
+        return {"tables": SchemaIntrospector.get_tables(self.db_config)}
 
     def delete(self, data_model_id):
         """Deletes a single data model"""
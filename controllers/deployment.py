@@ -495,6 +495,22 @@ jobs:
         builder.add_edge("deployment_workflow", END)
         return builder.compile()
 
+    def run_devops_agent(self):
+        """Run the DevOps agent end to end, reporting progress over the log WebSocket."""
+        try:
+            broadcast_log("Starting the Devops Agent Execution")
+            # Initialize the agent graph and state
+            graph = self.create_devops_agent()
+            initial_state = self.get_initial_state()
+
+            # Run the DevOps agent
+            graph.invoke(initial_state)
+            broadcast_log("DevOps Agent Execution Completed Successfully!")
+            return {"success": True, "message": "Successfully Generated DockerFile and Git WorkFlows"}
+        except Exception as e:
+            broadcast_log(f"DevOps Agent Execution Failed: {str(e)}")
+            raise
+
     # Initialize agent with empty state
     def get_initial_state(self):
         return DeploymentState(
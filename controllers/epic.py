@@ -1,7 +1,11 @@
+import asyncio
+from bson.objectid import ObjectId  # type: ignore
 from controllers.base import BaseController
-from database.models import Epic, Feature, Project, Story
+from config.settings import EPIC_GENERATION_CONCURRENCY
+from database.models import Epic, Feature, Project, Story, fetch_documents
+from database.connection import epic_description_collection, story_description_collection
 from services.epic.generator import EpicGenerator
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List
 
 
 class EpicController(BaseController):
@@ -34,7 +38,7 @@ class EpicController(BaseController):
                 raise ValueError(f"Project {project_id} not found")
 
             # Generate epic
-            epic_data = self.epic_generator.generate_epic(
+            epic_data = await self.epic_generator.generate_epic(
                 feature=feature.to_dict(),
                 tech_stack=project.tech_bundle_id,  # Assuming this is the tech stack ID
                 requirements=project.get_content().get("project_content", ""),
@@ -58,6 +62,119 @@ class EpicController(BaseController):
             self.session.rollback()
             raise ValueError(f"Failed to generate epic: {str(e)}")
 
+    async def generate_epics(
+        self, project_id: int, concurrency: int = EPIC_GENERATION_CONCURRENCY
+    ) -> Dict:
+        """
+        Generate epics for every finalized feature of a project without one.
+
+        Epics are generated concurrently, at most `concurrency` at a time.
+        The new rows are inserted in one transaction and their descriptions
+        with one MongoDB insert. A feature whose generation fails is reported
+        in "failed" and does not stop the others.
+
+        Args:
+            project_id (int): ID of the project
+            concurrency (int): Maximum epics generated at the same time
+
+        Returns:
+            Dict containing the created epics and the failed features
+
+        Raises:
+            ValueError: If the project is not found or saving fails
+        """
+        try:
+            project = (
+                self.session.query(Project).filter(Project.id == project_id).first()
+            )
+            if not project:
+                raise ValueError(f"Project {project_id} not found")
+
+            features = (
+                self.session.query(Feature)
+                .outerjoin(Epic, Epic.feature_id == Feature.id)
+                .filter(
+                    Feature.project_id == project_id,
+                    Feature.is_finalized == True,
+                    Epic.id.is_(None),
+                )
+                .order_by(Feature.id)
+                .all()
+            )
+
+            # Shared context is loaded once for all features
+            tech_stack = project.tech_bundle_id
+            requirements = (project.get_content() or {}).get("project_content", "")
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def generate(feature_data: Dict) -> Dict:
+                async with semaphore:
+                    return await self.epic_generator.generate_epic(
+                        feature=feature_data,
+                        tech_stack=tech_stack,
+                        requirements=requirements,
+                    )
+
+            results = await asyncio.gather(
+                *[generate(feature.to_dict()) for feature in features],
+                return_exceptions=True,
+            )
+
+            epics, descriptions, failed = [], [], []
+            for feature, result in zip(features, results):
+                error = None
+                if isinstance(result, Exception):
+                    error = str(result)
+                elif (
+                    not isinstance(result, dict)
+                    or not result.get("name")
+                    or "description" not in result
+                ):
+                    error = "Generated epic has no name or description"
+                if error:
+                    failed.append(
+                        {
+                            "feature_id": feature.id,
+                            "feature_name": feature.name,
+                            "error": error,
+                        }
+                    )
+                    continue
+                epics.append(Epic(feature_id=feature.id, name=result["name"]))
+                descriptions.append(result["description"])
+
+            document_ids = []
+            try:
+                self.session.add_all(epics)
+                self.session.flush()
+
+                document_ids = Epic.save_descriptions(epics, descriptions)
+
+                self.session.commit()
+            except Exception:
+                # Don't leave descriptions behind for epics that were not saved
+                if document_ids:
+                    epic_description_collection.delete_many(
+                        {"_id": {"$in": [ObjectId(doc_id) for doc_id in document_ids]}}
+                    )
+                raise
+
+            epics_data = []
+            for epic, description in zip(epics, descriptions):
+                epic_dict = epic.to_dict()
+                epic_dict["description"] = description
+                epics_data.append(epic_dict)
+
+            return {
+                "message": f"Generated {len(epics_data)} epics, {len(failed)} failed",
+                "epics": epics_data,
+                "failed": failed,
+            }
+
+        except Exception as e:
+            self.session.rollback()
+            raise ValueError(f"Failed to generate epics: {str(e)}")
+
     def get_epic(self, project_id: int, epic_id: int) -> Dict:
         """Get epic details"""
         try:
@@ -132,10 +249,11 @@ class EpicController(BaseController):
                 .all()
             )
 
+            descriptions = Epic.get_descriptions(epics)
             epics_data = []
             for epic in epics:
                 epic_dict = epic.to_dict()
-                description = epic.get_description()
+                description = descriptions.get(epic.id)
                 if description:
                     epic_dict["description"] = description.get("description")
                 epics_data.append(epic_dict)
@@ -148,60 +266,85 @@ class EpicController(BaseController):
         except Exception as e:
             raise ValueError(f"Failed to fetch epics: {str(e)}")
 
-    def get_all_project_epics_and_stories(self, project_id: int) -> List[Dict]:
+    def iter_project_epics_and_stories(self, project_id: int) -> Iterator[Dict]:
         """
-        Get all epics and their stories for a project in Testingaide format.
+        Yield each epic of a project with its stories in Testingaide format.
+
+        The Feature -> Epic -> Story tree is read with a single SQL query and
+        all descriptions with one MongoDB query per collection.
 
         Args:
             project_id (int): ID of the project
 
-        Returns:
-            List[Dict]: Epics with their stories in Testingaide format
+        Yields:
+            Dict: Epic with its stories
         """
-        try:
-            # Get all epics for the project
-            epics = (
-                self.session.query(Epic)
-                .join(Feature)
-                .filter(Feature.project_id == project_id, Feature.is_finalized == True)
-                .all()
+        rows = (
+            self.session.query(
+                Epic.id.label("epic_id"),
+                Epic.name.label("epic_name"),
+                Epic.mongo_description_id.label("epic_description_id"),
+                Story.id.label("story_id"),
+                Story.title.label("story_title"),
+                Story.mongo_description_id.label("story_description_id"),
             )
-
-            formatted_epics = []
-
-            for epic in epics:
-                # Get epic details
-                epic_dict = {"id": epic.id, "name": epic.name, "description": ""}
-
-                # Get epic description from MongoDB
-                epic_content = epic.get_description()
-                if epic_content and "description" in epic_content:
-                    epic_dict["description"] = epic_content["description"]
-
-                # Get all stories for this epic
-                stories = (
-                    self.session.query(Story).filter(Story.epic_id == epic.id).all()
-                )
-                formatted_stories = []
-
-                for story in stories:
-                    story_dict = {
-                        "id": story.id,
-                        "name": story.title,
-                        "description": "",
+            .join(Feature, Epic.feature_id == Feature.id)
+            .outerjoin(Story, Story.epic_id == Epic.id)
+            .filter(Feature.project_id == project_id, Feature.is_finalized == True)
+            .order_by(Epic.id, Story.id)
+            .all()
+        )
+
+        epic_descriptions = fetch_documents(
+            epic_description_collection,
+            (row.epic_description_id for row in rows),
+            ["description"],
+        )
+        story_descriptions = fetch_documents(
+            story_description_collection,
+            (row.story_description_id for row in rows),
+            ["description"],
+        )
+
+        current_epic = None
+        for row in rows:
+            if current_epic is None or current_epic["id"] != row.epic_id:
+                if current_epic is not None:
+                    yield current_epic
+                description = epic_descriptions.get(row.epic_description_id, {})
+                current_epic = {
+                    "id": row.epic_id,
+                    "name": row.epic_name,
+                    "description": description.get("description", ""),
+                    "stories": [],
+                }
+
+            # Epics without stories come back with a NULL story from the outer join
+            if row.story_id is not None:
+                description = story_descriptions.get(row.story_description_id, {})
+                current_epic["stories"].append(
+                    {
+                        "id": row.story_id,
+                        "name": row.story_title,
+                        "description": description.get("description", ""),
                     }
+                )
 
-                    # Get story description from MongoDB
-                    story_content = story.get_description()
-                    if story_content and "description" in story_content:
-                        story_dict["description"] = story_content["description"]
+        if current_epic is not None:
+            yield current_epic
 
-                    formatted_stories.append(story_dict)
+    def get_all_project_epics_and_stories(self, project_id: int) -> List[Dict]:
+        """
+        Get all epics and their stories for a project in Testingaide format.
 
-                epic_dict["stories"] = formatted_stories
-                formatted_epics.append(epic_dict)
+        Args:
+            project_id (int): ID of the project
 
-            return formatted_epics
+        Returns:
+            List[Dict]: Epics with their stories in Testingaide format
+        """
+        try:
+            return list(self.iter_project_epics_and_stories(project_id))
 
         except Exception as e:
             raise ValueError(f"Failed to get epics and stories: {str(e)}")
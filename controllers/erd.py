@@ -1,7 +1,7 @@
 from controllers.base import BaseController
 from database.models import Project, Feature
 from services.erd.generator import ERDGenerator
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict
 import base64
 import requests
 
@@ -45,7 +45,7 @@ class ERDController(BaseController):
         try:
             project_data = self._get_project_data(project_id)
 
-            mermaid_code = self.erd_generator.generate_erd(
+            mermaid_code = await self.erd_generator.generate_erd(
                 requirements=project_data["project"]
                 .get_content()
                 .get("project_content", ""),
@@ -76,7 +76,7 @@ class ERDController(BaseController):
             if not current_erd:
                 raise ValueError("No existing ERD found to refine")
 
-            mermaid_code = self.erd_generator.refine_erd(
+            mermaid_code = await self.erd_generator.refine_erd(
                 current_erd=current_erd,
                 feedback=feedback,
                 requirements=project_data["project"]
@@ -99,6 +99,86 @@ class ERDController(BaseController):
         except Exception as e:
             raise ValueError(f"Failed to refine ERD: {str(e)}")
 
+    async def stream_erd(self, project_id: int) -> AsyncIterator[Dict]:
+        """
+        Generate the initial ERD, yielding Mermaid text as it is produced.
+
+        Yields "chunk" events with the text, then a "complete" event carrying
+        the same payload as generate_erd once the ERD has been saved.
+        """
+        try:
+            project_data = self._get_project_data(project_id)
+
+            chunks = self.erd_generator.stream_erd(
+                requirements=project_data["project"]
+                .get_content()
+                .get("project_content", ""),
+                features=project_data["features"],
+                tech_stack=project_data["tech_stack"] or {},
+            )
+
+            async for event in self._stream_and_save(
+                project_data["project"], chunks, "ERD generated successfully"
+            ):
+                yield event
+
+        except Exception as e:
+            raise ValueError(f"Failed to generate ERD: {str(e)}")
+
+    async def stream_refined_erd(
+        self, project_id: int, feedback: str
+    ) -> AsyncIterator[Dict]:
+        """
+        Refine the ERD based on feedback, yielding Mermaid text as it is produced.
+
+        Yields the same events as stream_erd.
+        """
+        try:
+            project_data = self._get_project_data(project_id)
+            content = project_data["project"].get_content()
+
+            current_erd = content.get("erd_schema")
+            if not current_erd:
+                raise ValueError("No existing ERD found to refine")
+
+            chunks = self.erd_generator.stream_refined_erd(
+                current_erd=current_erd,
+                feedback=feedback,
+                requirements=content.get("project_content", ""),
+                features=project_data["features"],
+            )
+
+            async for event in self._stream_and_save(
+                project_data["project"], chunks, "ERD refined successfully"
+            ):
+                yield event
+
+        except Exception as e:
+            raise ValueError(f"Failed to refine ERD: {str(e)}")
+
+    async def _stream_and_save(
+        self, project: Project, chunks: AsyncIterator[str], message: str
+    ) -> AsyncIterator[Dict]:
+        """Forward Mermaid chunks as events and save the full ERD at the end"""
+        parts = []
+        async for text in chunks:
+            parts.append(text)
+            yield {"event": "chunk", "data": {"text": text}}
+
+        mermaid_code = "".join(parts)
+        project.save_content(erd_schema=mermaid_code)
+
+        yield {
+            "event": "complete",
+            "data": {
+                "message": message,
+                "erd": {
+                    "mermaid_code": mermaid_code,
+                    "image_url": self._generate_image_url(mermaid_code),
+                },
+            },
+        }
+
     def get_erd(self, project_id: int) -> Dict:
         """Get current ERD"""
         try:
@@ -2,6 +2,7 @@ from controllers.base import BaseController
 from database.models import Feature, Project
 from typing import Optional, Dict, Union, List
 from services.feature.extractor import FeatureExtractor
+from config.settings import FEATURE_CHUNKED_THRESHOLD_CHARS
 from sqlalchemy.types import Enum as SAEnum
 from database.models import FeatureTypeEnum
 
@@ -36,10 +37,18 @@ class FeatureController(BaseController):
             if not content or "project_content" not in content:
                 raise ValueError("No content available for feature extraction")
 
-            # Extract features
-            features_data = self.feature_extractor.extract_and_suggest(
-                content["project_content"]
-            )
+            # Extract features, section by section for long documents
+            document_content = content["project_content"]
+            if len(document_content) > FEATURE_CHUNKED_THRESHOLD_CHARS:
+                features_data = (
+                    await self.feature_extractor.extract_and_suggest_chunked(
+                        document_content
+                    )
+                )
+            else:
+                features_data = await self.feature_extractor.extract_and_suggest(
+                    document_content
+                )
 
             # Create features in database
             created_features = []
@@ -97,10 +106,11 @@ class FeatureController(BaseController):
             self.session.commit()
 
             # Prepare response
+            summaries = Feature.get_summaries(created_features)
             features_data = []
             for feature in created_features:
                 feature_dict = feature.to_dict()
-                summary = feature.get_summary()
+                summary = summaries.get(feature.id)
                 if summary:
                     feature_dict["description"] = summary.get("summary")
                 features_data.append(feature_dict)
@@ -123,10 +133,11 @@ class FeatureController(BaseController):
                 .all()
             )
 
+            summaries = Feature.get_summaries(features)
             features_data = []
             for feature in features:
                 feature_dict = feature.to_dict()
-                summary = feature.get_summary()
+                summary = summaries.get(feature.id)
                 if summary:
                     feature_dict["description"] = summary.get("summary")
                 features_data.append(feature_dict)
@@ -225,11 +236,12 @@ class FeatureController(BaseController):
                 raise ValueError(f"Features not found: {missing_ids}")
 
             # Update all features
+            summaries = Feature.get_summaries(features)
             finalized_features = []
             for feature in features:
                 feature.is_finalized = True
                 feature_dict = feature.to_dict()
-                summary = feature.get_summary()
+                summary = summaries.get(feature.id)
                 if summary:
                     feature_dict["description"] = summary.get("summary")
                 finalized_features.append(feature_dict)
@@ -1,9 +1,11 @@
+import asyncio
 from controllers.base import BaseController
+from config.settings import STORY_GENERATION_CONCURRENCY
 from database.models import Story, Epic, Feature, Project
 from services.story.generator import StoryGenerator
-from database.connection import tech_bundle_collection
+from database.connection import story_description_collection, tech_bundle_collection
 from bson.objectid import ObjectId  # type: ignore
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
 
 
 class StoryController(BaseController):
@@ -81,6 +83,161 @@ class StoryController(BaseController):
             self.session.rollback()
             raise ValueError(f"Failed to generate stories: {str(e)}")
 
+    async def generate_project_stories(
+        self,
+        project_id: int,
+        epic_ids: Optional[List[int]] = None,
+        concurrency: int = STORY_GENERATION_CONCURRENCY,
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate stories for many epics of a project concurrently.
+
+        By default every epic without stories is processed, so running this
+        again retries the epics that failed last time. The project, tech
+        bundle and requirements are loaded once for all epics. Each epic's
+        stories are saved as soon as they are generated, with one bulk insert
+        per epic, so a failing epic does not affect the others.
+
+        Args:
+            project_id (int): ID of the project
+            epic_ids (List[int], optional): Only generate for these epics
+            concurrency (int): Maximum epics processed at the same time
+
+        Yields:
+            A "progress" event per finished epic, then a "complete" event with
+            the created stories and the failed epics
+
+        Raises:
+            ValueError: If the project is not found
+        """
+        try:
+            project = (
+                self.session.query(Project).filter(Project.id == project_id).first()
+            )
+            if not project:
+                raise ValueError(f"Project {project_id} not found")
+
+            query = (
+                self.session.query(Epic)
+                .join(Feature)
+                .filter(Feature.project_id == project_id)
+            )
+            if epic_ids:
+                query = query.filter(Epic.id.in_(epic_ids))
+            else:
+                query = query.filter(~Epic.id.in_(self.session.query(Story.epic_id)))
+            epics = query.order_by(Epic.id).all()
+
+            # Shared context is loaded once for all epics
+            tech_bundle = None
+            if project.tech_bundle_id:
+                tech_bundle = tech_bundle_collection.find_one(
+                    {"_id": ObjectId(project.tech_bundle_id)}, {"name": 1}
+                )
+            tech_stack = tech_bundle["name"] if tech_bundle else "Not specified"
+            requirements = (project.get_content() or {}).get("project_content", "")
+            descriptions = Epic.get_descriptions(epics)
+        except Exception as e:
+            raise ValueError(f"Failed to generate stories: {str(e)}")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(epic: Epic) -> List[Dict]:
+            description = descriptions.get(epic.id, {}).get("description")
+            if not description:
+                raise ValueError("Epic description not found")
+
+            epic_data = epic.to_dict()
+            epic_data["description"] = description
+            async with semaphore:
+                return await self.story_generator.generate_stories(
+                    epic=epic_data, tech_stack=tech_stack, requirements=requirements
+                )
+
+        tasks = {asyncio.ensure_future(generate(epic)): epic for epic in epics}
+        created_stories, failed = [], []
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    epic = tasks[task]
+                    try:
+                        stories = self._save_generated_stories(epic, task.result())
+                    except Exception as e:
+                        failed.append(
+                            {"epic_id": epic.id, "epic_name": epic.name, "error": str(e)}
+                        )
+                        yield {
+                            "event": "progress",
+                            "data": {
+                                "epic_id": epic.id,
+                                "epic_name": epic.name,
+                                "status": "failed",
+                                "error": str(e),
+                                "done": len(created_stories) + len(failed),
+                                "total": len(tasks),
+                            },
+                        }
+                        continue
+
+                    created_stories.extend(stories)
+                    yield {
+                        "event": "progress",
+                        "data": {
+                            "epic_id": epic.id,
+                            "epic_name": epic.name,
+                            "status": "completed",
+                            "stories": len(stories),
+                            "done": len(created_stories) + len(failed),
+                            "total": len(tasks),
+                        },
+                    }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "event": "complete",
+            "data": {
+                "message": f"{len(created_stories)} stories generated successfully, "
+                f"{len(failed)} epics failed",
+                "stories": created_stories,
+                "failed": failed,
+            },
+        }
+
+    def _save_generated_stories(self, epic: Epic, stories_data: List[Dict]) -> List[Dict]:
+        """Insert one epic's generated stories in a single transaction"""
+        stories = [Story(epic_id=epic.id, title=data["title"]) for data in stories_data]
+        descriptions = [data["description"] for data in stories_data]
+
+        document_ids = []
+        try:
+            self.session.add_all(stories)
+            self.session.flush()
+
+            document_ids = Story.save_descriptions(stories, descriptions)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            # Don't leave descriptions behind for stories that were not saved
+            if document_ids:
+                story_description_collection.delete_many(
+                    {"_id": {"$in": [ObjectId(doc_id) for doc_id in document_ids]}}
+                )
+            raise
+
+        created_stories = []
+        for story, description in zip(stories, descriptions):
+            story_dict = story.to_dict()
+            story_dict["description"] = description
+            created_stories.append(story_dict)
+        return created_stories
+
     def create_story(self, project_id: int, epic_id: int, story_data: Dict) -> Dict:
         """
         Create a new story manually.
@@ -199,10 +356,11 @@ class StoryController(BaseController):
             stories = self.session.query(Story).filter(Story.epic_id == epic_id).all()
 
             # Prepare response
+            descriptions = Story.get_descriptions(stories)
             stories_data = []
             for story in stories:
                 story_dict = story.to_dict()
-                description = story.get_description()
+                description = descriptions.get(story.id)
                 if description:
                     story_dict["description"] = description.get("description")
                 stories_data.append(story_dict)
@@ -12,7 +12,7 @@ class TestingaideController(BaseController):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.testingaide = TestingaideClient()
-        self.epic_controller = EpicController(*args, **kwargs)
+        self.epic_controller = EpicController(session=self.session)
 
     def sync_epics_and_stories(self, project_id: int) -> Dict:
         """
@@ -1,12 +1,82 @@
+import os
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 from pymongo import MongoClient
-from config.settings import MYSQL_URL, MONGO_URL, MONGO_DB
+from config.settings import (
+    MYSQL_URL,
+    MYSQL_POOL_SIZE,
+    MYSQL_MAX_OVERFLOW,
+    MYSQL_POOL_TIMEOUT,
+    MONGO_URL,
+    MONGO_DB,
+)
 from database.tech_bundles import TECH_STACKS
 
+
+class PoolWaitStats:
+    """Tracks how long callers wait to check a connection out of the pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3)
+                if attempts
+                else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait times in pool_wait_stats."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
 # SQLAlchemy setup for MySQL
-engine = create_engine(MYSQL_URL, pool_pre_ping=True, pool_recycle=3600)
+engine = create_engine(
+    MYSQL_URL,
+    poolclass=TimedQueuePool,
+    pool_size=MYSQL_POOL_SIZE,
+    max_overflow=MYSQL_MAX_OVERFLOW,
+    pool_timeout=MYSQL_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 db_session = scoped_session(SessionLocal)
 Base = declarative_base()
@@ -26,6 +96,9 @@ theme_collection = mongo_db["theme"]
 prompt_collection = mongo_db["prompts"]
 deploy_credentials_collection = mongo_db["deploy_credentials"]
 deploy_project_metadata_collection = mongo_db["deploy_project_metadata"]
+job_collection = mongo_db["jobs"]
+llm_cache_collection = mongo_db["llm_cache"]
+document_text_collection = mongo_db["document_text"]
 
 count_bundles = len(list(tech_bundle_collection.find({})))
 
@@ -33,6 +106,39 @@ if count_bundles == 0:
     tech_bundle_collection.insert_many(TECH_STACKS)
 
 
+def dispose_connections():
+    """Close pooled MySQL and MongoDB connections, e.g. before forking workers."""
+    engine.dispose()
+    mongo_client.close()
+
+
+def reset_connections():
+    """
+    Drop connection state inherited from a parent process.
+
+    Must run in each forked worker before it touches the database; the
+    pools then reconnect lazily on first use.
+    """
+    engine.dispose(close=False)
+    mongo_client.close()
+
+
+def get_pool_stats() -> dict:
+    """Live statistics for this process' MySQL connection pool."""
+    pool = engine.pool
+    return {
+        "pid": os.getpid(),
+        "pool_size": pool.size(),
+        "max_overflow": MYSQL_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool reports overflow relative to pool_size, so it is
+        # negative while the pool has not been filled yet
+        "overflow": max(pool.overflow(), 0),
+        **pool_wait_stats.to_dict(),
+    }
+
+
 def get_db():
     """Get SQLAlchemy database session."""
     db = SessionLocal()
@@ -18,9 +18,36 @@ from database.connection import (
 )
 from bson.objectid import ObjectId  # type: ignore
 from sqlalchemy.types import Enum as SAEnum
+from typing import Dict, Iterable, List
 import enum
 
 
+def fetch_documents(
+    collection, document_ids: Iterable[str], fields: List[str] = None
+) -> Dict[str, dict]:
+    """
+    Fetch many MongoDB documents by ID with a single $in query.
+
+    Args:
+        collection: MongoDB collection to query
+        document_ids (Iterable[str]): ObjectIds as strings; empty values are skipped
+        fields (List[str], optional): Fields to project; all fields if omitted
+
+    Returns:
+        Dict mapping each found document ID to its document
+    """
+    object_ids = [ObjectId(doc_id) for doc_id in set(document_ids) if doc_id]
+    if not object_ids:
+        return {}
+
+    projection = {field: 1 for field in fields} if fields else None
+    documents = {}
+    for doc in collection.find({"_id": {"$in": object_ids}}, projection):
+        doc["_id"] = str(doc["_id"])
+        documents[doc["_id"]] = doc
+    return documents
+
+
 class BaseModel(Base):
     """Base model class with common fields and methods."""
 
@@ -299,6 +326,25 @@ class Feature(BaseModel):
             doc["_id"] = str(doc["_id"])
         return doc
 
+    @staticmethod
+    def get_summaries(features: List["Feature"]) -> Dict[int, dict]:
+        """
+        Retrieve the summaries of many features with one MongoDB query.
+
+        Returns:
+            Dict mapping feature ID to its summary document
+        """
+        docs = fetch_documents(
+            feature_summary_collection,
+            (feature.mongo_summary_id for feature in features),
+            ["summary"],
+        )
+        return {
+            feature.id: docs[feature.mongo_summary_id]
+            for feature in features
+            if feature.mongo_summary_id in docs
+        }
+
 
 # ----------------------------------
 # TechBundle Model (MongoDB Only)
@@ -378,6 +424,54 @@ class Epic(BaseModel):
             doc["_id"] = str(doc["_id"])
         return doc
 
+    @staticmethod
+    def get_descriptions(epics: List["Epic"]) -> Dict[int, dict]:
+        """
+        Retrieve the descriptions of many epics with one MongoDB query.
+
+        Returns:
+            Dict mapping epic ID to its description document
+        """
+        docs = fetch_documents(
+            epic_description_collection,
+            (epic.mongo_description_id for epic in epics),
+            ["description"],
+        )
+        return {
+            epic.id: docs[epic.mongo_description_id]
+            for epic in epics
+            if epic.mongo_description_id in docs
+        }
+
+    @staticmethod
+    def save_descriptions(epics: List["Epic"], descriptions: List[str]) -> List[str]:
+        """
+        Save descriptions for many new epics with one MongoDB insert.
+
+        The epics must already be flushed so they have IDs.
+
+        Returns:
+            List of the inserted MongoDB document IDs
+        """
+        if not epics:
+            return []
+
+        result = epic_description_collection.insert_many(
+            [
+                {
+                    "description": description,
+                    "epic_id": epic.id,
+                    "created_at": epic.created_at,
+                    "updated_at": epic.updated_at,
+                }
+                for epic, description in zip(epics, descriptions)
+            ]
+        )
+        document_ids = [str(doc_id) for doc_id in result.inserted_ids]
+        for epic, document_id in zip(epics, document_ids):
+            epic.mongo_description_id = document_id
+        return document_ids
+
 
 # ----------------------------------
 # Story Model
@@ -433,6 +527,56 @@ class Story(BaseModel):
             doc["_id"] = str(doc["_id"])
         return doc
 
+    @staticmethod
+    def get_descriptions(stories: List["Story"]) -> Dict[int, dict]:
+        """
+        Retrieve the descriptions of many stories with one MongoDB query.
+
+        Returns:
+            Dict mapping story ID to its description document
+        """
+        docs = fetch_documents(
+            story_description_collection,
+            (story.mongo_description_id for story in stories),
+            ["description"],
+        )
+        return {
+            story.id: docs[story.mongo_description_id]
+            for story in stories
+            if story.mongo_description_id in docs
+        }
+
+    @staticmethod
+    def save_descriptions(
+        stories: List["Story"], descriptions: List[str]
+    ) -> List[str]:
+        """
+        Save descriptions for many new stories with one MongoDB insert.
+
+        The stories must already be flushed so they have IDs.
+
+        Returns:
+            List of the inserted MongoDB document IDs
+        """
+        if not stories:
+            return []
+
+        result = story_description_collection.insert_many(
+            [
+                {
+                    "description": description,
+                    "story_id": story.id,
+                    "created_at": story.created_at,
+                    "updated_at": story.updated_at,
+                }
+                for story, description in zip(stories, descriptions)
+            ]
+        )
+        document_ids = [str(doc_id) for doc_id in result.inserted_ids]
+        for story, document_id in zip(stories, document_ids):
+            story.mongo_description_id = document_id
+        return document_ids
+
 
 class DataModel(BaseModel):
     """Represents a database table in a project"""
@@ -1,8 +1,12 @@
 import tornado.web
 import json
+from tornado.iostream import StreamClosedError
 from json.decoder import JSONDecodeError
 from utils.json_encoder import json_dumps
-from typing import Any, Optional, List
+from services.jobs.manager import JobManager
+from utils.llm_cache import llm_cache_bypass
+from constants import urls_v1
+from typing import Any, AsyncIterator, Dict, Optional, List
 
 
 class DefaultHandler(tornado.web.RequestHandler):
@@ -26,8 +30,25 @@ class DefaultHandler(tornado.web.RequestHandler):
 class BaseHandler(tornado.web.RequestHandler):
     """Base handler with CORS support"""
 
+    # Number of requests currently being served, used for graceful shutdown
+    active_requests = 0
+
     def initialize(self):
         self._controller = None
+        BaseHandler.active_requests += 1
+
+    def prepare(self):
+        # Let clients force fresh LLM output, e.g. for a "regenerate" button.
+        # Background jobs started by this request inherit the flag.
+        if "no-cache" in self.request.headers.get("Cache-Control", ""):
+            llm_cache_bypass.set(True)
+
+    def on_finish(self):
+        BaseHandler.active_requests -= 1
+        # One session per request: release it however the request ended
+        if self._controller:
+            self._controller.close()
+            self._controller = None
 
     def set_default_headers(self):
         """Set default headers for CORS support"""
@@ -89,3 +110,60 @@ class BaseHandler(tornado.web.RequestHandler):
         """
         self.set_header("Content-Type", "application/json")
         self.write(json_dumps(obj))
+
+    def start_job(
+        self, job_type: str, project_id: int, method_name: str, *args: Any
+    ) -> Dict:
+        """
+        Run a controller method as a background job and respond 202.
+
+        Args:
+            job_type (str): Kind of job, e.g. "epic_generation"
+            project_id (int): Project the job belongs to
+            method_name (str): Method of this handler's controller to run
+            *args: Arguments for the controller method
+
+        Returns:
+            Dict: The queued job record
+        """
+        job = JobManager.submit(
+            job_type, project_id, self._get_controller_class(), method_name, *args
+        )
+
+        self.set_status(202)
+        self.set_header("Location", f"{urls_v1.url_prefix}/jobs/{job['id']}")
+        self.write_json({"message": "Job accepted", "job": job})
+        return job
+
+    def wants_event_stream(self) -> bool:
+        """Whether the client asked for a server-sent event stream"""
+        return (
+            "text/event-stream" in self.request.headers.get("Accept", "")
+            or self.get_argument("stream", None) is not None
+        )
+
+    async def write_events(self, events: AsyncIterator[Dict]) -> None:
+        """
+        Send events to the client as server-sent events, flushing each one.
+
+        Args:
+            events (AsyncIterator[Dict]): Events shaped {"event": name, "data": payload}
+
+        An exception raised by `events` is reported as a final "error" event.
+        """
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("X-Accel-Buffering", "no")
+
+        try:
+            async for event in events:
+                self.write(f"event: {event['event']}\ndata: {json_dumps(event['data'])}\n\n")
+                await self.flush()
+        except StreamClosedError:
+            # Client went away; nothing left to send to
+            return
+        except Exception as e:
+            self.write(f"event: error\ndata: {json_dumps({'error': str(e)})}\n\n")
+        finally:
+            # Run the generator's cleanup now, not whenever it is collected
+            await events.aclose()
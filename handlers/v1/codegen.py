@@ -1,7 +1,8 @@
 import tornado.web
+from typing import Dict
 from handlers.v1.base import BaseHandler
 from controllers.codegen import CodeGenController
-import json
+from services.jobs.manager import JobManager, JobStatus
 
 class CodeGenHandler(BaseHandler):
 
@@ -12,12 +13,102 @@ class CodeGenHandler(BaseHandler):
         self.write("Hello, world")
 
     async def post(self, project_id):
-        body = self._request_body()
-        response = self.controller.start_flow(project_id)
+        """
+        Generate the frontend and backend of a project.
 
-        self.write(json.dumps(response))
-        self.set_status(response.get('code', 200))
+        An optional JSON body {"run_id": "..."} resumes an earlier run from
+        its last checkpoint. Streams per-side status as server-sent events
+        when requested, otherwise starts a background job whose progress
+        lists each side. Responds 404 if the project, its prompts or the run
+        are not found and 409 if code is already being generated for it.
+        """
+        try:
+            run_id = None
+            if self.request.body:
+                run_id = (self._request_body() or {}).get("run_id")
+                if run_id is not None and not isinstance(run_id, str):
+                    raise tornado.web.HTTPError(400, "run_id must be a string")
 
+            flow = self.controller.prepare_flow(int(project_id), run_id)
+        except tornado.web.HTTPError:
+            raise
+        except ValueError as e:
+            raise tornado.web.HTTPError(404, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
 
+        if flow is None:
+            raise tornado.web.HTTPError(
+                409, f"Code is already being generated for project {project_id}"
+            )
 
+        try:
+            if self.wants_event_stream():
+                await self.write_events(self.controller.start_flow(flow))
+                return
 
+            job = self.start_job("codegen", int(project_id), "start_flow", flow)
+        except Exception as e:
+            CodeGenController.release_flow(flow)
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
+
+        # A job cancelled while queued never runs start_flow
+        def release_unstarted(job: Dict) -> None:
+            if job["status"] in JobStatus.TERMINAL:
+                JobManager.unsubscribe(job["id"], release_unstarted)
+                CodeGenController.release_flow(flow)
+
+        JobManager.subscribe(job["id"], release_unstarted)
+
+
+class CodeGenRunCollectionHandler(BaseHandler):
+    """Handler for the checkpointed codegen runs of a project"""
+
+    def _get_controller_class(self):
+        return CodeGenController
+
+    async def get(self, project_id: str) -> None:
+        """Lists the project's runs with their checkpoint counts"""
+        try:
+            self.write_json(self.controller.list_runs(int(project_id)))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
+
+    async def delete(self, project_id: str) -> None:
+        """
+        Deletes the project's runs and checkpoints; with ?older_than_days=N
+        only runs created more than N days ago.
+        """
+        try:
+            older_than_days = self.get_argument("older_than_days", None)
+            if older_than_days is not None:
+                try:
+                    older_than_days = float(older_than_days)
+                except ValueError:
+                    raise tornado.web.HTTPError(400, "older_than_days must be a number")
+
+            self.write_json(
+                self.controller.delete_runs(int(project_id), older_than_days)
+            )
+        except tornado.web.HTTPError:
+            raise
+        except ValueError as e:
+            raise tornado.web.HTTPError(409, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
+
+
+class CodeGenRunHandler(BaseHandler):
+    """Handler for a single checkpointed codegen run"""
+
+    def _get_controller_class(self):
+        return CodeGenController
+
+    async def delete(self, run_id: str) -> None:
+        """Deletes a run and its checkpoints"""
+        try:
+            self.write_json(self.controller.delete_run(run_id))
+        except ValueError as e:
+            raise tornado.web.HTTPError(404, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
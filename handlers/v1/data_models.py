@@ -13,7 +13,12 @@ class DataModelItemHandler(BaseHandler):
         try:
             print(f"Starting DB generation for project ID: {project_id}")
             self.controller.generate_db(project_id)
-            self.write({"message": "Database generation started successfully."})
+            self.write(
+                {
+                    "message": "Database generation started successfully.",
+                    "execution": self.controller.execution_report,
+                }
+            )
         except Exception as e:
             print(f"Error generating database for project {project_id}: {e}")
             self.set_status(500)
@@ -92,25 +92,8 @@ class DeploymentHandler(BaseHandler):
         return DevOpsAgentController
 
     def post(self,project_id):
-        """Main endpoint to invoke the DevOps agent"""
-        try:
-            broadcast_log("Starting the Devops Agent Execution")
-            # Initialize the agent graph and state
-            graph = self.controller.create_devops_agent()
-            initial_state = self.controller.get_initial_state()
-            
-            # Run the DevOps agent
-            output = graph.invoke(initial_state)
-            result = {"success": True, "message": "Successfully Generated DockerFile and Git WorkFlows"}
-            # Broadcast log upon success
-            broadcast_log("DevOps Agent Execution Completed Successfully!")
-            # Ensure the result is JSON serializable
-            self.set_header("Content-Type", "application/json")
-            self.write(json.dumps(result, default=str))
-        except Exception as e:
-            self.set_status(500)
-            self.write({"error": str(e), "status": "failed"})
-            broadcast_log(f"DevOps Agent Execution Failed: {str(e)}")
+        """Main endpoint to invoke the DevOps agent as a background job"""
+        self.start_job("deployment", int(project_id), "run_devops_agent")
 
     def get(self):
         pass 
@@ -70,14 +70,37 @@ class EpicGenerationHandler(BaseHandler):
         return EpicController
 
     async def post(self, project_id: str, feature_id: str) -> None:
-        """Generate epic for a feature"""
+        """Start epic generation for a feature as a background job"""
         try:
-            result = await self.controller.generate_epic(
-                int(project_id), int(feature_id)
+            self.start_job(
+                "epic_generation",
+                int(project_id),
+                "generate_epic",
+                int(project_id),
+                int(feature_id),
             )
 
-            self.set_status(201)
-            self.write_json(result)
+        except ValueError as e:
+            raise tornado.web.HTTPError(404, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
+
+
+class EpicBulkGenerationHandler(BaseHandler):
+    """Handler for generating the epics of all finalized features at once"""
+
+    def _get_controller_class(self):
+        return EpicController
+
+    async def post(self, project_id: str) -> None:
+        """Start epic generation for every feature without an epic as a background job"""
+        try:
+            self.start_job(
+                "epic_bulk_generation",
+                int(project_id),
+                "generate_epics",
+                int(project_id),
+            )
 
         except ValueError as e:
             raise tornado.web.HTTPError(404, str(e))
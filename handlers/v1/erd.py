@@ -32,18 +32,34 @@ class ERDHandler(BaseHandler):
             raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
 
     async def post(self, project_id: str) -> None:
-        """Generate initial ERD"""
+        """
+        Generate initial ERD.
+
+        Streams the Mermaid text as server-sent events when requested,
+        otherwise starts a background job.
+        """
         try:
-            result = await self.controller.generate_erd(int(project_id))
-            self.set_status(201)
-            self.write_json(result)
+            if self.wants_event_stream():
+                await self.write_events(
+                    self.controller.stream_erd(int(project_id))
+                )
+                return
+
+            self.start_job(
+                "erd_generation", int(project_id), "generate_erd", int(project_id)
+            )
         except ValueError as e:
             raise tornado.web.HTTPError(404, str(e))
         except Exception as e:
             raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
 
     async def put(self, project_id: str) -> None:
-        """Refine ERD based on feedback"""
+        """
+        Refine ERD based on feedback.
+
+        Streams the Mermaid text as server-sent events when requested,
+        otherwise starts a background job.
+        """
         try:
             if not self.json_data:
                 raise tornado.web.HTTPError(400, "Request body must be JSON")
@@ -52,9 +68,19 @@ class ERDHandler(BaseHandler):
             if not feedback:
                 raise tornado.web.HTTPError(400, "Feedback is required")
 
-            result = await self.controller.refine_erd(int(project_id), feedback)
+            if self.wants_event_stream():
+                await self.write_events(
+                    self.controller.stream_refined_erd(int(project_id), feedback)
+                )
+                return
 
-            self.write_json(result)
+            self.start_job(
+                "erd_refinement",
+                int(project_id),
+                "refine_erd",
+                int(project_id),
+                feedback,
+            )
         except ValueError as e:
             raise tornado.web.HTTPError(404, str(e))
         except Exception as e:
@@ -0,0 +1,20 @@
+from handlers.v1.base import BaseHandler
+from database.connection import get_pool_stats
+from utils.llm_cache import get_llm_cache
+
+
+class DBPoolStatsHandler(BaseHandler):
+    """Handler exposing MySQL connection pool statistics for capacity sizing"""
+
+    async def get(self) -> None:
+        """Get live pool statistics for the worker serving this request"""
+        self.write_json({"pool": get_pool_stats()})
+
+
+class LLMCacheStatsHandler(BaseHandler):
+    """Handler exposing LLM response cache counters"""
+
+    async def get(self) -> None:
+        """Get cache hit/miss counters for the worker serving this request"""
+        cache = get_llm_cache()
+        self.write_json({"llm_cache": cache.get_stats() if cache else None})
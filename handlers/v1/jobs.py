@@ -0,0 +1,74 @@
+import tornado.web
+from tornado.ioloop import PeriodicCallback
+from tornado.websocket import WebSocketHandler, WebSocketClosedError
+from handlers.v1.base import BaseHandler
+from services.jobs.manager import JobManager, JobStatus
+from config.settings import JOB_POLL_SECONDS
+from utils.json_encoder import json_dumps
+
+
+class JobHandler(BaseHandler):
+    """Handler for polling and cancelling background jobs"""
+
+    async def get(self, job_id: str) -> None:
+        """Get job status and result"""
+        job = JobManager.get(job_id)
+        if not job:
+            raise tornado.web.HTTPError(404, f"Job {job_id} not found")
+
+        self.write_json({"job": job})
+
+    async def delete(self, job_id: str) -> None:
+        """Cancel a job"""
+        job = JobManager.cancel(job_id)
+        if not job:
+            raise tornado.web.HTTPError(404, f"Job {job_id} not found")
+
+        self.write_json({"message": "Job cancellation requested", "job": job})
+
+
+class JobWebSocketHandler(WebSocketHandler):
+    """Pushes job updates to the client until the job finishes"""
+
+    def check_origin(self, origin):
+        return True
+
+    def open(self, job_id: str):
+        self.job_id = job_id
+        self._last_updated_at = None
+        self._poller = None
+
+        job = JobManager.get(job_id)
+        if not job:
+            self.close(code=4404, reason="Job not found")
+            return
+
+        JobManager.subscribe(job_id, self._send)
+        # The job may be running in another worker process, in which case
+        # only polling the job record will see its updates.
+        self._poller = PeriodicCallback(self._poll, JOB_POLL_SECONDS * 1000)
+        self._poller.start()
+        self._send(job)
+
+    def on_close(self):
+        JobManager.unsubscribe(self.job_id, self._send)
+        if self._poller:
+            self._poller.stop()
+
+    def _poll(self):
+        job = JobManager.get(self.job_id)
+        if job:
+            self._send(job)
+
+    def _send(self, job):
+        if job["updated_at"] == self._last_updated_at:
+            return
+        self._last_updated_at = job["updated_at"]
+
+        try:
+            self.write_message(json_dumps({"job": job}))
+        except WebSocketClosedError:
+            return
+
+        if job["status"] in JobStatus.TERMINAL:
+            self.close()
@@ -1,14 +1,23 @@
-from datetime import datetime
+import asyncio
 import os
 import tornado.web
 from handlers.v1.base import BaseHandler
 from controllers.project import ProjectController
+from config.settings import UPLOAD_MAX_BYTES
+from services.document.parser import DocumentParser, ProgressCallback
+from utils.multipart import MultipartStreamParser
 import json
-from typing import Optional, Any
+from typing import AsyncIterator, Dict, Optional
 
 
+@tornado.web.stream_request_body
 class ProjectItemHandler(BaseHandler):
-    """Handler for single project operations"""
+    """
+    Handler for single project operations.
+
+    Request bodies are streamed: uploaded documents go straight to disk
+    while they arrive instead of being buffered in memory.
+    """
 
     def _get_controller_class(self):
         return ProjectController
@@ -22,55 +31,91 @@ class ProjectItemHandler(BaseHandler):
         ALLOWED_EXTENSIONS = {".pdf", ".txt", ".doc", ".docx"}
         return self._get_file_extension(filename) in ALLOWED_EXTENSIONS
 
-    def _save_uploaded_file(self, file_data) -> tuple[str, str]:
-        """
-        Save uploaded file and return the file path and type.
-
-        Returns:
-            tuple: (file_path, file_type)
-        """
-        filename = file_data["filename"]
+    def _validate_filename(self, filename: str) -> None:
+        """Reject uploads with a file type that is not allowed"""
         if not self._is_allowed_file(filename):
-            raise tornado.web.HTTPError(
-                400, f"File type not allowed. Allowed types: pdf, txt, doc, docx"
+            raise ValueError(
+                "File type not allowed. Allowed types: pdf, txt, doc, docx"
             )
 
-        # Create unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{filename}"
-
-        # Ensure upload directory exists
-        upload_dir = os.path.join(os.getcwd(), "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # Save file
-        file_path = os.path.join(upload_dir, unique_filename)
-        with open(file_path, "wb") as f:
-            f.write(file_data["body"])
-
-        # Get file type without the dot
-        file_type = self._get_file_extension(filename)[1:]
-
-        return file_path, file_type
-
     def prepare(self) -> None:
         """Prepare the request"""
         super().prepare()
+        self.json_data = None
+        self._body = []
+        self._upload = None
+        self._upload_error = None
+
+        self.request.connection.set_max_body_size(UPLOAD_MAX_BYTES)
+        content_length = int(self.request.headers.get("Content-Length", 0))
+        if content_length > UPLOAD_MAX_BYTES:
+            raise tornado.web.HTTPError(
+                413, f"Request body must be at most {UPLOAD_MAX_BYTES} bytes."
+            )
+
         content_type = self.request.headers.get("Content-Type", "")
 
+        # Handle multipart/form-data
+        if content_type.startswith("multipart/form-data"):
+            boundary = None
+            for param in content_type.split(";")[1:]:
+                name, _, value = param.strip().partition("=")
+                if name == "boundary":
+                    boundary = value.strip('"')
+            if not boundary:
+                raise tornado.web.HTTPError(400, "Missing multipart boundary.")
+
+            # File data will be available in self._upload.files
+            # Form fields will be available in self._upload.fields
+            self._upload = MultipartStreamParser(
+                boundary.encode("utf-8"),
+                os.path.join(os.getcwd(), "uploads"),
+                validate_filename=self._validate_filename,
+            )
+
+    def data_received(self, chunk: bytes) -> None:
+        """Consume the next chunk of the request body"""
+        if self._upload is None:
+            self._body.append(chunk)
+            return
+
+        if self._upload_error:
+            return
+        try:
+            self._upload.feed(chunk)
+        except ValueError as e:
+            # Errors can't be sent mid-body; drop the upload and report the
+            # error once the body has been read
+            self._upload_error = str(e)
+            self._upload.discard()
+
+    def on_connection_close(self) -> None:
+        """Remove a partially received upload if the client went away"""
+        super().on_connection_close()
+        if self._upload is not None and not self._upload.complete:
+            self._upload.discard()
+
+    def _parse_body(self) -> None:
+        """Parse the fully received body, raising 400 on invalid input"""
+        if self._upload is not None:
+            if not self._upload_error:
+                try:
+                    self._upload.close()
+                except ValueError as e:
+                    self._upload_error = str(e)
+                    self._upload.discard()
+            if self._upload_error:
+                raise tornado.web.HTTPError(400, self._upload_error)
+            return
+
         # Handle JSON data
-        if content_type.startswith("application/json"):
+        if self.request.headers.get("Content-Type", "").startswith(
+            "application/json"
+        ):
             try:
-                self.json_data = json.loads(self.request.body)
+                self.json_data = json.loads(b"".join(self._body))
             except json.JSONDecodeError:
                 raise tornado.web.HTTPError(400, "Invalid JSON in request body.")
-        # Handle multipart/form-data
-        elif content_type.startswith("multipart/form-data"):
-            self.json_data = None
-            # File data will be available in self.request.files
-            # Form fields will be available in self.request.arguments
-        else:
-            self.json_data = None
 
     async def get(self, project_id: str) -> None:
         """Returns a single project"""
@@ -123,108 +168,20 @@ class ProjectItemHandler(BaseHandler):
             if field in data and not isinstance(data[field], str):
                 raise tornado.web.HTTPError(400, f"{field} must be a string.")
 
-    def process_file_content(self, file_path: str, file_type: str) -> str:
-        """Process the uploaded file and extract content"""
-        try:
-            from langchain_community.document_loaders import (
-                PyPDFLoader,
-                TextLoader,
-                Docx2txtLoader,
-            )
-
-            if file_type == "pdf":
-                loader = PyPDFLoader(file_path)
-                pages = loader.load_and_split()
-                return "\n".join([page.page_content for page in pages])
-
-            elif file_type == "txt":
-                loader = TextLoader(file_path)
-                documents = loader.load()
-                return "\n".join([doc.page_content for doc in documents])
-
-            elif file_type in ["doc", "docx"]:
-                loader = Docx2txtLoader(file_path)
-                documents = loader.load()
-                return "\n".join([doc.page_content for doc in documents])
-
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
-
-        except Exception as e:
-            raise ValueError(f"Error processing file: {str(e)}")
-
     async def put(self, project_id: str) -> None:
         """
         Updates a project. Handles both JSON updates and file uploads.
+
+        With Accept: text/event-stream (or ?stream=1) document parsing
+        progress is sent as server-sent events before the result.
         """
+        self._parse_body()
         try:
-            updates = {}
-            # Handle file upload
-            if self.request.files and "document" in self.request.files:
-                file_data = self.request.files["document"][0]
-
-                # Save file and get path and type
-                file_path, file_type = self._save_uploaded_file(file_data)
-
-                try:
-                    # Process file content
-                    content = self.process_file_content(file_path, file_type)
-
-                    # Add file-related updates
-                    updates.update(
-                        {
-                            "project_content": content,
-                            "document_url": file_path,
-                            "document_type": file_type,
-                        }
-                    )
-
-                finally:
-                    # Optionally remove the file after processing
-                    # os.remove(file_path)
-                    pass
-
-                # Add any form fields if provided
-                for field in ["name", "description"]:
-                    if field in self.request.arguments:
-                        updates[field] = self.request.arguments[field][0].decode(
-                            "utf-8"
-                        )
-
-            # Handle JSON updates
-            elif self.json_data:
-                self._validate_update_data(self.json_data)
-                updates = self.json_data
-
-                # If project_content is provided in JSON, set empty document fields
-            if "project_content" in updates:
-                updates.update({"document_url": "", "document_type": ""})
-            # else:
-            #     raise tornado.web.HTTPError(
-            #         400, "Request must contain either JSON data or file upload."
-            #     )
-
-            # Ensure at least one valid field is being updated
-            valid_fields = [
-                "name",
-                "description",
-                "step1",
-                "step2",
-                "step3",
-                "step4",
-                "erd_schema",
-                "project_content",
-                "document_url",
-                "document_type",
-            ]
-
-            if not any(field in updates for field in valid_fields):
-                raise tornado.web.HTTPError(
-                    400, "At least one valid field must be provided for update."
-                )
+            if self.wants_event_stream():
+                await self.write_events(self._update_events(int(project_id)))
+                return
 
-            # Update project using controller
-            result = self.controller.update(project_id=int(project_id), updates=updates)
+            result = await self._update(int(project_id))
 
             # Send response
             self.write(json.dumps(result))
@@ -234,6 +191,92 @@ class ProjectItemHandler(BaseHandler):
         except Exception as e:
             raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
 
+    async def _update_events(self, project_id: int) -> AsyncIterator[Dict]:
+        """Run the update, yielding parsing progress before the result"""
+        progress = asyncio.Queue()
+
+        def on_progress(done: int, total: int) -> None:
+            progress.put_nowait(
+                {"event": "progress", "data": {"done": done, "total": total}}
+            )
+
+        update = asyncio.ensure_future(self._update(project_id, on_progress))
+        while True:
+            event = asyncio.ensure_future(progress.get())
+            await asyncio.wait({update, event}, return_when=asyncio.FIRST_COMPLETED)
+            if not event.done():
+                event.cancel()
+                break
+            yield event.result()
+
+        while not progress.empty():
+            yield progress.get_nowait()
+
+        yield {"event": "complete", "data": update.result()}
+
+    async def _update(
+        self, project_id: int, on_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """Apply the update from the parsed body"""
+        updates = {}
+        # Handle file upload
+        if self._upload is not None and "document" in self._upload.files:
+            uploaded = self._upload.files["document"]
+            file_type = self._get_file_extension(uploaded.filename)[1:]
+
+            # Process file content in the parser pool
+            content = await DocumentParser.parse(
+                uploaded.path,
+                file_type,
+                content_hash=uploaded.content_hash,
+                on_progress=on_progress,
+            )
+
+            # Add file-related updates
+            updates.update(
+                {
+                    "project_content": content,
+                    "document_url": uploaded.path,
+                    "document_type": file_type,
+                }
+            )
+
+            # Add any form fields if provided
+            for field in ["name", "description"]:
+                if field in self._upload.fields:
+                    updates[field] = self._upload.fields[field]
+
+        # Handle JSON updates
+        elif self.json_data:
+            self._validate_update_data(self.json_data)
+            updates = self.json_data
+
+        # If project_content is provided in JSON, set empty document fields
+        if "project_content" in updates:
+            updates.update({"document_url": "", "document_type": ""})
+
+        # Ensure at least one valid field is being updated
+        valid_fields = [
+            "name",
+            "description",
+            "step1",
+            "step2",
+            "step3",
+            "step4",
+            "erd_schema",
+            "project_content",
+            "document_url",
+            "document_type",
+        ]
+
+        if not any(field in updates for field in valid_fields):
+            raise tornado.web.HTTPError(
+                400, "At least one valid field must be provided for update."
+            )
+
+        # Update project using controller
+        return self.controller.update(project_id=project_id, updates=updates)
+
 
 class ProjectCollectionHandler(BaseHandler):
     """Handler for multiple project operations"""
@@ -22,11 +22,14 @@ class PromptHandler(BaseHandler):
             raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
 
     async def post(self, project_id: str) -> None:
-        """Generate and save prompts for a project"""
+        """Start prompt generation for a project as a background job"""
         try:
-            result = await self.controller.generate_and_save_prompts(int(project_id))
-            self.set_status(201)
-            self.write_json(result)
+            self.start_job(
+                "prompt_generation",
+                int(project_id),
+                "generate_and_save_prompts",
+                int(project_id),
+            )
         except ValueError as e:
             raise tornado.web.HTTPError(404, str(e))
         except Exception as e:
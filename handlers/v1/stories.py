@@ -155,15 +155,16 @@ class StoryGenerationHandler(BaseHandler):
         return StoryController
 
     async def post(self, project_id: str, epic_id: str) -> None:
-        """Generate stories for an epic"""
+        """Start story generation for an epic as a background job"""
         try:
-            result = await self.controller.generate_stories(
-                int(project_id), int(epic_id)
+            self.start_job(
+                "story_generation",
+                int(project_id),
+                "generate_stories",
+                int(project_id),
+                int(epic_id),
             )
 
-            self.set_status(201)
-            self.write_json(result)
-
         except ValueError as e:
             if "not found" in str(e):
                 raise tornado.web.HTTPError(404, str(e))
@@ -171,3 +172,58 @@ class StoryGenerationHandler(BaseHandler):
                 raise tornado.web.HTTPError(400, str(e))
         except Exception as e:
             raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
+
+
+class ProjectStoryGenerationHandler(BaseHandler):
+    """Handler for generating stories for many epics of a project"""
+
+    def _get_controller_class(self):
+        return StoryController
+
+    def prepare(self) -> None:
+        """Prepare the request"""
+        super().prepare()
+        if self.request.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                self.json_data = json.loads(self.request.body)
+            except json.JSONDecodeError:
+                raise tornado.web.HTTPError(400, "Invalid JSON in request body")
+        else:
+            self.json_data = None
+
+    async def post(self, project_id: str) -> None:
+        """
+        Generate stories for every epic without stories, or for the epics in
+        the optional "epic_ids" list.
+
+        Streams per-epic progress as server-sent events when requested,
+        otherwise starts a background job whose progress lists each epic.
+        """
+        try:
+            epic_ids = (self.json_data or {}).get("epic_ids")
+            if epic_ids is not None and (
+                not isinstance(epic_ids, list)
+                or not all(isinstance(epic_id, int) for epic_id in epic_ids)
+            ):
+                raise tornado.web.HTTPError(400, "epic_ids must be a list of integers")
+
+            if self.wants_event_stream():
+                await self.write_events(
+                    self.controller.generate_project_stories(int(project_id), epic_ids)
+                )
+                return
+
+            self.start_job(
+                "story_bulk_generation",
+                int(project_id),
+                "generate_project_stories",
+                int(project_id),
+                epic_ids,
+            )
+
+        except tornado.web.HTTPError:
+            raise
+        except ValueError as e:
+            raise tornado.web.HTTPError(404, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(500, f"Internal server error: {str(e)}")
@@ -1,17 +1,42 @@
 import os
+import asyncio
+import signal
+import time
 from dotenv import load_dotenv
 import tornado.ioloop
+import tornado.netutil
+import tornado.process
+from tornado.httpserver import HTTPServer
 from tornado.web import RedirectHandler
 from tornado import autoreload
 
 from constants import urls_v1
-from handlers.v1.base import DefaultHandler
+from config.settings import (
+    DEBUG,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SHUTDOWN_GRACE_SECONDS,
+)
+from database.connection import dispose_connections, reset_connections
+from handlers.v1.base import BaseHandler, DefaultHandler
 from handlers.v1.projects import ProjectCollectionHandler, ProjectItemHandler
 from handlers.v1.features import FeatureCollectionHandler, FeatureItemHandler
-from handlers.v1.codegen import CodeGenHandler
+from handlers.v1.codegen import (
+    CodeGenHandler,
+    CodeGenRunCollectionHandler,
+    CodeGenRunHandler,
+)
 from handlers.v1.tech_bundles import TechBundleHandler
-from handlers.v1.epics import EpicGenerationHandler, EpicHandler
-from handlers.v1.stories import StoryGenerationHandler, StoryHandler
+from handlers.v1.epics import (
+    EpicBulkGenerationHandler,
+    EpicGenerationHandler,
+    EpicHandler,
+)
+from handlers.v1.stories import (
+    ProjectStoryGenerationHandler,
+    StoryGenerationHandler,
+    StoryHandler,
+)
 from handlers.v1.erd import ERDHandler
 from handlers.v1.data_models import DataModelCollectionHandler, DataModelItemHandler
 from handlers.v1.theme import ThemeHandler
@@ -25,12 +50,17 @@ from handlers.v1.github import GitHubDeploymentsHandler
 from handlers.v1.filesystem import FileSystemHandler, CommandExecuteHandler
 from handlers.v1.verify_credentials import ConnectionTestHandler
 from handlers.v1.testingaide import TestingaideSyncHandler
+from handlers.v1.jobs import JobHandler, JobWebSocketHandler
+from handlers.v1.health import DBPoolStatsHandler, LLMCacheStatsHandler
 from utils.deploy_utils import LogWebSocketHandler
+from utils.llm_executor import LLMExecutor
+from services.document.parser import DocumentParser
+from services.jobs.manager import JobManager
 
 # Load environment variables from .env file
 load_dotenv()
 
-DEFAULT_PORT = 8000
+DEFAULT_PORT = SERVER_PORT
 
 BASE_URL_PREFIX = "/restapi"
 URL_PREFIX_V1 = "/restapi/v1"
@@ -39,6 +69,8 @@ URL_PREFIX_V1 = "/restapi/v1"
 def get_handlers(handler_kwargs):
     handlers = [
         (urls_v1.codegen, CodeGenHandler, handler_kwargs),
+        (urls_v1.codegen_runs, CodeGenRunCollectionHandler, handler_kwargs),
+        (urls_v1.codegen_run, CodeGenRunHandler, handler_kwargs),
         (urls_v1.projects, ProjectCollectionHandler, handler_kwargs),
         (urls_v1.project, ProjectItemHandler, handler_kwargs),
         (urls_v1.features, FeatureCollectionHandler, handler_kwargs),
@@ -47,8 +79,10 @@ def get_handlers(handler_kwargs):
         (urls_v1.project_tech_bundle, TechBundleHandler, handler_kwargs),
         (urls_v1.epic, EpicHandler, handler_kwargs),
         (urls_v1.epic_generation, EpicGenerationHandler, handler_kwargs),
+        (urls_v1.epic_bulk_generation, EpicBulkGenerationHandler, handler_kwargs),
         (urls_v1.story, StoryHandler, handler_kwargs),
         (urls_v1.story_generation, StoryGenerationHandler, handler_kwargs),
+        (urls_v1.story_bulk_generation, ProjectStoryGenerationHandler, handler_kwargs),
         (urls_v1.erd, ERDHandler, handler_kwargs),
         (urls_v1.data_models, DataModelCollectionHandler, handler_kwargs),
         (urls_v1.data_model, DataModelItemHandler, handler_kwargs),
@@ -63,6 +97,10 @@ def get_handlers(handler_kwargs):
         (urls_v1.execute, CommandExecuteHandler, handler_kwargs),
         (urls_v1.test_credentials, ConnectionTestHandler, handler_kwargs),
         (urls_v1.testingaide_sync, TestingaideSyncHandler, handler_kwargs),
+        (urls_v1.job, JobHandler, handler_kwargs),
+        (urls_v1.ws_job, JobWebSocketHandler, handler_kwargs),
+        (urls_v1.db_pool_stats, DBPoolStatsHandler, handler_kwargs),
+        (urls_v1.llm_cache_stats, LLMCacheStatsHandler, handler_kwargs),
     ]
     return handlers
 
@@ -72,6 +110,97 @@ def make_app():
     return tornado.web.Application(handlers, DefaultHandler)
 
 
+async def shutdown(server):
+    """Stop accepting connections and let in-flight requests finish"""
+    print("Shutting down, waiting for %d active requests" % BaseHandler.active_requests)
+    server.stop()
+
+    deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+    while BaseHandler.active_requests > 0 and time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+
+    LLMExecutor.shutdown(wait=False)
+    DocumentParser.shutdown(wait=False)
+    tornado.ioloop.IOLoop.current().stop()
+
+
+def install_signal_handlers(server):
+    """Shut the worker down gracefully on SIGTERM/SIGINT"""
+    io_loop = tornado.ioloop.IOLoop.current()
+
+    def handle_signal(signum, frame):
+        io_loop.add_callback_from_signal(shutdown, server)
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+
+def forward_signals_to_workers():
+    """Make the supervising process pass SIGTERM/SIGINT on to its workers"""
+    forwarded = set()
+
+    def handle_signal(signum, frame):
+        if signum in forwarded:
+            return
+        forwarded.add(signum)
+        # Workers share our process group; they exit 0 after a graceful
+        # shutdown, which makes fork_processes exit instead of restarting.
+        os.killpg(os.getpgrp(), signum)
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+
+def fail_orphaned_jobs():
+    """Fail the jobs a stopped or crashed worker left unfinished"""
+    try:
+        failed = JobManager.fail_orphaned_jobs()
+    except Exception as e:
+        print("Could not check for orphaned jobs: %s" % str(e))
+        return
+    if failed:
+        print("Marked %d orphaned job(s) as failed" % failed)
+
+
+def run_development(app):
+    """Single process with autoreload on imported source modules"""
+    app.debug = True
+    # Imported modules are watched automatically, so generated files under
+    # the projects folder never trigger a restart.
+    autoreload.start()
+    if os.path.exists(".env"):
+        autoreload.watch(".env")
+
+    fail_orphaned_jobs()
+    server = HTTPServer(app, decompress_request=True)
+    server.listen(DEFAULT_PORT)
+    install_signal_handlers(server)
+    print("Starting development server on port %d" % DEFAULT_PORT)
+    tornado.ioloop.IOLoop.current().start()
+
+
+def run_production(app):
+    """Pre-forked workers sharing one listening socket, no autoreload"""
+    sockets = tornado.netutil.bind_sockets(DEFAULT_PORT)
+
+    # Connections opened at import time must not be shared across workers
+    dispose_connections()
+    forward_signals_to_workers()
+    tornado.process.fork_processes(SERVER_WORKERS)
+    reset_connections()
+    # Also runs in workers restarted after a crash, for the jobs they lost
+    fail_orphaned_jobs()
+
+    server = HTTPServer(app, decompress_request=True)
+    server.add_sockets(sockets)
+    install_signal_handlers(server)
+    print(
+        "Worker %d (pid %d) serving on port %d"
+        % (tornado.process.task_id(), os.getpid(), DEFAULT_PORT)
+    )
+    tornado.ioloop.IOLoop.current().start()
+
+
 def main(debug=False):
     # Verify environment variables are loaded
     required_vars = [
@@ -88,16 +217,12 @@ def main(debug=False):
 
     app = make_app()
 
-    if debug:
-        app.debug = True
-        autoreload.start()
-        autoreload.watch(".")
-
-    print("Starting server on port %d" % DEFAULT_PORT)
     print("Environment variables loaded successfully.")
-    app.listen(DEFAULT_PORT, decompress_request=True)
-    tornado.ioloop.IOLoop.instance().start()
+    if debug:
+        run_development(app)
+    else:
+        run_production(app)
 
 
 if __name__ == "__main__":
-    main(True)
+    main(DEBUG)
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from pymongo.errors import PyMongoError
+from config.settings import DOCUMENT_PARSER_WORKERS, PDF_PAGES_PER_TASK
+from database.connection import document_text_collection
+
+# Bump when extraction output changes so older cached text is not reused
+PARSER_VERSION = 1
+
+# Called with (units_done, units_total) as extraction advances
+ProgressCallback = Callable[[int, int], None]
+
+
+# Worker functions run in the process pool and must stay module level so
+# they can be pickled.
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(file_path).pages)
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    return [reader.pages[index].extract_text() for index in range(start, end)]
+
+
+def _extract_document(file_path: str, file_type: str) -> str:
+    from langchain_community.document_loaders import TextLoader, Docx2txtLoader
+
+    if file_type == "txt":
+        loader = TextLoader(file_path)
+    elif file_type in ["doc", "docx"]:
+        loader = Docx2txtLoader(file_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+    return "\n".join([doc.page_content for doc in loader.load()])
+
+
+class DocumentParser:
+    """Extracts text from uploaded documents in a process pool"""
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        """Get the shared parser pool, creating it on first use"""
+        with cls._lock:
+            if cls._executor is None:
+                # Workers come from a forkserver: forking the server itself,
+                # with its LLM, job and codegen threads, could copy a held lock
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=DOCUMENT_PARSER_WORKERS or None,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """Shut down the parser pool"""
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=wait)
+                cls._executor = None
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """SHA-256 of a file's content"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    async def parse(
+        cls,
+        file_path: str,
+        file_type: str,
+        content_hash: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        """
+        Extract the text of a document without blocking the IOLoop.
+
+        PDFs are split into page ranges extracted in parallel. Extracted text
+        is cached by content hash, so parsing the same file again is a lookup.
+
+        Args:
+            file_path (str): Path of the uploaded file
+            file_type (str): Extension without the dot (pdf, txt, doc, docx)
+            content_hash (str, optional): SHA-256 of the file if already known
+            on_progress (callable, optional): Progress callback; units are
+                pages for PDFs and the whole file otherwise
+
+        Returns:
+            Extracted text
+
+        Raises:
+            ValueError: If the file cannot be processed
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            if content_hash is None:
+                content_hash = await loop.run_in_executor(
+                    None, cls.hash_file, file_path
+                )
+
+            text = cls._get_cached(content_hash, file_type)
+            if text is not None:
+                if on_progress:
+                    on_progress(1, 1)
+                return text
+
+            if file_type == "pdf":
+                text = await cls._parse_pdf(file_path, on_progress)
+            else:
+                text = await cls._run(_extract_document, file_path, file_type)
+                if on_progress:
+                    on_progress(1, 1)
+
+            cls._store_cached(content_hash, file_type, text)
+            return text
+
+        except Exception as e:
+            raise ValueError(f"Error processing file: {str(e)}")
+
+    @classmethod
+    async def _parse_pdf(
+        cls, file_path: str, on_progress: Optional[ProgressCallback]
+    ) -> str:
+        total = await cls._run(_count_pdf_pages, file_path)
+        ranges = [
+            (start, min(start + PDF_PAGES_PER_TASK, total))
+            for start in range(0, total, PDF_PAGES_PER_TASK)
+        ]
+
+        pages_done = 0
+
+        def report(count: int) -> None:
+            nonlocal pages_done
+            pages_done += count
+            on_progress(pages_done, total)
+
+        if on_progress:
+            on_progress(0, total)
+
+        tasks = []
+        for start, end in ranges:
+            task = asyncio.ensure_future(
+                cls._run(_extract_pdf_pages, file_path, start, end)
+            )
+            if on_progress:
+                task.add_done_callback(lambda _, count=end - start: report(count))
+            tasks.append(task)
+
+        chunks = await asyncio.gather(*tasks)
+        return "\n".join(page for chunk in chunks for page in chunk)
+
+    @classmethod
+    async def _run(cls, fn, *args):
+        """Run a worker function in the pool, resetting the pool if it broke"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(cls.get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # A crashed worker poisons the whole pool; start a fresh one
+            cls.shutdown(wait=False)
+            raise
+
+    @staticmethod
+    def _get_cached(content_hash: str, file_type: str) -> Optional[str]:
+        doc = document_text_collection.find_one(
+            {"_id": content_hash, "file_type": file_type, "version": PARSER_VERSION},
+            projection={"text": 1},
+        )
+        return doc["text"] if doc else None
+
+    @staticmethod
+    def _store_cached(content_hash: str, file_type: str, text: str) -> None:
+        try:
+            document_text_collection.replace_one(
+                {"_id": content_hash},
+                {
+                    "file_type": file_type,
+                    "version": PARSER_VERSION,
+                    "text": text,
+                    "created_at": datetime.now(timezone.utc),
+                },
+                upsert=True,
+            )
+        except PyMongoError as e:
+            # Caching is best effort, e.g. text over the document size limit
+            print(f"Warning: Failed to cache document text: {str(e)}")
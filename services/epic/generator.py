@@ -1,13 +1,17 @@
 from typing import Dict, List
-import json
 from utils.llm_helper import LLMHelper
+from utils.llm_executor import LLMExecutor
 
 
 class EpicGenerator:
     """Service for generating epics from features"""
 
     def __init__(self, model_name: str = None):
-        self.llm = LLMHelper.get_llm(model_name) if model_name else LLMHelper.get_llm()
+        self.llm = (
+            LLMHelper.get_llm(model_name, cached=True)
+            if model_name
+            else LLMHelper.get_llm(cached=True)
+        )
 
     @property
     def system_prompt(self) -> str:
@@ -25,7 +29,7 @@ You are a technical lead creating structured epics that balance functional and t
    - Maintaining clarity and purpose
 """
 
-    def generate_epic(self, feature: Dict, tech_stack: str, requirements: str) -> Dict:
+    async def generate_epic(self, feature: Dict, tech_stack: str, requirements: str) -> Dict:
         """Generate epic from feature"""
         messages = [
             {"role": "system", "content": self.system_prompt},
@@ -47,5 +51,4 @@ Generate epic in this format:
             },
         ]
 
-        response = self.llm.invoke(messages)
-        return json.loads(response.content.replace("```json", "").replace("```", ""))
+        return await LLMExecutor.ainvoke_json(self.llm, messages)
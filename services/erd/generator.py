@@ -1,13 +1,27 @@
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 import json
 from utils.llm_helper import LLMHelper
+from utils.llm_executor import LLMExecutor
+
+# Mermaid theme configuration prepended to every generated ERD
+THEME_CONFIG = """
+%%{
+init: {
+    'theme': 'forest'
+}
+}%%
+"""
 
 
 class ERDGenerator:
     """Service for generating and refining ERDs"""
 
     def __init__(self, model_name: str = None):
-        self.llm = LLMHelper.get_llm(model_name) if model_name else LLMHelper.get_llm()
+        self.llm = (
+            LLMHelper.get_llm(model_name, cached=True)
+            if model_name
+            else LLMHelper.get_llm(cached=True)
+        )
 
     @property
     def generation_prompt(self) -> str:
@@ -148,11 +162,10 @@ erDiagram
 Return only valid Mermaid JS code without any additional text or explanations.
 """
 
-    def generate_erd(
+    def _generation_messages(
         self, requirements: str, features: List[Dict], tech_stack: Dict
-    ) -> str:
-        """Generate initial ERD"""
-        messages = [
+    ) -> List[Dict]:
+        return [
             {
                 "role": "user",
                 "content": self.generation_prompt.format(
@@ -165,28 +178,10 @@ Return only valid Mermaid JS code without any additional text or explanations.
             }
         ]
 
-        response = self.llm.invoke(messages)
-
-        # Add theme configuration
-        mermaid_code = """
-%%{
-init: {
-    'theme': 'forest'
-}
-}%%
-""" + response.content.replace(
-            "```mermaid", ""
-        ).replace(
-            "```", ""
-        )
-
-        return mermaid_code
-
-    def refine_erd(
+    def _refinement_messages(
         self, current_erd: str, feedback: str, requirements: str, features: List[Dict]
-    ) -> str:
-        """Refine ERD based on feedback"""
-        messages = [
+    ) -> List[Dict]:
+        return [
             {
                 "role": "user",
                 "content": self.refinement_prompt.format(
@@ -198,19 +193,78 @@ init: {
             }
         ]
 
-        response = self.llm.invoke(messages)
+    @staticmethod
+    def _strip_fences(content: str) -> str:
+        return content.replace("```mermaid", "").replace("```", "")
+
+    async def generate_erd(
+        self, requirements: str, features: List[Dict], tech_stack: Dict
+    ) -> str:
+        """Generate initial ERD"""
+        messages = self._generation_messages(requirements, features, tech_stack)
+
+        response = await LLMExecutor.ainvoke(self.llm, messages)
 
         # Add theme configuration
-        mermaid_code = """
-%%{
-init: {
-    'theme': 'forest'
-}
-}%%
-""" + response.content.replace(
-            "```mermaid", ""
-        ).replace(
-            "```", ""
+        return THEME_CONFIG + self._strip_fences(response.content)
+
+    async def refine_erd(
+        self, current_erd: str, feedback: str, requirements: str, features: List[Dict]
+    ) -> str:
+        """Refine ERD based on feedback"""
+        messages = self._refinement_messages(
+            current_erd, feedback, requirements, features
         )
 
-        return mermaid_code
+        response = await LLMExecutor.ainvoke(self.llm, messages)
+
+        # Add theme configuration
+        return THEME_CONFIG + self._strip_fences(response.content)
+
+    def stream_erd(
+        self, requirements: str, features: List[Dict], tech_stack: Dict
+    ) -> AsyncIterator[str]:
+        """Stream the initial ERD as Mermaid text chunks"""
+        messages = self._generation_messages(requirements, features, tech_stack)
+        return self._stream_mermaid(messages)
+
+    def stream_refined_erd(
+        self, current_erd: str, feedback: str, requirements: str, features: List[Dict]
+    ) -> AsyncIterator[str]:
+        """Stream the refined ERD as Mermaid text chunks"""
+        messages = self._refinement_messages(
+            current_erd, feedback, requirements, features
+        )
+        return self._stream_mermaid(messages)
+
+    async def _stream_mermaid(self, messages: List[Dict]) -> AsyncIterator[str]:
+        """
+        Stream model output with code fences removed.
+
+        Joining the yielded chunks gives exactly what generate_erd/refine_erd
+        would have returned.
+        """
+        yield THEME_CONFIG
+
+        content = ""
+        emitted = ""
+        async for chunk in LLMExecutor.astream(self.llm, messages):
+            content += chunk.content
+
+            # Hold back a trailing run of backticks that may still turn out
+            # to be a code fence until the next chunks show what it is
+            safe_length = len(content)
+            backtick = content.rfind("`")
+            if backtick != -1 and "mermaid".startswith(content[backtick + 1 :]):
+                safe_length = backtick
+                while safe_length > 0 and content[safe_length - 1] == "`":
+                    safe_length -= 1
+
+            cleaned = self._strip_fences(content[:safe_length])
+            if len(cleaned) > len(emitted):
+                yield cleaned[len(emitted):]
+                emitted = cleaned
+
+        cleaned = self._strip_fences(content)
+        if len(cleaned) > len(emitted):
+            yield cleaned[len(emitted):]
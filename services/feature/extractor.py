@@ -1,6 +1,16 @@
 from typing import Dict, Optional, List
+import asyncio
 import json
+import re
+from config.settings import FEATURE_CHUNK_CHARS, FEATURE_CHUNK_CONCURRENCY
 from utils.llm_helper import LLMHelper
+from utils.llm_executor import LLMExecutor
+
+# Lines that start a new section: markdown headings, numbered headings
+# ("2.", "3.1 Scope") and short all-caps titles
+_HEADING = re.compile(
+    r"^\s*(#{1,6}\s+\S|\d+(\.\d+)*[.)]?\s+\S.{0,80}$|[A-Z][A-Z0-9 &/,:-]{2,80}$)"
+)
 
 
 class FeatureExtractor:
@@ -13,7 +23,11 @@ class FeatureExtractor:
         Args:
             model_name (str, optional): Name of the LLM model to use
         """
-        self.llm = LLMHelper.get_llm(model_name) if model_name else LLMHelper.get_llm()
+        self.llm = (
+            LLMHelper.get_llm(model_name, cached=True)
+            if model_name
+            else LLMHelper.get_llm(cached=True)
+        )
 
     @property
     def system_prompt(self) -> str:
@@ -49,7 +63,7 @@ VALIDATION RULES:
 5. No duplicates between extracted and suggested features
 """
 
-    def extract_and_suggest(self, document_content: str) -> Dict[str, List[Dict]]:
+    async def extract_and_suggest(self, document_content: str) -> Dict[str, List[Dict]]:
         """
         Extract features from document content and suggest additional features.
 
@@ -63,59 +77,172 @@ VALIDATION RULES:
             ValueError: If feature extraction fails
         """
         try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {
-                    "role": "user",
-                    "content": f"""
-                    Please analyze this document and extract features:
-
-                    {document_content}
-
-                    Provide the output in this format:
-                    {{
-                        "extracted_features": [
-                            {{
-                                "name": "Feature Name",
-                                "description": "Feature description",
-                                "type": "EXTRACTED",
-                                "is_finalized": false
-                            }}
-                        ],
-                        "suggested_features": [
-                            {{
-                                "name": "Suggested Feature Name",
-                                "description": "Suggested feature description",
-                                "type": "SUGGESTED",
-                                "is_finalized": false
-                            }}
-                        ]
-                    }}
-                    """,
-                },
-            ]
-
-            # Get response from LLM
-            response = self.llm.invoke(messages)
-
-            # Parse the response
-            features_data = json.loads(
-                response.content.replace("```json", "").replace("```", "")
+            return await self._extract(
+                "Please analyze this document and extract features:",
+                document_content,
             )
 
-            # Validate the response format
-            if not isinstance(features_data, dict):
-                raise ValueError("Invalid response format from LLM")
+        except json.JSONDecodeError:
+            raise ValueError("Failed to parse LLM response as JSON")
+        except Exception as e:
+            raise ValueError(f"Error extracting features: {str(e)}")
+
+    async def extract_and_suggest_chunked(
+        self,
+        document_content: str,
+        chunk_size: int = FEATURE_CHUNK_CHARS,
+        concurrency: int = FEATURE_CHUNK_CONCURRENCY,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Extract features from a long document section by section.
+
+        The document is split on section boundaries into chunks of at most
+        `chunk_size` characters, each chunk is analysed separately with at
+        most `concurrency` requests in flight, and the per-chunk results are
+        merged and deduplicated.
+
+        Args:
+            document_content (str): The project content to analyze
+            chunk_size (int): Maximum characters per chunk
+            concurrency (int): Maximum chunks analysed at the same time
 
-            if (
-                "extracted_features" not in features_data
-                or "suggested_features" not in features_data
-            ):
-                raise ValueError("Missing required feature categories in response")
+        Returns:
+            Dict containing extracted and suggested features
 
-            return features_data
+        Raises:
+            ValueError: If feature extraction fails for any chunk
+        """
+        try:
+            chunks = self.split_sections(document_content, chunk_size)
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def extract_chunk(index: int, chunk: str) -> Dict[str, List[Dict]]:
+                async with semaphore:
+                    return await self._extract(
+                        f"Please analyze part {index + 1} of {len(chunks)} of a "
+                        "larger document and extract features. Only report "
+                        "features supported by this part:",
+                        chunk,
+                    )
+
+            results = await asyncio.gather(
+                *[extract_chunk(index, chunk) for index, chunk in enumerate(chunks)]
+            )
+            return self.merge_features(results)
 
         except json.JSONDecodeError:
             raise ValueError("Failed to parse LLM response as JSON")
         except Exception as e:
             raise ValueError(f"Error extracting features: {str(e)}")
+
+    async def _extract(self, instruction: str, document_content: str) -> Dict[str, List[Dict]]:
+        """Run the extraction prompt on some document content"""
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {
+                "role": "user",
+                "content": f"""
+                {instruction}
+
+                {document_content}
+
+                Provide the output in this format:
+                {{
+                    "extracted_features": [
+                        {{
+                            "name": "Feature Name",
+                            "description": "Feature description",
+                            "type": "EXTRACTED",
+                            "is_finalized": false
+                        }}
+                    ],
+                    "suggested_features": [
+                        {{
+                            "name": "Suggested Feature Name",
+                            "description": "Suggested feature description",
+                            "type": "SUGGESTED",
+                            "is_finalized": false
+                        }}
+                    ]
+                }}
+                """,
+            },
+        ]
+
+        # Get the parsed response from the LLM
+        features_data = await LLMExecutor.ainvoke_json(self.llm, messages)
+
+        # Validate the response format
+        if not isinstance(features_data, dict):
+            raise ValueError("Invalid response format from LLM")
+
+        if (
+            "extracted_features" not in features_data
+            or "suggested_features" not in features_data
+        ):
+            raise ValueError("Missing required feature categories in response")
+
+        return features_data
+
+    @staticmethod
+    def split_sections(document_content: str, chunk_size: int) -> List[str]:
+        """
+        Split a document into chunks of at most `chunk_size` characters.
+
+        Chunks break at headings where possible, then at paragraphs, and
+        only cut through text when a single paragraph is too long.
+        """
+        sections, current = [], []
+        for line in document_content.splitlines():
+            if current and _HEADING.match(line):
+                sections.append("\n".join(current))
+                current = []
+            current.append(line)
+        if current:
+            sections.append("\n".join(current))
+
+        pieces = []
+        for section in sections:
+            if len(section) <= chunk_size:
+                pieces.append(section)
+                continue
+            for paragraph in re.split(r"\n\s*\n", section):
+                pieces.extend(
+                    paragraph[start : start + chunk_size]
+                    for start in range(0, len(paragraph), chunk_size)
+                )
+
+        chunks, buffer = [], ""
+        for piece in pieces:
+            if buffer and len(buffer) + len(piece) + 1 > chunk_size:
+                chunks.append(buffer)
+                buffer = piece
+            else:
+                buffer = f"{buffer}\n{piece}" if buffer else piece
+        if buffer.strip():
+            chunks.append(buffer)
+
+        return [chunk for chunk in chunks if chunk.strip()]
+
+    @staticmethod
+    def merge_features(results: List[Dict[str, List[Dict]]]) -> Dict[str, List[Dict]]:
+        """
+        Merge per-chunk results, dropping features with the same name.
+
+        Names are compared ignoring case and punctuation. A feature found in
+        the document always wins over the same feature suggested elsewhere,
+        and otherwise the first occurrence is kept.
+        """
+        merged = {"extracted_features": [], "suggested_features": []}
+        seen = set()
+
+        for category in ["extracted_features", "suggested_features"]:
+            for result in results:
+                for feature in result.get(category, []):
+                    key = re.sub(r"[^a-z0-9]+", " ", feature["name"].lower()).strip()
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    merged[category].append(feature)
+
+        return merged
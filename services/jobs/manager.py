@@ -0,0 +1,360 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from bson.objectid import ObjectId  # type: ignore
+from tornado.ioloop import PeriodicCallback
+from config.settings import JOB_WORKERS, JOB_POLL_SECONDS
+from database.connection import job_collection
+from utils.json_encoder import json_dumps
+
+
+class JobStatus:
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+    TERMINAL = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobManager:
+    """
+    Runs long controller operations in the background and tracks them in MongoDB.
+
+    Each job gets its own controller instance (and so its own DB session).
+    Coroutine methods run on the IOLoop, plain methods on a thread pool; at
+    most JOB_WORKERS jobs run at once per process.
+
+    Jobs record the host and pid of the process running them, so a process
+    starting up can fail the jobs a dead process left behind; see
+    fail_orphaned_jobs.
+
+    A method may also be an async generator of {"event": name, "data": payload}
+    events (the shape BaseHandler.write_events streams). Every event but the
+    last "complete" one is appended to the job's "progress" list, and the
+    "complete" event's data becomes the job result.
+    """
+
+    _tasks: Dict[str, asyncio.Task] = {}
+    _listeners: Dict[str, set] = {}
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _cancel_watcher: Optional[PeriodicCallback] = None
+
+    @classmethod
+    def submit(
+        cls,
+        job_type: str,
+        project_id: int,
+        controller_class: type,
+        method_name: str,
+        *args: Any,
+    ) -> Dict:
+        """
+        Create a job record and schedule the controller method.
+
+        Args:
+            job_type (str): Kind of job, e.g. "epic_generation"
+            project_id (int): Project the job belongs to
+            controller_class (type): Controller to instantiate for the job
+            method_name (str): Controller method to call
+            *args: Arguments for the controller method
+
+        Returns:
+            Dict: The queued job record
+        """
+        now = datetime.now(timezone.utc)
+        result = job_collection.insert_one(
+            {
+                "type": job_type,
+                "project_id": project_id,
+                "status": JobStatus.QUEUED,
+                "result": None,
+                "progress": [],
+                "error": None,
+                "cancel_requested": False,
+                "created_at": now,
+                "updated_at": now,
+                "started_at": None,
+                "finished_at": None,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+            }
+        )
+        job_id = str(result.inserted_id)
+
+        task = asyncio.ensure_future(
+            cls._run(job_id, controller_class, method_name, args)
+        )
+        cls._tasks[job_id] = task
+        task.add_done_callback(lambda _: cls._tasks.pop(job_id, None))
+        cls._start_cancel_watcher()
+
+        return cls.get(job_id)
+
+    @classmethod
+    def get(cls, job_id: str) -> Optional[Dict]:
+        """Get a job record by ID"""
+        if not ObjectId.is_valid(job_id):
+            return None
+
+        doc = job_collection.find_one({"_id": ObjectId(job_id)})
+        if not doc:
+            return None
+
+        doc["id"] = str(doc.pop("_id"))
+        return doc
+
+    @classmethod
+    def cancel(cls, job_id: str) -> Optional[Dict]:
+        """
+        Request cancellation of a job.
+
+        A job running in this process is cancelled right away; one running in
+        another worker process is picked up by that process' cancel watcher.
+        Work already handed to a thread cannot be interrupted, but its result
+        is discarded.
+        """
+        job = cls.get(job_id)
+        if not job or job["status"] in JobStatus.TERMINAL:
+            return job
+
+        job_collection.update_one(
+            {"_id": ObjectId(job_id)},
+            {
+                "$set": {
+                    "cancel_requested": True,
+                    "updated_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+
+        task = cls._tasks.get(job_id)
+        if task:
+            task.cancel()
+
+        return cls.get(job_id)
+
+    @classmethod
+    def subscribe(cls, job_id: str, callback: Callable[[Dict], None]) -> None:
+        """Call `callback` with the job record whenever this process updates it"""
+        cls._listeners.setdefault(job_id, set()).add(callback)
+
+    @classmethod
+    def unsubscribe(cls, job_id: str, callback: Callable[[Dict], None]) -> None:
+        listeners = cls._listeners.get(job_id)
+        if listeners:
+            listeners.discard(callback)
+            if not listeners:
+                del cls._listeners[job_id]
+
+    @classmethod
+    async def _run(
+        cls, job_id: str, controller_class: type, method_name: str, args: Tuple
+    ) -> None:
+        try:
+            async with cls._get_semaphore():
+                cls._update(
+                    job_id,
+                    status=JobStatus.RUNNING,
+                    started_at=datetime.now(timezone.utc),
+                )
+                result = await cls._call(job_id, controller_class, method_name, args)
+
+            cls._update(
+                job_id,
+                status=JobStatus.COMPLETED,
+                # Store exactly what the synchronous endpoint would have returned
+                result=json.loads(json_dumps(result)),
+                finished_at=datetime.now(timezone.utc),
+            )
+        except asyncio.CancelledError:
+            cls._update(
+                job_id,
+                status=JobStatus.CANCELLED,
+                finished_at=datetime.now(timezone.utc),
+            )
+        except Exception as e:
+            cls._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=str(e),
+                finished_at=datetime.now(timezone.utc),
+            )
+
+    @classmethod
+    async def _call(
+        cls, job_id: str, controller_class: type, method_name: str, args: Tuple
+    ) -> Any:
+        method = getattr(controller_class, method_name)
+        if inspect.isasyncgenfunction(method):
+            controller = controller_class()
+            try:
+                return await cls._consume_events(
+                    job_id, getattr(controller, method_name)(*args)
+                )
+            finally:
+                controller.close()
+
+        if inspect.iscoroutinefunction(method):
+            controller = controller_class()
+            try:
+                return await getattr(controller, method_name)(*args)
+            finally:
+                controller.close()
+
+        # run_in_executor does not carry context variables (such as the
+        # cache bypass flag) over to the worker thread by itself
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            cls._get_executor(),
+            functools.partial(
+                context.run, cls._call_sync, controller_class, method_name, args
+            ),
+        )
+
+    @classmethod
+    async def _consume_events(cls, job_id: str, events: AsyncIterator[Dict]) -> Any:
+        """Record progress events on the job and return the final result"""
+        progress, result = [], None
+        try:
+            async for event in events:
+                if event["event"] == "complete":
+                    result = event["data"]
+                    continue
+                progress.append(json.loads(json_dumps(event["data"])))
+                cls._update(job_id, progress=progress)
+        finally:
+            await events.aclose()
+        return result
+
+    @staticmethod
+    def _call_sync(controller_class: type, method_name: str, args: Tuple) -> Any:
+        # The controller lives entirely on the worker thread so an abandoned
+        # (cancelled) call never shares its session with the IOLoop.
+        controller = controller_class()
+        try:
+            return getattr(controller, method_name)(*args)
+        finally:
+            controller.close()
+
+    @classmethod
+    def fail_orphaned_jobs(cls) -> int:
+        """
+        Mark the unfinished jobs of dead processes on this host as failed.
+
+        Called when a server process starts. A job is orphaned when the
+        process that took it no longer runs, or has this process' pid, which
+        was then reused. Records from before jobs tracked their process are
+        failed as well.
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        host = socket.gethostname()
+        unfinished = job_collection.find(
+            {
+                "status": {"$in": [JobStatus.QUEUED, JobStatus.RUNNING]},
+                "$or": [{"host": host}, {"host": {"$exists": False}}],
+            },
+            {"pid": 1},
+        )
+        orphaned = [
+            doc["_id"] for doc in unfinished if not cls._process_alive(doc.get("pid"))
+        ]
+        if not orphaned:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        job_collection.update_many(
+            {
+                "_id": {"$in": orphaned},
+                "status": {"$in": [JobStatus.QUEUED, JobStatus.RUNNING]},
+            },
+            {
+                "$set": {
+                    "status": JobStatus.FAILED,
+                    "error": "The server process running the job exited",
+                    "finished_at": now,
+                    "updated_at": now,
+                }
+            },
+        )
+        return len(orphaned)
+
+    @staticmethod
+    def _process_alive(pid: Optional[int]) -> bool:
+        if not pid or pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    @classmethod
+    def _update(cls, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc)
+        job_collection.update_one({"_id": ObjectId(job_id)}, {"$set": fields})
+
+        listeners = cls._listeners.get(job_id)
+        if not listeners:
+            return
+
+        job = cls.get(job_id)
+        for callback in list(listeners):
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"Job listener failed for {job_id}: {str(e)}")
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(JOB_WORKERS)
+        return cls._semaphore
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=JOB_WORKERS, thread_name_prefix="job"
+            )
+        return cls._executor
+
+    @classmethod
+    def _start_cancel_watcher(cls) -> None:
+        if cls._cancel_watcher is None:
+            cls._cancel_watcher = PeriodicCallback(
+                cls._check_cancel_requests, JOB_POLL_SECONDS * 1000
+            )
+            cls._cancel_watcher.start()
+
+    @classmethod
+    def _check_cancel_requests(cls) -> None:
+        """Cancel local jobs whose cancellation was requested through another process"""
+        if not cls._tasks:
+            return
+
+        cancelled = job_collection.find(
+            {
+                "_id": {"$in": [ObjectId(job_id) for job_id in cls._tasks]},
+                "cancel_requested": True,
+            },
+            {"_id": 1},
+        )
+        for doc in cancelled:
+            task = cls._tasks.get(str(doc["_id"]))
+            if task:
+                task.cancel()
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 from database.models import Project
 from constants import CustomDatabaseConfig
 from utils.llm_helper import LLMHelper
+from utils.llm_executor import LLMExecutor
 import json
 
 
@@ -10,7 +11,11 @@ class PromptGenerator:
 
     def __init__(self, model_name: str = None):
         """Initialize with optional specific model"""
-        self.llm = LLMHelper.get_llm(model_name) if model_name else LLMHelper.get_llm()
+        self.llm = (
+            LLMHelper.get_llm(model_name, cached=True)
+            if model_name
+            else LLMHelper.get_llm(cached=True)
+        )
 
     async def generate_api_specification(
         self,
@@ -132,14 +137,9 @@ Return only the API specification array without additional text.
             {"role": "user", "content": human_message},
         ]
 
-        # Get response from LLM
-        response = self.llm.invoke(messages)
-
-        # Parse the JSON response into a list of API specifications
+        # Get the JSON list of API specifications from the LLM
         try:
-            apis = json.loads(
-                response.content.replace("```json", "").replace("```", "")
-            )
+            apis = await LLMExecutor.ainvoke_json(self.llm, messages)
             if not isinstance(apis, list):
                 raise ValueError("API specification must be a list")
             return apis
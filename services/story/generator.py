@@ -1,13 +1,17 @@
 from typing import Dict, List
-import json
 from utils.llm_helper import LLMHelper
+from utils.llm_executor import LLMExecutor
 
 
 class StoryGenerator:
     """Service for generating user stories from epics"""
 
     def __init__(self, model_name: str = None):
-        self.llm = LLMHelper.get_llm(model_name) if model_name else LLMHelper.get_llm()
+        self.llm = (
+            LLMHelper.get_llm(model_name, cached=True)
+            if model_name
+            else LLMHelper.get_llm(cached=True)
+        )
 
     @property
     def system_prompt(self) -> str:
@@ -45,5 +49,4 @@ Generate user stories in this format:
             },
         ]
 
-        response = self.llm.invoke(messages)
-        return json.loads(response.content.replace("```json", "").replace("```", ""))
+        return await LLMExecutor.ainvoke_json(self.llm, messages)
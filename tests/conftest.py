@@ -0,0 +1,34 @@
+import os
+import sys
+
+import mongomock
+import pymongo
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Run from any directory, with the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Controllers build their LLM clients on creation; no request is sent
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+# database.connection queries MongoDB at import time; the tests use an
+# in-memory MongoDB instead of a server
+pymongo.MongoClient = mongomock.MongoClient
+
+from database.connection import Base  # noqa: E402
+import database.models  # noqa: E402,F401  registers the tables on Base
+
+
+@pytest.fixture
+def session():
+    """Session on an in-memory SQLite database with every table created"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,86 @@
+from collections import Counter
+
+import pytest
+
+import database.models as models
+from controllers.epic import EpicController
+from controllers.feature import FeatureController
+from database.models import Epic, Feature, Project
+
+ROWS = 80
+
+
+class CountingCollection:
+    """Wraps a MongoDB collection and counts the calls made on it"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            return attribute(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture
+def project(session):
+    """A project with ROWS features, each with an epic and Mongo documents"""
+    project = Project(name="Inventory")
+    session.add(project)
+    session.flush()
+
+    for index in range(ROWS):
+        feature = Feature(project_id=project.id, name=f"Feature {index}")
+        session.add(feature)
+        session.flush()
+        feature.save_summary(f"Summary {index}")
+
+        epic = Epic(feature_id=feature.id, name=f"Epic {index}")
+        session.add(epic)
+        session.flush()
+        epic.save_description(f"Description {index}")
+
+    session.commit()
+    return project
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    """Count the calls on every collection the models read from"""
+    counting = {}
+    for name in dir(models):
+        if name.endswith("_collection"):
+            counting[name] = CountingCollection(getattr(models, name))
+            monkeypatch.setattr(models, name, counting[name])
+    return counting
+
+
+def test_feature_list_makes_one_query(session, project, collections):
+    result = FeatureController(session=session).get_many(project.id)
+
+    assert len(result["features"]) == ROWS
+    assert result["features"][0]["description"] == "Summary 0"
+    assert collections["feature_summary_collection"].calls == Counter(find=1)
+    assert sum(
+        (c.calls for name, c in collections.items() if name != "feature_summary_collection"),
+        Counter(),
+    ) == Counter()
+
+
+def test_epic_list_makes_one_query(session, project, collections):
+    result = EpicController(session=session).get_project_epics(project.id)
+
+    assert len(result["epics"]) == ROWS
+    assert result["epics"][0]["description"] == "Description 0"
+    assert collections["epic_description_collection"].calls == Counter(find=1)
+    assert sum(
+        (c.calls for name, c in collections.items() if name != "epic_description_collection"),
+        Counter(),
+    ) == Counter()
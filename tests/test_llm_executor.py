@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+import tornado.web
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+from config.settings import LLM_MAX_CONCURRENCY
+from utils.llm_executor import LLMExecutor
+
+GENERATIONS = min(4, LLM_MAX_CONCURRENCY)
+GENERATION_SECONDS = 1.0
+MAX_GET_SECONDS = 0.2
+
+
+class SlowLLM:
+    """Provider without native async whose calls block for a while"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            time.sleep(GENERATION_SECONDS)
+            return "generated"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class GenerateHandler(tornado.web.RequestHandler):
+    def initialize(self, llm):
+        self.llm = llm
+
+    async def post(self):
+        self.write(await LLMExecutor.ainvoke(self.llm, "prompt"))
+
+
+class PingHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write("pong")
+
+
+class LLMExecutorResponsivenessTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.llm = SlowLLM()
+        return tornado.web.Application(
+            [
+                (r"/generate", GenerateHandler, {"llm": self.llm}),
+                (r"/ping", PingHandler),
+            ]
+        )
+
+    @gen_test(timeout=GENERATION_SECONDS * 10)
+    async def test_get_stays_fast_while_generations_are_in_flight(self):
+        generations = [
+            self.http_client.fetch(self.get_url("/generate"), method="POST", body="")
+            for _ in range(GENERATIONS)
+        ]
+
+        deadline = time.monotonic() + GENERATION_SECONDS / 2
+        while self.llm.in_flight < GENERATIONS and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.llm.in_flight, GENERATIONS)
+
+        started = time.monotonic()
+        response = await self.http_client.fetch(self.get_url("/ping"))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(response.body, b"pong")
+        self.assertLess(elapsed, MAX_GET_SECONDS)
+        # The generations were still running when the GET was answered
+        self.assertEqual(self.llm.in_flight, GENERATIONS)
+
+        for response in await asyncio.gather(*generations):
+            self.assertEqual(response.body, b"generated")
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+from langchain_core.messages import BaseMessage, ToolMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from config.settings import CODEGEN_CHECKPOINT_DB
+from .graphs.context import tool_calls
+
+
+class CodegenCheckpoints:
+    """
+    SQLite checkpointer shared by all codegen graph runs of the process.
+
+    The graphs save their state after every node under a thread id made of
+    the run id and the side, so an interrupted run continues from its last
+    completed step instead of starting over.
+    """
+
+    _saver: Optional[SqliteSaver] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_saver(cls) -> SqliteSaver:
+        """Get the shared checkpointer, opening the database on first use"""
+        with cls._lock:
+            if cls._saver is None:
+                os.makedirs(os.path.dirname(CODEGEN_CHECKPOINT_DB) or ".", exist_ok=True)
+                # The saver serialises access itself; graphs run on worker threads
+                connection = sqlite3.connect(CODEGEN_CHECKPOINT_DB, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                cls._saver = SqliteSaver(connection)
+                cls._saver.setup()
+            return cls._saver
+
+    @staticmethod
+    def thread_id(run_id: str, side: str) -> str:
+        return f"{run_id}:{side}"
+
+    @classmethod
+    def config(cls, run_id: str, side: str) -> Dict:
+        """Graph config selecting a run side's checkpoints"""
+        return {"configurable": {"thread_id": cls.thread_id(run_id, side)}}
+
+    @classmethod
+    def count(cls, thread_ids: Sequence[str]) -> Dict[str, int]:
+        """Number of checkpoints stored per thread id"""
+        if not thread_ids:
+            return {}
+        saver = cls.get_saver()
+        placeholders = ", ".join("?" for _ in thread_ids)
+        with saver.cursor(transaction=False) as cursor:
+            cursor.execute(
+                f"SELECT thread_id, COUNT(*) FROM checkpoints "
+                f"WHERE thread_id IN ({placeholders}) GROUP BY thread_id",
+                list(thread_ids),
+            )
+            counts = dict(cursor.fetchall())
+        return {thread_id: counts.get(thread_id, 0) for thread_id in thread_ids}
+
+    @classmethod
+    def delete(cls, thread_ids: Sequence[str]) -> int:
+        """
+        Delete every checkpoint of the given thread ids.
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        if not thread_ids:
+            return 0
+        saver = cls.get_saver()
+        placeholders = ", ".join("?" for _ in thread_ids)
+        with saver.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM writes WHERE thread_id IN ({placeholders})",
+                list(thread_ids),
+            )
+            cursor.execute(
+                f"DELETE FROM checkpoints WHERE thread_id IN ({placeholders})",
+                list(thread_ids),
+            )
+            return cursor.rowcount
+
+
+def restore_workspace(messages: Iterable[BaseMessage], workspace: str) -> List[str]:
+    """
+    Bring a workspace back to the state recorded in a run's messages.
+
+    Every successful write_to_file call carries the full file content, so
+    replaying the last write of each path restores the files the agent
+    created. Files already matching are left alone. Side effects of shell
+    commands (installed packages, generated files) are not recorded and are
+    not restored.
+
+    Args:
+        messages: Message history of the run
+        workspace (str): Directory the run writes to
+
+    Returns:
+        Relative paths of the files that were rewritten
+    """
+    contents: Dict[str, str] = {}
+    pending: Dict[str, Dict] = {}
+    for message in messages:
+        for call_id, name, args in tool_calls(message):
+            if name == "write_to_file" and "path" in args:
+                pending[call_id] = args
+        if isinstance(message, ToolMessage) and message.tool_call_id in pending:
+            args = pending.pop(message.tool_call_id)
+            if str(message.content).startswith("Wrote contents to"):
+                contents[args["path"]] = str(args.get("content", ""))
+
+    restored = []
+    root = os.path.realpath(workspace)
+    for path, content in contents.items():
+        full_path = os.path.realpath(os.path.join(workspace, path.lstrip("/")))
+        if not full_path.startswith(root + os.sep):
+            continue
+        if os.path.isfile(full_path):
+            with open(full_path, "r") as f:
+                if f.read() == content:
+                    continue
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+        restored.append(path)
+    return restored
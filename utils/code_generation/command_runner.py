@@ -0,0 +1,174 @@
+import asyncio
+import codecs
+import os
+import re
+import signal
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+_READ_SIZE = 65536
+# How long output is still read after the shell exits
+_DRAIN_SECONDS = 0.5
+
+
+class _BoundedOutput:
+    """Keeps the first and last characters of a stream within a fixed budget"""
+
+    def __init__(self, max_chars: int):
+        self.head_limit = max_chars * 2 // 3
+        self.tail_limit = max_chars - self.head_limit
+        self.head = ""
+        self.tail: deque = deque()
+        self.tail_size = 0
+        self.total = 0
+
+    def add(self, text: str) -> None:
+        self.total += len(text)
+        if len(self.head) < self.head_limit:
+            room = self.head_limit - len(self.head)
+            self.head += text[:room]
+            text = text[room:]
+        if not text:
+            return
+        self.tail.append(text)
+        self.tail_size += len(text)
+        while self.tail and self.tail_size - len(self.tail[0]) >= self.tail_limit:
+            self.tail_size -= len(self.tail.popleft())
+
+    def text(self) -> str:
+        tail = "".join(self.tail)
+        if len(tail) > self.tail_limit:
+            tail = tail[len(tail) - self.tail_limit:] if self.tail_limit else ""
+        elided = self.total - len(self.head) - len(tail)
+        if elided <= 0:
+            return self.head + tail
+        return f"{self.head}\n[... {elided} characters elided ...]\n{tail}"
+
+
+class _LineSplitter:
+    """Cuts decoded output into lines at \\n or \\r, bounding unterminated ones"""
+
+    def __init__(self, on_line: Callable[[str], None], max_line: int = 4096):
+        self.on_line = on_line
+        self.max_line = max_line
+        self.buffer = ""
+
+    def add(self, text: str) -> None:
+        lines = re.split(r"\r\n|\r|\n", self.buffer + text)
+        self.buffer = lines.pop()
+        for line in lines:
+            self.on_line(line)
+        while len(self.buffer) >= self.max_line:
+            self.on_line(self.buffer[:self.max_line])
+            self.buffer = self.buffer[self.max_line:]
+
+    def close(self) -> None:
+        if self.buffer:
+            self.on_line(self.buffer)
+            self.buffer = ""
+
+
+async def run_command(
+    command: str,
+    cwd: Optional[str],
+    timeout: float,
+    max_chars: int,
+    on_output: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """
+    Run a shell command without blocking the event loop.
+
+    stdout and stderr are read together as they are produced and passed to
+    `on_output` line by line; only the head and tail of the output are kept.
+    The command gets no stdin, so a prompt fails instead of waiting forever.
+
+    The command is done when the shell exits: output still buffered is read
+    for a moment, but background processes it started keep running and are
+    not waited for. If the timeout passes first, or anything fails while
+    waiting, the command and every process it started are killed.
+
+    Args:
+        command (str): Shell command
+        cwd (str, optional): Working directory, None for the current one
+        timeout (float): Seconds the command may run
+        max_chars (int): Characters of output to keep
+        on_output (callable, optional): Called with each line of output
+
+    Returns:
+        Dict with exit_code (None if killed), timed_out, seconds and output
+    """
+    started = time.monotonic()
+    # The output goes through a pipe of our own: with stdout=PIPE,
+    # process.wait() would also wait for every background child holding it
+    read_fd, write_fd = os.pipe()
+    try:
+        process = await asyncio.create_subprocess_shell(
+            command,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=write_fd,
+            stderr=asyncio.subprocess.STDOUT,
+            # Own process group, so a kill also stops the command's children
+            start_new_session=True,
+        )
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    stream = asyncio.StreamReader()
+    transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(stream), os.fdopen(read_fd, "rb", 0)
+    )
+    output = _BoundedOutput(max_chars)
+    lines = _LineSplitter(on_output) if on_output is not None else None
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def add(text: str) -> None:
+        output.add(text)
+        if lines is not None:
+            lines.add(text)
+
+    async def read_output() -> None:
+        # Fixed-size reads; readline() fails on lines over the stream limit
+        while True:
+            chunk = await stream.read(_READ_SIZE)
+            if not chunk:
+                break
+            add(decoder.decode(chunk))
+
+    reader = asyncio.ensure_future(read_output())
+    exited = timed_out = False
+    try:
+        try:
+            await asyncio.wait_for(process.wait(), timeout=timeout)
+            exited = True
+        except asyncio.TimeoutError:
+            timed_out = True
+
+        # Background children may hold the pipe open after the shell exits;
+        # take what is already written without waiting for them
+        done, _ = await asyncio.wait({reader}, timeout=_DRAIN_SECONDS if exited else 0)
+        if reader in done:
+            reader.result()
+    finally:
+        reader.cancel()
+        transport.close()
+        if not exited:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    add(decoder.decode(b"", final=True))
+    if lines is not None:
+        lines.close()
+    return {
+        "exit_code": process.returncode if exited else None,
+        "timed_out": timed_out,
+        "seconds": round(time.monotonic() - started, 2),
+        "output": output.text(),
+    }
@@ -0,0 +1,367 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from config.settings import CODEGEN_LIST_MAX_DEPTH, CODEGEN_LIST_MAX_ENTRIES
+from utils.code_generation.overlay import OverlayFS
+
+# Always left out of listings, in .gitignore syntax
+DEFAULT_EXCLUDES = [
+    ".git/",
+    ".overlay-*",
+    "node_modules",
+    "__pycache__",
+    "env",
+    "venv",
+    "target/dependency",
+    "build/dependencies",
+    "dist",
+    "out",
+    "bundle",
+    "vendor",
+    "tmp",
+    "temp",
+    "deps",
+    "pkg",
+    "Pods",
+]
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Regex for a gitignore-style glob; `*` stays within one directory, `**` spans any"""
+    regex, index = "", 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                regex += "[" + pattern[index + 1 : end].replace("!", "^", 1) + "]"
+                index = end
+        else:
+            regex += re.escape(char)
+        index += 1
+    return regex
+
+
+class IgnoreRule:
+    """One line of a .gitignore file"""
+
+    def __init__(self, line: str):
+        self.negated = line.startswith("!")
+        pattern = line[1:] if self.negated else line
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # Patterns with an inner slash are relative to the root, others
+        # match a name at any depth
+        self.anchored = "/" in pattern
+        self.regex = re.compile(glob_to_regex(pattern.lstrip("/")))
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        target = path if self.anchored else path.rsplit("/", 1)[-1]
+        return self.regex.fullmatch(target) is not None
+
+
+class FileIndex:
+    """
+    In-memory index of a workspace's files for the list_files tool.
+
+    The tree is scanned once; afterwards tool writes add their file in
+    O(depth), and after a shell command only directories whose mtime changed
+    are scanned again. Listings are rendered from memory. Files ignored by
+    DEFAULT_EXCLUDES or the workspace's .gitignore are not indexed, and
+    excluded directories are not descended into.
+    """
+
+    _indexes: Dict[str, "FileIndex"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self._children: Dict[str, Dict[str, bool]] = {}  # dir -> {name: is_dir}
+        self._mtimes: Dict[str, int] = {}
+        self._rules: List[IgnoreRule] = []
+        self._built = False
+        self._stale = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def get(cls, root: str) -> "FileIndex":
+        """The index of a workspace, created on first use"""
+        root = os.path.realpath(root)
+        with cls._registry_lock:
+            if root not in cls._indexes:
+                cls._indexes[root] = cls(root)
+            return cls._indexes[root]
+
+    @classmethod
+    def drop(cls, root: str) -> None:
+        """Forget a workspace's index, e.g. when the workspace is deleted"""
+        with cls._registry_lock:
+            cls._indexes.pop(os.path.realpath(root), None)
+
+    @staticmethod
+    def relative(path: str) -> str:
+        relative = os.path.normpath(path.lstrip("/")).replace(os.sep, "/")
+        if relative == ".." or relative.startswith("../"):
+            raise ValueError(f"Path {path} is outside the workspace")
+        return "" if relative == "." else relative
+
+    def _join(self, directory: str, name: str) -> str:
+        return f"{directory}/{name}" if directory else name
+
+    def _disk_path(self, relative: str) -> str:
+        return os.path.join(self.root, relative)
+
+    def _read_file(self, relative: str) -> Optional[str]:
+        overlay = OverlayFS.get(self.root)
+        if overlay is not None:
+            return overlay.read(relative)
+        try:
+            with open(self._disk_path(relative), "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _load_rules(self) -> None:
+        lines = list(DEFAULT_EXCLUDES)
+        gitignore = self._read_file(".gitignore") or ""
+        for line in gitignore.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                lines.append(line)
+        self._rules = [IgnoreRule(line) for line in lines]
+
+    def is_ignored(self, relative: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self._rules:
+            if rule.matches(relative, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+    def _scan(self, directory: str) -> None:
+        """(Re)scan a directory and everything below it"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            children: Dict[str, bool] = {}
+            try:
+                self._mtimes[current] = os.stat(self._disk_path(current)).st_mtime_ns
+                with os.scandir(self._disk_path(current)) as entries:
+                    for entry in entries:
+                        is_dir = entry.is_dir()
+                        path = self._join(current, entry.name)
+                        if self.is_ignored(path, is_dir):
+                            continue
+                        children[entry.name] = is_dir
+                        if is_dir:
+                            stack.append(path)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                self._mtimes.pop(current, None)
+            self._children[current] = children
+
+    def _remove_tree(self, directory: str) -> None:
+        prefix = directory + "/"
+        for path in [p for p in self._children if p == directory or p.startswith(prefix)]:
+            del self._children[path]
+            self._mtimes.pop(path, None)
+
+    def _add_pending(self) -> None:
+        """Index files written to the overlay but not flushed yet"""
+        overlay = OverlayFS.get(self.root)
+        if overlay is not None:
+            for path in overlay.pending_paths():
+                self._add(path.replace(os.sep, "/"))
+
+    def _ensure_current(self) -> None:
+        if not self._built:
+            self._load_rules()
+            self._children, self._mtimes = {}, {}
+            self._scan("")
+            self._add_pending()
+            self._built, self._stale = True, False
+            return
+
+        if not self._stale:
+            return
+        self._load_rules()
+        for directory in sorted(self._children):
+            if directory not in self._children:
+                continue  # Removed with its parent
+            try:
+                mtime = os.stat(self._disk_path(directory)).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is None and directory:
+                self._remove_tree(directory)
+            elif mtime != self._mtimes.get(directory):
+                self._rescan_directory(directory)
+        self._add_pending()
+        self._stale = False
+
+    def _rescan_directory(self, directory: str) -> None:
+        """Update one directory's entries, scanning only new subdirectories"""
+        old = self._children.get(directory, {})
+        new: Dict[str, bool] = {}
+        try:
+            self._mtimes[directory] = os.stat(self._disk_path(directory)).st_mtime_ns
+            with os.scandir(self._disk_path(directory)) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir()
+                    if not self.is_ignored(self._join(directory, entry.name), is_dir):
+                        new[entry.name] = is_dir
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        self._children[directory] = new
+
+        for name, was_dir in old.items():
+            if was_dir and not new.get(name):
+                self._remove_tree(self._join(directory, name))
+        for name, is_dir in new.items():
+            if is_dir and not old.get(name):
+                self._scan(self._join(directory, name))
+
+    def _add(self, relative: str) -> None:
+        parts = relative.split("/")
+        directory = ""
+        for index, name in enumerate(parts):
+            is_dir = index < len(parts) - 1
+            path = self._join(directory, name)
+            if self.is_ignored(path, is_dir):
+                return
+            self._children.setdefault(directory, {})[name] = is_dir
+            if is_dir:
+                self._children.setdefault(path, {})
+            directory = path
+
+    def add_file(self, path: str) -> None:
+        """Record a file written by a tool"""
+        relative = self.relative(path)
+        if not relative:
+            return
+        with self._lock:
+            if not self._built:
+                return  # Picked up by the first scan
+            if relative == ".gitignore":
+                # New rules can hide or reveal anything; start over
+                self._built = False
+                return
+            self._add(relative)
+
+    def invalidate(self) -> None:
+        """Check the disk for changes before the next listing, e.g. after a command"""
+        with self._lock:
+            self._stale = True
+
+    def listing(
+        self,
+        path: str = "",
+        max_depth: Optional[int] = CODEGEN_LIST_MAX_DEPTH,
+        pattern: Optional[str] = None,
+        max_entries: int = CODEGEN_LIST_MAX_ENTRIES,
+    ) -> str:
+        """
+        Render the files under `path`.
+
+        Args:
+            path (str): Directory relative to the workspace
+            max_depth (int, optional): Levels to descend; deeper directories
+                are shown with their entry count. None for no limit
+            pattern (str, optional): Only list files matching this glob,
+                as paths relative to `path`
+            max_entries (int): Lines to return before summarising the rest
+
+        Returns:
+            One entry per line, indented by depth, directories ending in "/"
+        """
+        directory = self.relative(path)
+        with self._lock:
+            self._ensure_current()
+            if directory not in self._children:
+                parent, _, name = directory.rpartition("/")
+                if self._children.get(parent, {}).get(name) is False:
+                    return name
+                return f"Directory {path} doesn't exist."
+
+            if pattern:
+                lines, total = self._matching(directory, pattern, max_depth, max_entries)
+            else:
+                lines, total = self._tree(directory, max_depth, max_entries)
+
+        if not lines:
+            return "No files found." if pattern else "Directory is empty."
+        if total > len(lines):
+            lines.append(
+                f"... {total - len(lines)} more entries not shown; "
+                "narrow the path, max_depth or pattern"
+            )
+        return "\n".join(lines)
+
+    def _walk(self, directory: str, max_depth: Optional[int]):
+        """(path, name, is_dir) of the entries under a directory"""
+        stack: List[Tuple[str, int]] = [(directory, 0)]
+        while stack:
+            current, depth = stack.pop()
+            for name, is_dir in self._children.get(current, {}).items():
+                path = self._join(current, name)
+                yield path, name, is_dir
+                if is_dir and (max_depth is None or depth + 1 < max_depth):
+                    stack.append((path, depth + 1))
+
+    def _tree(
+        self, directory: str, max_depth: Optional[int], max_entries: int
+    ) -> Tuple[List[str], int]:
+        lines: List[str] = []
+        total = 0
+
+        def render(current: str, depth: int) -> None:
+            nonlocal total
+            for name, is_dir in sorted(self._children.get(current, {}).items()):
+                total += 1
+                path = self._join(current, name)
+                descend = is_dir and (max_depth is None or depth + 1 < max_depth)
+                if len(lines) < max_entries:
+                    line = " " * depth + name + ("/" if is_dir else "")
+                    if is_dir and not descend:
+                        count = len(self._children.get(path, {}))
+                        if count:
+                            line += f" ({count} entries)"
+                    lines.append(line)
+                if descend:
+                    render(path, depth + 1)
+
+        render(directory, 0)
+        return lines, total
+
+    def _matching(
+        self,
+        directory: str,
+        pattern: str,
+        max_depth: Optional[int],
+        max_entries: int,
+    ) -> Tuple[List[str], int]:
+        rule = re.compile(glob_to_regex(pattern.lstrip("/")))
+        match_path = "/" in pattern
+        prefix = len(directory) + 1 if directory else 0
+
+        matches = sorted(
+            path[prefix:]
+            for path, name, is_dir in self._walk(directory, max_depth)
+            if not is_dir and rule.fullmatch(path[prefix:] if match_path else name)
+        )
+        return matches[:max_entries], len(matches)
@@ -1,15 +1,17 @@
 from typing import TypedDict, Sequence
-from langchain_core.messages import ToolMessage, BaseMessage
+from langchain_core.messages import BaseMessage, ToolMessage
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolInvocation
 
 from .anthropic_models import AnthropicModel
 from .tools import CodingTools
+from .context import ContextManager, tool_calls
+from .tool_runner import COMPLETION_TOOL, completes_run, run_tool_calls
 
 # Define the state
 class GraphState(TypedDict):
     messages: Sequence[BaseMessage]
     base_path: str
+    context_stats: dict
 
 class AnthropicGraph:
 
@@ -20,6 +22,9 @@ class AnthropicGraph:
 
         self.model = self.anthropic_model.make_model()
 
+        # Compacts the history sent to the model on each turn
+        self.context = ContextManager(llm=self.anthropic_model.get_llm())
+
         # Initializing the graph
         self.graph = StateGraph(GraphState)
 
@@ -28,22 +33,30 @@ class AnthropicGraph:
     # Def the function that determines whether to continue or not 
     def should_continue(self, state):
         last_message = state["messages"][-1]
-        print(last_message)
+        calls = tool_calls(last_message)
         # if there are no tool calls, then we finish 
-        if last_message.content != "":
+        if not calls:
             return "end"
-        # If there is a Response tool call, then we finish
-        elif last_message.tool_calls[-1]["name"] == "AttemptCompletionInput":
+        # If the completion is the only call, then we finish
+        elif all(name == COMPLETION_TOOL for _, name, _ in calls):
             return "end"
-        # Otherwise if there is, we continue
+        # Otherwise the other calls run first, completion included
         else:
             return "continue"
+
+    # Def the function that determines whether the turn just executed was the last
+    def after_tools(self, state):
+        turn = next(
+            message for message in reversed(state["messages"])
+            if not isinstance(message, ToolMessage)
+        )
+        return "end" if completes_run(tool_calls(turn)) else "continue"
     
     # Define the function that calls the model
     def call_model(self, state):
         messages = state["messages"]
-        response = self.model.invoke(messages)
-        return {"messages": messages + [response]}
+        response = self.model.invoke(self.context.prepare(messages))
+        return {"messages": messages + [response], "context_stats": self.context.stats()}
     
     # Define the function to execute tools
     def call_tool(self, state):
@@ -51,22 +64,21 @@ class AnthropicGraph:
         base_path = state["base_path"]
 
         last_message = messages[-1]
-        # Tool invocation
-        action = ToolInvocation(
-            tool=last_message.tool_calls[-1]["name"],
-            tool_input=last_message.tool_calls[-1]["args"]
+        # Run every call of the turn, independent ones concurrently, and
+        # answer each with its own ToolMessage
+        tool_messages = run_tool_calls(
+            self.tool_executor, tool_calls(last_message), base_path
         )
-        # We call the tool_executor and get back a response
-        if action.tool == "write_to_file" or action.tool == "read_file" or action.tool == "list_files" or action.tool == "execute_command":
-            response = self.tool_executor._execute(action, config={"base_path" : base_path})
-        else:
-            response = self.tool_executor._execute(action)
-        # We use the response to create a FunctionMessage 
-        tool_message = ToolMessage(content=str(response), name=action.tool, tool_call_id=last_message.tool_calls[-1]["id"])
-        # Now we add this to the list of tool nodes so it is maintained.
-        return {"messages": messages + [tool_message]}
+        # Now we add these to the list of messages so they are maintained.
+        return {"messages": messages + tool_messages}
     
-    def generate_graph(self):
+    def generate_graph(self, checkpointer=None):
+        """
+        Build and compile the agent graph.
+
+        With a checkpointer, the state is saved after every node and a run
+        can be resumed by invoking the graph with its thread id again.
+        """
 
         # Define the two Nodes we will cycle between
         self.graph.add_node("coding_llm", self.call_model)
@@ -85,10 +97,17 @@ class AnthropicGraph:
             }
         )
 
-        # Setting normal edge
-        self.graph.add_edge("tools_invocation", "coding_llm")
+        # Back to the model, unless the turn just executed completed the run
+        self.graph.add_conditional_edges(
+            "tools_invocation",
+            self.after_tools,
+            {
+                "continue": "coding_llm",
+                "end": END
+            }
+        )
 
         # Compiling the graph
-        self.app = self.graph.compile()
+        self.app = self.graph.compile(checkpointer=checkpointer)
 
         return self.app
\ No newline at end of file
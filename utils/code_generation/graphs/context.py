@@ -0,0 +1,329 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from config.settings import (
+    CODEGEN_CONTEXT_TOKEN_BUDGET,
+    CODEGEN_KEEP_RECENT_MESSAGES,
+    CODEGEN_TOOL_OUTPUT_MAX_CHARS,
+    CODEGEN_OLD_TOOL_OUTPUT_MAX_CHARS,
+)
+
+SUMMARY_PROMPT = """You are condensing the history of a coding agent that builds a project by calling tools.
+Write a concise summary the agent can continue from. Include:
+- the files created or changed and what each one contains
+- commands that were run and whether they succeeded
+- decisions made, open problems and what was about to be done next
+Leave out file contents unless a detail is needed to continue."""
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """Rough token count of a message (about four characters per token)"""
+    size = len(_content_text(message.content))
+    for call in tool_calls(message):
+        size += len(call[1]) + len(json.dumps(call[2]))
+    return size // 4 + 4
+
+
+def _content_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif block.get("type") == "text":
+            parts.append(block.get("text", ""))
+        elif block.get("type") == "tool_use":
+            continue  # Counted from the message's tool_calls
+        else:
+            parts.append(json.dumps(block.get("input", block), default=str))
+    return "\n".join(parts)
+
+
+def tool_calls(message: BaseMessage) -> List[Tuple[str, str, Dict]]:
+    """
+    (id, name, args) of every tool call in a model response.
+
+    Reads `tool_calls` as filled by the Anthropic integration, falling back to
+    the raw OpenAI `additional_kwargs` format.
+    """
+    if not isinstance(message, AIMessage):
+        return []
+    if message.tool_calls:
+        return [(call["id"], call["name"], call["args"]) for call in message.tool_calls]
+
+    calls = []
+    for call in message.additional_kwargs.get("tool_calls", []):
+        try:
+            args = json.loads(call["function"]["arguments"] or "{}")
+        except ValueError:
+            args = {}
+        calls.append((call["id"], call["function"]["name"], args))
+    return calls
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Keep the head and tail of a long text, which is where errors show up"""
+    if len(text) <= limit:
+        return text
+    head = limit * 2 // 3
+    tail = limit - head
+    return (
+        f"{text[:head]}\n[... {len(text) - limit} characters elided ...]\n"
+        f"{text[-tail:]}"
+    )
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ContextManager:
+    """
+    Builds the message list sent to the model on each turn of a codegen run.
+
+    The graph state keeps the full history; the model gets a compacted view:
+
+    - a re-read of a file whose content is still in the view in full (from
+      an earlier read or the model's own write) becomes "file unchanged
+      since last read"
+    - tool outputs are cut to CODEGEN_TOOL_OUTPUT_MAX_CHARS, and to
+      CODEGEN_OLD_TOOL_OUTPUT_MAX_CHARS outside the last few messages
+    - once the view exceeds the token budget, the oldest turns are folded
+      into a running summary appended to the task message
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        token_budget: int = CODEGEN_CONTEXT_TOKEN_BUDGET,
+        keep_recent: int = CODEGEN_KEEP_RECENT_MESSAGES,
+        tool_output_max_chars: int = CODEGEN_TOOL_OUTPUT_MAX_CHARS,
+        old_tool_output_max_chars: int = CODEGEN_OLD_TOOL_OUTPUT_MAX_CHARS,
+    ):
+        """
+        Args:
+            llm: Chat model used for summaries; without one a plain list of
+                the folded tool calls is used
+            token_budget (int): Tokens of history to send per turn, 0 to
+                disable summarising
+            keep_recent (int): Messages at the end that are never folded and
+                keep the larger tool output limit
+            tool_output_max_chars (int): Size limit of recent tool outputs
+            old_tool_output_max_chars (int): Size limit of older tool outputs
+        """
+        self.llm = llm
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.tool_output_max_chars = tool_output_max_chars
+        self.old_tool_output_max_chars = old_tool_output_max_chars
+
+        self._run_key: Optional[str] = None
+        self._summary = ""
+        self._folded = 0  # Messages after the task message covered by the summary
+        self._stats: Dict[str, int] = {}
+        self._reset(None)
+
+    def _reset(self, run_key: Optional[str]) -> None:
+        self._run_key = run_key
+        self._summary = ""
+        self._folded = 0
+        self._stats = {
+            "turns": 0,
+            "summaries": 0,
+            "history_tokens": 0,
+            "sent_tokens": 0,
+            "saved_tokens": 0,
+            "total_sent_tokens": 0,
+            "total_saved_tokens": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Token counts of the last turn and totals for the run"""
+        return dict(self._stats)
+
+    def prepare(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Compacted copy of `messages` to send to the model.
+
+        Args:
+            messages: Full history, starting with the task message
+
+        Returns:
+            Messages to invoke the model with
+        """
+        messages = list(messages)
+        if not messages:
+            return messages
+
+        # A graph instance can be invoked for several runs
+        run_key = _digest(_content_text(messages[0].content))
+        if run_key != self._run_key or len(messages) <= self._folded:
+            self._reset(run_key)
+
+        compacted = self._compact_tool_outputs(messages)
+        view = self._build_view(messages[0], compacted)
+
+        if self.token_budget and self._count(view) > self.token_budget:
+            self._fold(messages, compacted)
+            # Folding can drop the full copy a repeated read points back to
+            compacted = self._compact_tool_outputs(messages)
+            view = self._build_view(messages[0], compacted)
+
+        history_tokens = self._count(messages)
+        sent_tokens = self._count(view)
+        self._stats["turns"] += 1
+        self._stats["history_tokens"] = history_tokens
+        self._stats["sent_tokens"] = sent_tokens
+        self._stats["saved_tokens"] = history_tokens - sent_tokens
+        self._stats["total_sent_tokens"] += sent_tokens
+        self._stats["total_saved_tokens"] += history_tokens - sent_tokens
+        print(
+            f"Context turn {self._stats['turns']}: sent {sent_tokens} of "
+            f"{history_tokens} tokens ({history_tokens - sent_tokens} saved)"
+        )
+        return view
+
+    @staticmethod
+    def _count(messages: Sequence[BaseMessage]) -> int:
+        return sum(estimate_tokens(message) for message in messages)
+
+    def _build_view(
+        self, task: BaseMessage, compacted: List[BaseMessage]
+    ) -> List[BaseMessage]:
+        if self._summary:
+            task = HumanMessage(
+                content=(
+                    f"{_content_text(task.content)}\n\n"
+                    f"Summary of the work done so far:\n{self._summary}"
+                )
+            )
+        return [task] + compacted[1 + self._folded :]
+
+    def _compact_tool_outputs(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Elide repeated file reads and cut long tool outputs"""
+        calls: Dict[str, Tuple[str, Dict]] = {}
+        # Path -> (digest, index, whether the content is sent in full) of
+        # the latest copy of each file
+        known_files: Dict[str, Tuple[str, int, bool]] = {}
+        recent_start = len(messages) - self.keep_recent
+        # A repeated read is only elided if the model can still see the
+        # earlier copy: not folded into the summary and not truncated
+        visible_start = max(1 + self._folded, recent_start)
+        compacted = []
+
+        for index, message in enumerate(messages):
+            for call_id, name, args in tool_calls(message):
+                calls[call_id] = (name, args)
+                if name == "write_to_file" and "path" in args:
+                    known_files[args["path"]] = (
+                        _digest(str(args.get("content", ""))), index, True
+                    )
+
+            if not isinstance(message, ToolMessage):
+                compacted.append(message)
+                continue
+
+            name, args = calls.get(message.tool_call_id, (message.name, {}))
+            content = _content_text(message.content)
+
+            if name == "read_file" and "path" in args:
+                digest = _digest(content)
+                known = known_files.get(args["path"])
+                if known and known[0] == digest and known[1] >= visible_start and known[2]:
+                    content = f"File {args['path']} unchanged since last read."
+                else:
+                    known_files[args["path"]] = (
+                        digest, index, len(content) <= self.tool_output_max_chars
+                    )
+
+            limit = (
+                self.tool_output_max_chars
+                if index >= recent_start
+                else self.old_tool_output_max_chars
+            )
+            content = _truncate(content, limit)
+
+            if content != message.content:
+                message = ToolMessage(
+                    content=content, name=message.name, tool_call_id=message.tool_call_id
+                )
+            compacted.append(message)
+
+        return compacted
+
+    def _fold(self, messages: List[BaseMessage], compacted: List[BaseMessage]) -> None:
+        """
+        Fold the oldest turns into the summary.
+
+        Folds down to half the budget so a summary isn't needed on every
+        turn. Cuts only before a model response, so a tool call is never
+        separated from its result.
+        """
+        target = self.token_budget // 2
+        last_cut = len(messages) - self.keep_recent
+        start = 1 + self._folded
+
+        cut = None
+        tokens = self._count(compacted[start:])
+        for index in range(start, last_cut):
+            tokens -= estimate_tokens(compacted[index])
+            if isinstance(messages[index + 1], AIMessage):
+                cut = index + 1
+                if tokens <= target:
+                    break
+        if cut is None:
+            return
+
+        self._summary = self._summarize(compacted[start:cut])
+        self._folded = cut - 1
+        self._stats["summaries"] += 1
+
+    def _summarize(self, messages: List[BaseMessage]) -> str:
+        transcript = self._render(messages)
+        if self.llm is not None:
+            try:
+                response = self.llm.invoke(
+                    [
+                        SystemMessage(content=SUMMARY_PROMPT),
+                        HumanMessage(
+                            content=(
+                                f"Summary so far:\n{self._summary or '(none)'}\n\n"
+                                f"New history to add:\n{transcript}"
+                            )
+                        ),
+                    ]
+                )
+                summary = _content_text(response.content).strip()
+                if summary:
+                    return summary
+            except Exception as e:
+                print(f"Context summary failed, listing tool calls instead: {e}")
+
+        actions = [
+            f"- {name} {json.dumps({k: v for k, v in args.items() if k != 'content'})}"
+            for message in messages
+            for _, name, args in tool_calls(message)
+        ]
+        return "\n".join(filter(None, [self._summary] + actions))
+
+    def _render(self, messages: List[BaseMessage]) -> str:
+        lines = []
+        for message in messages:
+            text = _content_text(message.content)
+            if isinstance(message, ToolMessage):
+                lines.append(f"[{message.name} result] {_truncate(text, 500)}")
+                continue
+            if text:
+                lines.append(f"[{message.type}] {_truncate(text, 2000)}")
+            for _, name, args in tool_calls(message):
+                args = {k: _truncate(str(v), 300) for k, v in args.items()}
+                lines.append(f"[tool call] {name} {json.dumps(args)}")
+        return "\n".join(lines)
@@ -1,16 +1,17 @@
 from typing import TypedDict, Sequence
-from langchain_core.messages import ToolMessage, BaseMessage
+from langchain_core.messages import BaseMessage, ToolMessage
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolInvocation
-import json
 
 from .openai_models import OpenAIModel
 from .tools import CodingTools
+from .context import ContextManager, tool_calls
+from .tool_runner import COMPLETION_TOOL, completes_run, run_tool_calls
 
 # Define the state
 class GraphState(TypedDict):
     messages: Sequence[BaseMessage]
     base_path: str
+    context_stats: dict
 
 class OpenAIGraph:
 
@@ -20,6 +21,9 @@ class OpenAIGraph:
 
         self.model = self.open_ai_model.make_model()
 
+        # Compacts the history sent to the model on each turn
+        self.context = ContextManager(llm=self.open_ai_model.get_llm())
+
         # Initializing the graph
         self.graph = StateGraph(GraphState)
 
@@ -27,46 +31,52 @@ class OpenAIGraph:
     # Def the function that determines whether to continue or not 
     def should_continue(self, state):
         last_message = state["messages"][-1]
+        calls = tool_calls(last_message)
         # if there are no tool calls, then we finish 
-        if "tool_calls" not in last_message.additional_kwargs:
+        if not calls:
             return "end"
-        # If there is a Response tool call, then we finish
-        elif last_message.additional_kwargs["tool_calls"][-1]["function"]["name"] == "AttemptCompletionInput":
+        # If the completion is the only call, then we finish
+        elif all(name == COMPLETION_TOOL for _, name, _ in calls):
             return "end"
-        # Otherwise if there is, we continue
+        # Otherwise the other calls run first, completion included
         else:
             return "continue"
+
+    # Def the function that determines whether the turn just executed was the last
+    def after_tools(self, state):
+        turn = next(
+            message for message in reversed(state["messages"])
+            if not isinstance(message, ToolMessage)
+        )
+        return "end" if completes_run(tool_calls(turn)) else "continue"
     
     # Define the function that calls the model
     def call_model(self, state):
         messages = state["messages"]
-        response = self.model.invoke(messages)
-        return {"messages": messages + [response]}
+        response = self.model.invoke(self.context.prepare(messages))
+        return {"messages": messages + [response], "context_stats": self.context.stats()}
     
     # Define the function to execute tools
     def call_tool(self, state):
         messages = state["messages"]
         base_path = state["base_path"]
         last_message = messages[-1]
-        # Tool invocation
-        action = ToolInvocation(
-            tool=last_message.additional_kwargs["tool_calls"][-1]["function"]["name"],
-            tool_input=json.loads(
-                last_message.additional_kwargs["tool_calls"][-1]["function"]["arguments"]
-            ),
+        # Run every call of the turn, independent ones concurrently, and
+        # answer each with its own ToolMessage
+        tool_messages = run_tool_calls(
+            self.tool_executor, tool_calls(last_message), base_path
         )
-        # We call the tool_executor and get back a response
-        if action.tool == "write_to_file" or action.tool == "read_file" or action.tool == "list_files" or action.tool == "execute_command":
-            response = self.tool_executor._execute(action, config={"base_path" : base_path})
-        else:
-            response = self.tool_executor._execute(action)
-        # We use the response to create a FunctionMessage 
-        tool_message = ToolMessage(content=str(response), name=action.tool, tool_call_id=last_message.additional_kwargs["tool_calls"][-1]["id"])
-        # Now we add this to the list of tool nodes so it is maintained.
-        return {"messages": messages + [tool_message]}
+        # Now we add these to the list of messages so they are maintained.
+        return {"messages": messages + tool_messages}
+
 
+    def generate_graph(self, checkpointer=None):
+        """
+        Build and compile the agent graph.
 
-    def generate_graph(self):
+        With a checkpointer, the state is saved after every node and a run
+        can be resumed by invoking the graph with its thread id again.
+        """
 
         # Define the two Nodes we will cycle between
         self.graph.add_node("coding_llm", self.call_model)
@@ -85,10 +95,17 @@ class OpenAIGraph:
             }
         )
 
-        # Setting normal edge
-        self.graph.add_edge("tools_invocation", "coding_llm")
+        # Back to the model, unless the turn just executed completed the run
+        self.graph.add_conditional_edges(
+            "tools_invocation",
+            self.after_tools,
+            {
+                "continue": "coding_llm",
+                "end": END
+            }
+        )
 
         # Compiling the graph
-        self.app = self.graph.compile()
+        self.app = self.graph.compile(checkpointer=checkpointer)
 
         return self.app
\ No newline at end of file
@@ -1,64 +1,12 @@
 from langchain_core.messages import SystemMessage
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.utils.function_calling import convert_to_openai_tool
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-import os
-from typing import Dict
+from utils.llm_helper import LLMHelper
+from config.llm_config import LLM_MODELS
 from .tools import CodingTools
 from .structured_output import AttemptCompletionInput
 
-from dotenv import load_dotenv
-
-load_dotenv(dotenv_path='.env')
-
-LLM_MODELS = {
-    "us.anthropic.claude-3-5-sonnet-20241022-v2:0": {
-        "provider": "bedrock",
-        "model_id": "us.anthropic.claude-3-5-sonnet-20241022-v2:0",
-        "temperature": 0,
-    },
-    "us.anthropic.claude-3-5-haiku-20241022-v1:0": {
-        "provider": "bedrock",
-        "model_id": "us.anthropic.claude-3-5-haiku-20241022-v1:0",
-        "temperature": 0,
-    },
-    "anthropic.claude-3-5-sonnet-20240620-v1:0": {
-        "provider": "bedrock",
-        "model_id": "anthropic.claude-3-5-sonnet-20240620-v1:0",
-        "temperature": 0,
-    },
-    "anthropic.claude-3-haiku-20240307-v1:0": {
-        "provider": "bedrock",
-        "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
-        "temperature": 0,
-    },
-    "gpt-4o-2024-11-20": {
-        "provider": "openai",
-        "model_id": "gpt-4o-2024-11-20",
-        "temperature": 0,
-        "max_tokens": None,
-        "timeout": None,
-    },
-}
-
-# Load secrets from environment variables or other secure sources
-SECRETS = {
-    "aws": {
-        "region": os.getenv("AWS_REGION"),
-        "access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
-        "secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
-    },
-    "openai": {
-        "api_key": os.getenv("OPENAI_API_KEY"),
-    },
-}
-
-def get_secrets(provider: str) -> Dict:
-    """Get secrets for a specific provider"""
-    if provider not in SECRETS:
-        raise ValueError(f"No secrets configured for provider: {provider}")
-    return SECRETS[provider]
 
 class OpenAIModel:
 
@@ -74,21 +22,9 @@ class OpenAIModel:
         )
 
         self.model_config = LLM_MODELS[model_name]
-        self.openai_secrets = get_secrets('openai')
 
-        if (model_name.startswith('o1') | model_name.startswith('o3')):
-            self.llm = ChatOpenAI(
-                model=self.model_config["model_id"],
-                max_tokens=self.model_config["max_tokens"],
-                api_key=self.openai_secrets["api_key"],
-            )
-        else:
-            self.llm = ChatOpenAI(
-                model=self.model_config["model_id"],
-                temperature=self.model_config["temperature"],
-                max_tokens=self.model_config["max_tokens"],
-                api_key=self.openai_secrets["api_key"],
-            )
+        # Shared client from the process-wide registry
+        self.llm = LLMHelper.get_llm(model_name)
         
         # Here we keep making the models seperate.
         self.bindable_tools = []
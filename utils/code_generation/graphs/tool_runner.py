@@ -0,0 +1,136 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt import ToolInvocation
+from config.settings import CODEGEN_TOOL_CONCURRENCY
+from utils.code_generation.overlay import OverlayFS
+
+# Tools that take the run's base_path from the config
+PATH_TOOLS = {"write_to_file", "read_file", "list_files", "execute_command"}
+# Tools working on a single file; calls on different files are independent
+FILE_TOOLS = {"write_to_file", "read_file"}
+# Structured output the model calls to finish the run; it has no executor
+COMPLETION_TOOL = "AttemptCompletionInput"
+
+
+def completes_run(calls: List[Tuple[str, str, Dict]]) -> bool:
+    """Whether a turn's tool calls include the completion call"""
+    return any(name == COMPLETION_TOOL for _, name, _ in calls)
+
+
+def plan_tool_calls(calls: List[Tuple[str, str, Dict]]) -> List[List[List[int]]]:
+    """
+    Split a turn's tool calls into stages of independent call chains.
+
+    Calls on the same file stay in one chain, in the order they were issued.
+    Any other call (commands, listings, questions) may depend on every file,
+    so it gets a stage of its own after the calls before it. Consecutive
+    commands the model marked as independent share one stage. Completion
+    calls come last, after every other call of the turn.
+
+    Args:
+        calls: (id, name, args) of each call
+
+    Returns:
+        Stages, each a list of chains of call indexes
+    """
+    stages: List[List[List[int]]] = []
+    chains: Dict[str, List[int]] = {}
+    commands: List[List[int]] = []
+    completions: List[List[int]] = []
+
+    for index, (_, name, args) in enumerate(calls):
+        if name == COMPLETION_TOOL:
+            completions.append([index])
+            continue
+        if name in FILE_TOOLS and args.get("path"):
+            if commands:
+                stages.append(commands)
+                commands = []
+            key = os.path.normpath(args["path"].lstrip("/"))
+            chains.setdefault(key, []).append(index)
+            continue
+
+        if chains:
+            stages.append(list(chains.values()))
+            chains = {}
+        if name == "execute_command" and args.get("independent"):
+            commands.append([index])
+            continue
+        if commands:
+            stages.append(commands)
+            commands = []
+        stages.append([[index]])
+
+    if commands:
+        stages.append(commands)
+
+    if chains:
+        stages.append(list(chains.values()))
+    if completions:
+        stages.append(completions)
+    return stages
+
+
+def run_tool_calls(
+    tool_executor, calls: List[Tuple[str, str, Dict]], base_path: str
+) -> List[ToolMessage]:
+    """
+    Execute every tool call of a model response.
+
+    Independent calls run concurrently on up to CODEGEN_TOOL_CONCURRENCY
+    threads; see plan_tool_calls for the ordering that is kept. When the
+    workspace has an overlay, call durations are recorded on it and it gets
+    the chance to flush after the turn.
+
+    Args:
+        tool_executor: ToolExecutor holding the coding tools
+        calls: (id, name, args) of each call
+        base_path (str): Workspace of the run
+
+    Returns:
+        One ToolMessage per call, in the order the calls were issued
+    """
+
+    overlay = OverlayFS.get(base_path)
+
+    def execute(index: int) -> ToolMessage:
+        call_id, name, args = calls[index]
+        action = ToolInvocation(tool=name, tool_input=args)
+        started = time.monotonic()
+        try:
+            if name == COMPLETION_TOOL:
+                response = "Completion recorded."
+            elif name in PATH_TOOLS:
+                response = tool_executor._execute(action, config={"base_path": base_path})
+            else:
+                response = tool_executor._execute(action)
+        except Exception as e:
+            # Report the failure to the model instead of aborting the turn
+            response = f"Error running {name}: {str(e)}"
+        if overlay is not None:
+            overlay.record_call(name, time.monotonic() - started)
+        return ToolMessage(content=str(response), name=name, tool_call_id=call_id)
+
+    def execute_chain(chain: List[int]) -> List[Tuple[int, ToolMessage]]:
+        return [(index, execute(index)) for index in chain]
+
+    results: Dict[int, ToolMessage] = {}
+    stages = plan_tool_calls(calls)
+    workers = min(CODEGEN_TOOL_CONCURRENCY, max((len(s) for s in stages), default=1))
+
+    if workers <= 1:
+        for stage in stages:
+            for chain in stage:
+                results.update(execute_chain(chain))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for stage in stages:
+                for chain_results in pool.map(execute_chain, stage):
+                    results.update(chain_results)
+
+    if overlay is not None:
+        overlay.end_turn()
+    return [results[index] for index in range(len(calls))]
@@ -1,24 +1,74 @@
+import asyncio
+import os
+from typing import Optional
 from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain_core.runnables import RunnableConfig
-import subprocess
+from config.settings import (
+    CODEGEN_COMMAND_TIMEOUT,
+    CODEGEN_COMMAND_MAX_TIMEOUT,
+    CODEGEN_COMMAND_OUTPUT_MAX_CHARS,
+)
+from utils.deploy_utils import broadcast_log
+from utils.code_generation.command_runner import run_command
+from utils.code_generation.overlay import OverlayFS
+from utils.code_generation.file_index import FileIndex
 
 class ExecuteCommandInput(BaseModel):
     command: str = Field(description="The shell command to execute.")
+    timeout: Optional[int] = Field(None, description=f"Seconds the command may run before it is killed. Defaults to {CODEGEN_COMMAND_TIMEOUT}, at most {CODEGEN_COMMAND_MAX_TIMEOUT}.")
+    independent: bool = Field(False, description="True if the command does not depend on the other commands of the same response and may run at the same time as them.")
 
-def execute_command(command: str, config: RunnableConfig) -> str:
+def execute_command(
+    command: str,
+    config: RunnableConfig,
+    timeout: Optional[int] = None,
+    independent: bool = False,
+) -> str:
     base_path = config['metadata'].get('base_path')
 
-    if command.find(base_path) == -1:
-        command = "cd {base_path} && " + command
+    if base_path is None:
+        return "Base path doesn't exist."
 
-    command_result = subprocess.getoutput(command)
-    return f"Result upon execution: {command_result}"    
+    # Commands that name the workspace themselves run from the server's
+    # directory, like they always have; the rest run inside the workspace
+    cwd = None if base_path in command else base_path
+    timeout = min(max(timeout or CODEGEN_COMMAND_TIMEOUT, 1), CODEGEN_COMMAND_MAX_TIMEOUT)
+    # `independent` is only used to schedule the call, see tool_runner
+
+    # Commands see the disk, so pending writes go first, and whatever the
+    # command changes must be read again
+    overlay = OverlayFS.get(base_path)
+    if overlay is not None:
+        overlay.flush()
+
+    label = os.path.relpath(base_path)
+    broadcast_log(f"[{label}] $ {command}")
+    try:
+        # Tool calls run on worker threads without an event loop of their own
+        result = asyncio.run(run_command(
+            command,
+            cwd=cwd,
+            timeout=timeout,
+            max_chars=CODEGEN_COMMAND_OUTPUT_MAX_CHARS,
+            on_output=lambda line: broadcast_log(f"[{label}] {line}"),
+        ))
+    finally:
+        if overlay is not None:
+            overlay.invalidate()
+        FileIndex.get(base_path).invalidate()
+
+    if result["timed_out"]:
+        status = f"Killed after timing out at {timeout}s"
+    else:
+        status = f"Exit code {result['exit_code']} after {result['seconds']}s"
+    broadcast_log(f"[{label}] {status}")
+    return f"{status}. Output:\n{result['output']}"
 
 execute_command_tool = StructuredTool.from_function(
     func=execute_command,
     name="execute_command",
-    description="Allows the LLM to execute shell commands on the system.",
+    description="Allows the LLM to execute shell commands on the system, with a timeout. Reports the exit code, duration and output.",
     args_schema=ExecuteCommandInput,
     return_direct=False
-)
\ No newline at end of file
+)
@@ -1,55 +1,46 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain_core.runnables import RunnableConfig
-import os
+from utils.code_generation.file_index import FileIndex
 
 class ListFilesInput(BaseModel):
     path: str = Field(description="The relative directory path to list the contents of.")
     recursive: bool = Field(True, description="Whether to list contents recursively.")
+    max_depth: Optional[int] = Field(None, description="How many directory levels to descend when recursive; deeper directories only show how many entries they have.")
+    pattern: Optional[str] = Field(None, description="Only list files matching this glob, e.g. '*.tsx' or 'src/**/*.py'.")
 
 
-def list_files(path: str, recursive: bool, config: RunnableConfig) -> str:
-    excluded_folders = ["node_modules", "__pycache__", "env", "venv", 
-                    "target/dependency", "build/dependencies", "dist",
-                    "out", "bundle", "vendor", "tmp", "temp", "deps", 
-                    "pkg", "Pods"]
-    
-    def recursive_traverse(current_dir, indent=0):
-        structure_str = ""
-        try:
-            for entry in sorted(os.scandir(current_dir), key=lambda e: e.name):
-                if entry.name in excluded_folders:
-                    continue
-                structure_str += " " * indent + entry.name + "\n"
-                if entry.is_dir():
-                    structure_str += recursive_traverse(entry.path, indent + 1)
-        except PermissionError:
-            pass
-        return structure_str
-
+def list_files(
+    path: str,
+    recursive: bool,
+    config: RunnableConfig,
+    max_depth: Optional[int] = None,
+    pattern: Optional[str] = None,
+) -> str:
     cwd = config['metadata'].get("base_path")
-    
+
     if cwd is None:
         return "Base path doesn't exist."
-    
-    complete_path = cwd + path
-    if recursive:
-        return recursive_traverse(complete_path, 0)
-    else:
-        structure_str = ""
-        try:
-            for entry in sorted(os.scandir(), key=lambda e: e.name):
-                if entry.name in excluded_folders:
-                    continue
-                structure_str += " " + entry.name + "\n"
-        except PermissionError:
-            pass
-        return structure_str
-    
+
+    # Served from the workspace's file index; excluded folders and
+    # .gitignore entries are left out and long listings are capped
+    if not recursive:
+        max_depth = 1
+    elif max_depth is not None:
+        max_depth = max(max_depth, 1)
+
+    try:
+        if max_depth is None:
+            return FileIndex.get(cwd).listing(path, pattern=pattern)
+        return FileIndex.get(cwd).listing(path, max_depth=max_depth, pattern=pattern)
+    except ValueError as e:
+        return str(e)
+
 list_files_tool = StructuredTool.from_function(
     func=list_files,
     name="list_files",
-    description="Allows the LLM to list files and directories within a specified directory, optionally recursively.",
+    description="Allows the LLM to list files and directories within a specified directory, optionally recursively, limited in depth or filtered by a glob pattern.",
     args_schema=ListFilesInput,
     return_direct=False
-)
\ No newline at end of file
+)
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain_core.runnables import RunnableConfig
 import os
+from utils.code_generation.overlay import OverlayFS
 
 class ReadFileInput(BaseModel):
     path: str = Field(description="The relative path to the file to be read.")
@@ -12,6 +13,16 @@ def read_file(path: str, config: RunnableConfig) -> str:
     if cwd is None:
         return "Base path doesn't exist."
     
+    overlay = OverlayFS.get(cwd)
+    if overlay is not None:
+        try:
+            contents = overlay.read(path)
+        except ValueError as e:
+            return str(e)
+        if contents is None:
+            return "The file you are looking for doesn't exist."
+        return contents
+
     complete_path = cwd + '/' + path
     if(os.path.exists(complete_path)):
         with open(complete_path, 'r') as f:
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain_core.runnables import RunnableConfig
 import os
+from utils.code_generation.overlay import OverlayFS
+from utils.code_generation.file_index import FileIndex
 
 class WriteToFileInput(BaseModel):
     path: str = Field(description="The relative path to the file where content should be written.")
@@ -14,6 +16,16 @@ def write_to_file(path: str, content: str, config: RunnableConfig) -> str:
     if cwd is None:
         return "Base path doesn't exist."
 
+    overlay = OverlayFS.get(cwd)
+    if overlay is not None:
+        # Buffered in memory until the run's next flush
+        try:
+            overlay.write(path, content)
+        except ValueError as e:
+            return str(e)
+        FileIndex.get(cwd).add_file(path)
+        return f"Wrote contents to {path}."
+
     complete_path = cwd + '/' +path
     
     # Check if directory exists, create if not
@@ -23,6 +35,7 @@ def write_to_file(path: str, content: str, config: RunnableConfig) -> str:
     with open(complete_path, 'w') as f:
         f.write(content)
     f.close()
+    FileIndex.get(cwd).add_file(path)
     return f"Wrote contents to {path}."
     
 write_to_file_tool = StructuredTool.from_function(
@@ -0,0 +1,288 @@
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from config.settings import CODEGEN_FLUSH_EVERY_TURNS
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# Read once: os.umask can only be read by setting it, which races with
+# other threads creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: str) -> int:
+    """Permission bits of an existing file, or those of a new file under the umask"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+class OverlayFS:
+    """
+    In-memory layer over a codegen run's workspace.
+
+    Writes stay in memory until flush(); a write with the same content as
+    the file already has is dropped. Reads see the pending writes on top of
+    the disk. Flushing writes every pending file to a
+    temporary file first and only then renames them into place, so the
+    workspace never holds half-written files.
+
+    Overlays are registered per workspace with open(); the coding tools use
+    the registered overlay of their base_path and go straight to disk when
+    there is none.
+    """
+
+    _overlays: Dict[str, "OverlayFS"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, root: str, flush_every_turns: int = CODEGEN_FLUSH_EVERY_TURNS):
+        """
+        Args:
+            root (str): Workspace directory
+            flush_every_turns (int): Agent turns between automatic flushes,
+                0 to only flush explicitly
+        """
+        self.root = os.path.realpath(root)
+        self.flush_every_turns = flush_every_turns
+        self._pending: Dict[str, str] = {}
+        self._clean: Dict[str, str] = {}  # Disk content already read
+        self._hashes: Dict[str, str] = {}
+        self._turns = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            "tool_calls": {},
+            "writes": 0,
+            "collapsed_writes": 0,
+            "reads": 0,
+            "reads_from_memory": 0,
+            "flushes": 0,
+            "files_flushed": 0,
+            "bytes_flushed": 0,
+            "flush_errors": [],
+        }
+
+    @classmethod
+    def open(cls, root: str) -> "OverlayFS":
+        """Register a new overlay for a workspace"""
+        overlay = cls(root)
+        with cls._registry_lock:
+            cls._overlays[overlay.root] = overlay
+        return overlay
+
+    @classmethod
+    def get(cls, root: Optional[str]) -> Optional["OverlayFS"]:
+        """The overlay registered for a workspace, if any"""
+        if root is None:
+            return None
+        with cls._registry_lock:
+            return cls._overlays.get(os.path.realpath(root))
+
+    @classmethod
+    def close(cls, root: str) -> Dict:
+        """
+        Flush and unregister a workspace's overlay.
+
+        Returns:
+            The overlay's stats, or an empty dict if none was registered
+        """
+        with cls._registry_lock:
+            overlay = cls._overlays.pop(os.path.realpath(root), None)
+        if overlay is None:
+            return {}
+        overlay.flush()
+        return overlay.stats()
+
+    def relative(self, path: str) -> str:
+        """
+        Normalised path of a file relative to the workspace.
+
+        Raises:
+            ValueError: If the path points outside the workspace
+        """
+        relative = os.path.normpath(path.lstrip("/"))
+        if relative == ".." or relative.startswith(".." + os.sep):
+            raise ValueError(f"Path {path} is outside the workspace")
+        return "" if relative == "." else relative
+
+    def _disk_path(self, relative: str) -> str:
+        return os.path.join(self.root, relative)
+
+    def write(self, path: str, content: str) -> bool:
+        """
+        Stage a file write.
+
+        Returns:
+            False if the file already had this content
+
+        Raises:
+            ValueError: If the path is outside the workspace, is a directory
+                or lies below a file
+        """
+        relative = self.relative(path)
+        digest = _digest(content)
+        with self._lock:
+            self._check_file_path(path, relative)
+            self._stats["writes"] += 1
+            if self._hash(relative) == digest:
+                self._stats["collapsed_writes"] += 1
+                return False
+            self._pending[relative] = content
+            self._clean.pop(relative, None)
+            self._hashes[relative] = digest
+            return True
+
+    def _check_file_path(self, path: str, relative: str) -> None:
+        """Reject paths that could never be flushed as a regular file"""
+        if not relative:
+            raise ValueError(f"Path {path!r} is not a file path")
+        prefix = relative + os.sep
+        if os.path.isdir(self._disk_path(relative)) or any(
+            pending.startswith(prefix) for pending in self._pending
+        ):
+            raise ValueError(f"Path {path} is a directory")
+        parent = os.path.dirname(relative)
+        while parent:
+            if parent in self._pending or os.path.isfile(self._disk_path(parent)):
+                raise ValueError(f"Path {path} is inside {parent}, which is a file")
+            parent = os.path.dirname(parent)
+
+    def read(self, path: str) -> Optional[str]:
+        """Content of a file, or None if it does not exist"""
+        relative = self.relative(path)
+        with self._lock:
+            self._stats["reads"] += 1
+            for layer in (self._pending, self._clean):
+                if relative in layer:
+                    self._stats["reads_from_memory"] += 1
+                    return layer[relative]
+
+        disk_path = self._disk_path(relative)
+        if not os.path.isfile(disk_path):
+            return None
+        with open(disk_path, "r") as f:
+            content = f.read()
+        with self._lock:
+            if relative not in self._pending:
+                self._clean[relative] = content
+                self._hashes[relative] = _digest(content)
+        return content
+
+    def _hash(self, relative: str) -> Optional[str]:
+        if relative not in self._hashes and os.path.isfile(self._disk_path(relative)):
+            with open(self._disk_path(relative), "r") as f:
+                content = f.read()
+            self._clean[relative] = content
+            self._hashes[relative] = _digest(content)
+        return self._hashes.get(relative)
+
+    def pending_paths(self) -> List[str]:
+        """Relative paths of the files not flushed yet"""
+        with self._lock:
+            return list(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write all pending files to disk.
+
+        Every file goes to a temporary file next to its destination first;
+        the temporary files are renamed into place once all of them are
+        written. A file that cannot be written is dropped and reported in
+        the stats' flush_errors; it is not retried, so one bad path cannot
+        fail every later flush.
+
+        Returns:
+            Number of files written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            staged = []
+            for relative, content in pending.items():
+                destination = self._disk_path(relative)
+                temp_path = None
+                try:
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    fd, temp_path = tempfile.mkstemp(
+                        dir=os.path.dirname(destination), prefix=".overlay-"
+                    )
+                    with os.fdopen(fd, "w") as f:
+                        f.write(content)
+                    # mkstemp creates 0600 files; keep the mode a plain write
+                    # would leave, including an existing execute bit
+                    os.chmod(temp_path, _file_mode(destination))
+                    staged.append((relative, temp_path))
+                except OSError as e:
+                    if temp_path is not None and os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    self._drop(relative, e)
+
+            written = {}
+            for relative, temp_path in staged:
+                try:
+                    os.replace(temp_path, self._disk_path(relative))
+                    written[relative] = pending[relative]
+                except OSError as e:
+                    os.remove(temp_path)
+                    self._drop(relative, e)
+
+            self._clean.update(written)
+            self._stats["flushes"] += 1
+            self._stats["files_flushed"] += len(written)
+            self._stats["bytes_flushed"] += sum(
+                len(content.encode("utf-8")) for content in written.values()
+            )
+            return len(written)
+
+    def _drop(self, relative: str, error: OSError) -> None:
+        """Forget a pending file that could not be flushed"""
+        self._hashes.pop(relative, None)
+        self._stats["flush_errors"].append(f"{relative}: {error}")
+
+    def invalidate(self) -> None:
+        """Forget cached disk content, e.g. after a shell command changed files"""
+        with self._lock:
+            self._clean.clear()
+            self._hashes = {
+                relative: _digest(content) for relative, content in self._pending.items()
+            }
+
+    def end_turn(self) -> None:
+        """Called after each agent turn's tool calls; flushes periodically"""
+        with self._lock:
+            self._turns += 1
+            due = self.flush_every_turns and self._turns % self.flush_every_turns == 0
+        if due:
+            self.flush()
+
+    def record_call(self, tool: str, seconds: float) -> None:
+        with self._lock:
+            calls = self._stats["tool_calls"].setdefault(tool, {"count": 0, "seconds": 0.0})
+            calls["count"] += 1
+            calls["seconds"] += seconds
+
+    def stats(self) -> Dict:
+        """Tool latency and disk write counts of the run"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["flush_errors"] = list(self._stats["flush_errors"])
+            stats["tool_calls"] = {
+                tool: {
+                    "count": calls["count"],
+                    "seconds": round(calls["seconds"], 3),
+                    "average_ms": round(calls["seconds"] * 1000 / calls["count"], 2),
+                }
+                for tool, calls in self._stats["tool_calls"].items()
+            }
+            stats["disk_writes_saved"] = stats["writes"] - stats["files_flushed"]
+            stats["pending_files"] = len(self._pending)
+            return stats
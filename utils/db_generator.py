@@ -1,15 +1,20 @@
 import os
 import re
 import json
+import time
 import pymysql
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from langchain.agents import Tool
 from langgraph.graph import Graph
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Callable, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage, HumanMessage
+from config.settings import SQL_GENERATION_CONCURRENCY, SQL_GENERATION_RETRIES
+from utils.mermaid_erd import ERDiagram, parse_mermaid_erd
+from utils.sql_compiler import compile_mysql, table_name
 
 load_dotenv()
 
@@ -18,9 +23,17 @@ class SQLStatement(BaseModel):
     table_name: Optional[str] = Field(None, description="Name of the table being created or altered")
     statement_type: Optional[str] = Field(None, description="Type of SQL statement (CREATE or ALTER)")
 
+class TableTiming(BaseModel):
+    table_name: str
+    statement_type: str = Field(description="CREATE or ALTER")
+    source: str = Field(description="'compiled' or 'llm'")
+    seconds: float = Field(description="Wall time; for compiled tables, compiling the whole diagram")
+    attempts: int = 1
+
 class SQLResponse(BaseModel):
     create_statements: List[SQLStatement] = Field(default_factory=list)
     alter_statements: List[SQLStatement] = Field(default_factory=list)
+    table_timings: List[TableTiming] = Field(default_factory=list)
     validation_status: str = Field(description="Status of the Mermaid diagram validation")
     errors: Optional[List[str]] = Field(default=None)
 
@@ -45,13 +58,19 @@ class MermaidToSQLAgent:
         
         def validate_mermaid(state: Dict) -> Dict:
             diagram = state["input"]["diagram"]
-            response = self.llm.invoke(validation_prompt.format(diagram=diagram))
+
+            # Diagrams the local parser accepts don't need the LLM to check them
+            if parse_mermaid_erd(diagram).is_valid:
+                validation_result = "VALID"
+            else:
+                response = self.llm.invoke(validation_prompt.format(diagram=diagram))
+                validation_result = response.content
 
             output = {
                 "validate": {  # Ensures the validate node's output is accessible
                     "output": {
                         "diagram": diagram,
-                        "validation_result": response.content
+                        "validation_result": validation_result
                     }
                 }
             }
@@ -220,6 +239,148 @@ class MermaidToSQLAgent:
 
         return table_definitions
 
+    def compile_sql(self, diagram: ERDiagram) -> Tuple[List[SQLStatement], List[SQLStatement], List[TableTiming]]:
+        """
+        Compile a parsed diagram to SQL locally.
+
+        Only entities with types the compiler can't map, and foreign keys
+        whose target it can't work out, are sent to the LLM, concurrently.
+        """
+        started = time.perf_counter()
+        compiled = compile_mysql(diagram)
+        compile_seconds = time.perf_counter() - started
+
+        jobs = []
+        for name in diagram.entities:
+            if name not in compiled.tables:
+                print(f"Generating SQL for table {name} with the LLM")
+                jobs.append((table_name(name), "CREATE", diagram.to_mermaid([name])))
+
+        # Entity name -> FK columns the compiler couldn't resolve
+        unresolved_entities: Dict[str, List[str]] = {}
+        for reference in compiled.unresolved_foreign_keys:
+            entity_name, column = reference.split(".", 1)
+            unresolved_entities.setdefault(entity_name, []).append(column.lower())
+        for name in unresolved_entities:
+            print(f"Generating foreign keys for table {name} with the LLM")
+            related = [name] + diagram.related_entities(name)
+            jobs.append((table_name(name), "ALTER", diagram.to_mermaid(related)))
+
+        generated = dict(zip(
+            [(job_name, stmt_type) for job_name, stmt_type, _ in jobs],
+            self._generate_concurrently(jobs),
+        ))
+
+        create_statements, timings = [], []
+        for name in diagram.entities:
+            if name in compiled.tables:
+                create_statements.append(SQLStatement(
+                    statement=compiled.tables[name],
+                    table_name=table_name(name),
+                    statement_type="CREATE",
+                ))
+                timings.append(TableTiming(
+                    table_name=table_name(name),
+                    statement_type="CREATE",
+                    source="compiled",
+                    seconds=compile_seconds,
+                ))
+            else:
+                statements, timing = generated[(table_name(name), "CREATE")]
+                create_statements.extend(statements)
+                timings.append(timing)
+
+        alter_statements = [
+            SQLStatement(statement=fk.to_sql(), table_name=fk.table, statement_type="ALTER")
+            for fk in compiled.foreign_keys
+        ]
+        for name, columns in unresolved_entities.items():
+            statements, timing = generated[(table_name(name), "ALTER")]
+            # The LLM sees the whole neighbourhood and also repeats the
+            # compiled foreign keys; keep only the ones that were missing
+            for stmt in statements:
+                fk_columns = _foreign_key_columns(stmt.statement)
+                if (
+                    re.match(rf"ALTER\s+TABLE\s+`?{re.escape(table_name(name))}`?\s",
+                             stmt.statement, re.IGNORECASE)
+                    and fk_columns
+                    and set(fk_columns) <= set(columns)
+                ):
+                    alter_statements.append(stmt)
+            timings.append(timing)
+
+        return create_statements, alter_statements, timings
+
+    def generate_sql_with_llm(self, diagram: str) -> Tuple[List[SQLStatement], List[SQLStatement], List[TableTiming]]:
+        """
+        Generate SQL with one LLM call per table plus one for relationships.
+
+        The calls run concurrently; statements keep the diagram's table order.
+        """
+        # Extract individual table definitions
+        tables = self.extract_tables_from_mermaid(diagram)
+
+        jobs = [
+            (table.split("{", 1)[0].strip(), "CREATE", table) for table in tables
+        ]
+        # ALTER TABLE statements for the relationships
+        jobs.append(("relationships", "ALTER", diagram))
+
+        create_statements, alter_statements, timings = [], [], []
+        for (_, stmt_type, _), (statements, timing) in zip(jobs, self._generate_concurrently(jobs)):
+            if stmt_type == "CREATE":
+                create_statements.extend(statements)
+            else:
+                alter_statements.extend(statements)
+            timings.append(timing)
+
+        return create_statements, alter_statements, timings
+
+    def _generate_concurrently(self, jobs: List[Tuple[str, str, str]]) -> List[Tuple[List[SQLStatement], TableTiming]]:
+        """
+        Run (table name, statement type, diagram) generation jobs at most
+        SQL_GENERATION_CONCURRENCY at a time, returning results in job order.
+        """
+        if not jobs:
+            return []
+
+        with ThreadPoolExecutor(max_workers=SQL_GENERATION_CONCURRENCY) as pool:
+            futures = [pool.submit(self._generate_with_retries, *job) for job in jobs]
+            return [future.result() for future in futures]
+
+    def _generate_with_retries(self, name: str, stmt_type: str, diagram: str) -> Tuple[List[SQLStatement], TableTiming]:
+        """Generate SQL for one job, retrying failed calls and empty answers"""
+        generate = self.generate_single_table_sql if stmt_type == "CREATE" else self.generate_alter_statements
+        started = time.perf_counter()
+
+        for attempt in range(1, SQL_GENERATION_RETRIES + 2):
+            try:
+                statements = self._parse_sql_statements(generate(diagram), stmt_type)
+                # A table must come back as a CREATE statement; there may
+                # legitimately be no relationships to add
+                if stmt_type == "CREATE" and not any(
+                    "CREATE TABLE" in stmt.statement.upper() for stmt in statements
+                ):
+                    raise ValueError("no CREATE TABLE statement in response")
+
+                if stmt_type == "CREATE":
+                    for stmt in statements:
+                        stmt.table_name = stmt.table_name or name
+                return statements, TableTiming(
+                    table_name=name,
+                    statement_type=stmt_type,
+                    source="llm",
+                    seconds=time.perf_counter() - started,
+                    attempts=attempt,
+                )
+            except Exception as e:
+                if attempt > SQL_GENERATION_RETRIES:
+                    raise ValueError(
+                        f"Failed to generate {stmt_type} SQL for {name} after {attempt} attempts: {str(e)}"
+                    )
+                print(f"Retrying SQL generation for {name} (attempt {attempt} failed: {e})")
+                time.sleep(2 ** (attempt - 1))
+
     def _create_sql_generation_node(self):
         def generate_sql(state: Dict) -> Dict:
             if "correct" not in state or "output" not in state["correct"]:
@@ -228,26 +389,19 @@ class MermaidToSQLAgent:
             diagram = state["correct"]["output"]["corrected_diagram"]
             validation_result = state["correct"]["output"]["validation_result"]
 
-            # Extract individual table definitions
-            tables = self.extract_tables_from_mermaid(diagram)
-
-            create_statements = []
-            
-            for table in tables:
-                # print(f"Generating SQL for table: {table}")  # Debugging
-                sql_statement = self.generate_single_table_sql(table)
-                print("Generated SQL:", sql_statement)  # Debugging
-                create_statements.append(sql_statement)
-
-            # Generate ALTER TABLE statements
-            alter_statements = self.generate_alter_statements(diagram)
-            print("Generated ALTER Statements:", alter_statements)  # Debugging
+            parsed = parse_mermaid_erd(diagram)
+            if parsed.is_valid:
+                create_statements, alter_statements, timings = self.compile_sql(parsed)
+            else:
+                print("Mermaid parse errors, generating SQL with the LLM:", parsed.errors)
+                create_statements, alter_statements, timings = self.generate_sql_with_llm(diagram)
 
             output = {
                 "generate": {
                     "output": {
-                        "create_statements": "\n\n".join(create_statements),
+                        "create_statements": create_statements,
                         "alter_statements": alter_statements,
+                        "table_timings": timings,
                         "validation_result": validation_result
                     }
                 }
@@ -264,13 +418,15 @@ class MermaidToSQLAgent:
             if "generate" not in state or "output" not in state["generate"]:
                 raise ValueError("Missing 'generate' output in state")
 
-            create_statements = self._parse_sql_statements(state["generate"]["output"]["create_statements"], "CREATE")
-            alter_statements = self._parse_sql_statements(state["generate"]["output"]["alter_statements"], "ALTER")
+            create_statements = state["generate"]["output"]["create_statements"]
+            alter_statements = state["generate"]["output"]["alter_statements"]
+            table_timings = state["generate"]["output"]["table_timings"]
             validation_result = state["generate"]["output"]["validation_result"]
 
             response = SQLResponse(
                 create_statements=create_statements,
                 alter_statements=alter_statements,
+                table_timings=table_timings,
                 validation_status="valid" if "VALID" in validation_result.upper() else "corrected",
                 errors=None if "VALID" in validation_result.upper() else [validation_result]
             )
@@ -337,156 +493,244 @@ class MermaidToSQLAgent:
 
         return final_state["output"]
 
-    def write_schema_file(self, sql_response: SQLResponse, filename: str = 'schema.sql'):
-        """Write SQL statements to schema file"""
-        with open(filename, 'w') as f:
-            # Write header
-            header = """
-            DROP DATABASE IF EXISTS flight_booking;
-            CREATE DATABASE flight_booking;
-            USE flight_booking;
-            """.strip()
-            f.write(header + "\n\n")
-            
-            # Write CREATE statements
-            f.write("-- Create Tables\n\n")
-            for stmt in sql_response.create_statements:
-                f.write(f"{stmt.statement}\n\n")
-            
-            # Write ALTER statements
-            f.write("-- Add Foreign Key Constraints\n\n")
-            for stmt in sql_response.alter_statements:
-                f.write(f"{stmt.statement}\n\n")
-    
-    def execute_sql_file(self, sql_file="schema.sql"):
-        """Connects to MySQL and executes the given SQL schema file."""
-        try:
-            # Connect to MySQL
-            connection = pymysql.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                autocommit=True  
-            )
-
-            with connection.cursor() as cursor:
-                with open(sql_file, "r") as f:
-                    sql_script = f.read()
-
-                    sql_statements = re.split(r';\s*\n', sql_script)
-
-                    for statement in sql_statements:
-                        statement = statement.strip()
-                        if statement:
-                            try:
-                                cursor.execute(statement)
-                            except Exception as e:
-                                print(f"Error executing SQL statement:\n{statement}\nError: {e}")
-                                self.handle_error(statement, e)
-
-            print("Database schema executed successfully.")
-
-        except Exception as e:
-            print(f"Error executing SQL: {e}")
-        finally:
-            connection.close()
-
-    def handle_error(self, sql_statement: str, error: Exception) -> bool:
+    def execute_schema(self, sql_response: SQLResponse, db_config: Dict, reset_database: bool = True) -> "ExecutionReport":
         """
-        Handle SQL execution error by allowing human or AI correction.
-        Returns True if the corrected statement executed successfully, False otherwise.
-        """
-        print(f"Error executing SQL statement: {sql_statement}")
-        print(f"Error details: {str(error)}")
-        
-        max_attempts = 6
-        attempts = 0
-
-        while attempts < max_attempts:
-            # correction = input("Would you like to (1) Fix it manually, (2) Let AI suggest corrections, or (3) Abort? Enter 1, 2, or 3: ")
-            correction = "2"
-            if correction == "1":
-                corrected_sql = input("Please provide the corrected SQL statement: ")
-                if not corrected_sql.strip():
-                    print("Empty statement provided. Aborting.")
-                    return False
-                return self.reexecute_sql_statement(corrected_sql)
-
-            elif correction == "2":
-                corrected_sql = self.ask_ai_for_sql_fix(sql_statement)
-                if not corrected_sql:
-                    print("AI could not provide a fix. Please try manual correction.")
-                    attempts += 1
-                    continue  # Retry up to max_attempts
-
-                print(f"AI suggested fix: {corrected_sql}")
-                # proceed = input("Would you like to execute this fix? (y/n): ")
-                proceed = "y"
-                if proceed.lower() == 'y':
-                    return self.reexecute_sql_statement(corrected_sql)
-                attempts += 1  # Increment attempts after an AI attempt
-                continue  # Retry loop if not executed
-
-            elif correction == "3":
-                print("Aborting operation.")
-                return False  # Exit loop and function
-
-            else:
-                print("Invalid option. Please enter 1, 2, or 3.")
-
-            attempts += 1
-
-        print("Maximum retry attempts reached. Aborting.")
-        return False  # Exit after max attempts
+        Create the generated schema in the database named by `db_config`.
 
+        Failing statements are sent to the LLM for a fix, which is then
+        run over the same connection.
+        """
+        executor = SchemaExecutor(db_config, fix_statement=self.ask_ai_for_sql_fix)
+        return executor.execute(sql_response, reset_database=reset_database)
 
-    def ask_ai_for_sql_fix(self, sql_statement: str) -> Optional[str]:
+    def ask_ai_for_sql_fix(self, sql_statement: str, error: Optional[str] = None) -> Optional[str]:
         """Ask the AI model to generate a corrected SQL statement."""
         try:
-            llm = ChatOpenAI(temperature=0, model="gpt-4")
-            
-            prompt = ChatPromptTemplate.from_messages([
+            human = f"The following SQL statement caused an error during execution:\n{sql_statement}\n\n"
+            if error:
+                human += f"Error: {error}\n\n"
+            human += "Please provide ONLY the corrected SQL statement:"
+
+            response = self.llm.invoke([
                 ("system", "You are a database expert assisting with fixing SQL execution errors. "
                           "Return ONLY the corrected SQL statement, with no additional explanation."),
-                ("human", f"The following SQL statement caused an error during execution:\n{sql_statement}\n\n"
-                         f"Please provide ONLY the corrected SQL statement:")
+                ("human", human),
             ])
-            
-            formatted_prompt = prompt.format()
-            response = llm.invoke(formatted_prompt)
-            corrected_sql = response.content.strip()
-            
+            corrected_sql = self.clean_sql_response(response.content)
+
             # Basic validation that we got a SQL statement
             if not any(keyword in corrected_sql.upper() for keyword in ['CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE']):
-                print("AI response doesn't appear to be a valid SQL statement")
                 return None
-                
+
             return corrected_sql
-            
+
         except Exception as e:
             print(f"Error getting AI suggestion: {str(e)}")
             return None
 
-    def reexecute_sql_statement(self, corrected_sql: str):
-        """Reattempt executing the corrected SQL statement."""
-        try:
-            connection = pymysql.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_NAME"),  # Ensure database is specified
-                autocommit=True
+
+def _foreign_key_columns(statement: str) -> List[str]:
+    """Lower-cased local columns of the FOREIGN KEY clauses in a statement"""
+    columns = []
+    for match in re.finditer(r"FOREIGN\s+KEY\s*\(([^)]*)\)", statement, re.IGNORECASE):
+        columns.extend(
+            column.strip().strip("`\"").lower() for column in match.group(1).split(",")
+        )
+    return columns
+
+
+class StatementResult(BaseModel):
+    statement: str = Field(description="Statement as generated")
+    table_name: Optional[str] = None
+    statement_type: Optional[str] = None
+    success: bool
+    seconds: float
+    attempts: int = 1
+    error: Optional[str] = Field(None, description="Last error if the statement failed")
+    corrected_statement: Optional[str] = Field(None, description="Fixed statement that was run instead")
+
+class ExecutionReport(BaseModel):
+    database: str
+    results: List[StatementResult] = Field(default_factory=list)
+    deferred_foreign_keys: int = Field(0, description="FKs left as ALTER statements, e.g. for cycles")
+    total_seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[StatementResult]:
+        return [result for result in self.results if not result.success]
+
+
+_CREATE_TABLE = re.compile(r"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?([\w$]+)`?", re.IGNORECASE)
+_ADD_FOREIGN_KEY = re.compile(
+    r"^\s*ALTER\s+TABLE\s+`?([\w$]+)`?\s+ADD\s+"
+    r"((?:CONSTRAINT\s+`?[\w$]+`?\s+)?FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+`?([\w$]+)`?[^;]*?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def order_schema(create_statements: List[SQLStatement], alter_statements: List[SQLStatement]) -> Tuple[List[SQLStatement], int]:
+    """
+    Order CREATE statements so referenced tables come first and inline
+    their foreign keys.
+
+    FKs that can't be inlined (dependency cycles, tables outside the schema,
+    ALTERs that aren't a single FK) stay as ALTER statements at the end.
+
+    Returns:
+        Tuple of the statements to run in order and the number of FKs left
+        as ALTER statements
+    """
+    creates: Dict[str, SQLStatement] = {}
+    others = []
+    for stmt in create_statements:
+        match = _CREATE_TABLE.match(stmt.statement)
+        if match:
+            creates[match.group(1).lower()] = stmt
+        else:
+            others.append(stmt)
+
+    foreign_keys: Dict[str, List[Tuple[str, str, SQLStatement]]] = {table: [] for table in creates}
+    deferred = []
+    for stmt in alter_statements:
+        match = _ADD_FOREIGN_KEY.match(stmt.statement)
+        if match and match.group(1).lower() in creates and match.group(3).lower() in creates:
+            foreign_keys[match.group(1).lower()].append((match.group(3).lower(), match.group(2), stmt))
+        else:
+            deferred.append(stmt)
+
+    ordered, placed = [], set()
+    remaining = list(creates)
+    while remaining:
+        # Kahn's algorithm keeping the diagram order among ready tables;
+        # on a cycle the first remaining table goes next
+        table = next(
+            (t for t in remaining if all(ref in placed or ref == t for ref, _, _ in foreign_keys[t])),
+            remaining[0],
+        )
+        remaining.remove(table)
+        placed.add(table)
+
+        clauses = []
+        for ref, clause, stmt in foreign_keys[table]:
+            if ref in placed:
+                clauses.append(clause)
+            else:
+                deferred.append(stmt)
+
+        stmt = creates[table]
+        if clauses:
+            body = stmt.statement.rstrip().rstrip(";").rstrip()
+            close = body.rfind(")")
+            stmt = SQLStatement(
+                statement=body[:close].rstrip() + ",\n    " + ",\n    ".join(clauses) + "\n" + body[close:] + ";",
+                table_name=stmt.table_name or table,
+                statement_type="CREATE",
             )
+        ordered.append(stmt)
+
+    return others + ordered + deferred, len(deferred)
+
+
+class SchemaExecutor:
+    """
+    Runs a generated schema against MySQL.
+
+    Tables are created in foreign key order with FKs inline, over a single
+    connection held for the whole run, and every statement's outcome and
+    timing is returned instead of printed.
+    """
+
+    def __init__(self, db_config: Dict, fix_statement: Optional[Callable[[str, str], Optional[str]]] = None, max_fix_attempts: int = 6):
+        """
+        Args:
+            db_config (Dict): host, user, password and database to create
+            fix_statement (callable, optional): Called with a failing statement
+                and its error; returns a corrected statement or None
+            max_fix_attempts (int): Fixes tried per failing statement
+        """
+        self.db_config = db_config
+        self.fix_statement = fix_statement
+        self.max_fix_attempts = max_fix_attempts
+
+    def execute(self, sql_response: SQLResponse, reset_database: bool = True) -> ExecutionReport:
+        """
+        Execute the schema.
+
+        Args:
+            sql_response (SQLResponse): Generated statements
+            reset_database (bool): Drop and recreate the database first
 
-            with connection.cursor() as cursor:       
-                try:
-                    cursor.execute(corrected_sql)  
-                    print(f"Successfully executed the corrected statement: {corrected_sql}")
-                except Exception as e:
-                    print(f"Error executing corrected statement: {corrected_sql}")
-                    print(f"Error details: {str(e)}")
-        except pymysql.MySQLError as db_err:
-            print(f"Database connection error: {str(db_err)}")
+        Returns:
+            ExecutionReport
+        """
+        started = time.perf_counter()
+        database = self.db_config["database"]
+        statements, deferred = order_schema(sql_response.create_statements, sql_response.alter_statements)
+        report = ExecutionReport(database=database, deferred_foreign_keys=deferred)
+
+        quoted = "`" + database.replace("`", "``") + "`"
+        setup = [f"USE {quoted}"]
+        if reset_database:
+            setup = [f"DROP DATABASE IF EXISTS {quoted}", f"CREATE DATABASE {quoted}"] + setup
+
+        connection = pymysql.connect(
+            host=self.db_config["host"],
+            user=self.db_config["user"],
+            password=self.db_config["password"],
+            autocommit=True,
+        )
+        try:
+            with connection.cursor() as cursor:
+                for sql in setup:
+                    result = self._execute(cursor, SQLStatement(statement=sql, statement_type="DATABASE"), fix=False)
+                    report.results.append(result)
+                    if not result.success:
+                        report.total_seconds = time.perf_counter() - started
+                        return report
+
+                for stmt in statements:
+                    report.results.append(self._execute(cursor, stmt))
         finally:
-            if 'connection' in locals():
-                connection.close()
+            connection.close()
+
+        report.total_seconds = time.perf_counter() - started
+        return report
+
+    def _execute(self, cursor, stmt: SQLStatement, fix: bool = True) -> StatementResult:
+        """Run one statement, trying fixes on the same connection if it fails"""
+        started = time.perf_counter()
+        sql, corrected, attempts = stmt.statement, None, 1
+
+        while True:
+            try:
+                cursor.execute(sql)
+                return StatementResult(
+                    statement=stmt.statement,
+                    table_name=stmt.table_name,
+                    statement_type=stmt.statement_type,
+                    success=True,
+                    seconds=time.perf_counter() - started,
+                    attempts=attempts,
+                    corrected_statement=corrected,
+                )
+            except pymysql.MySQLError as e:
+                error = str(e)
+
+            if not fix or not self.fix_statement or attempts > self.max_fix_attempts:
+                break
+            fixed = self.fix_statement(sql, error)
+            if not fixed:
+                break
+            sql = corrected = fixed
+            attempts += 1
+
+        return StatementResult(
+            statement=stmt.statement,
+            table_name=stmt.table_name,
+            statement_type=stmt.statement_type,
+            success=False,
+            seconds=time.perf_counter() - started,
+            attempts=attempts,
+            error=error,
+            corrected_statement=corrected,
+        )
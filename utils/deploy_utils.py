@@ -1,22 +1,32 @@
 from datetime import datetime
 import json
+from tornado.ioloop import IOLoop
 from tornado.websocket import WebSocketHandler
 
 # WebSocket Handler for log broadcasting
 class LogWebSocketHandler(WebSocketHandler):
     clients = set()
-    
+    io_loop = None
+
     def check_origin(self, origin):
         return True
-        
+
     def open(self):
+        LogWebSocketHandler.io_loop = IOLoop.current()
         LogWebSocketHandler.clients.add(self)
-        
+
     def on_close(self):
         LogWebSocketHandler.clients.remove(self)
 
+def _write_log(message):
+    for client in list(LogWebSocketHandler.clients):
+        client.write_message(json.dumps({"log": message}))
+
 def broadcast_log(message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     formatted_message = f"{message}"
-    for client in LogWebSocketHandler.clients:
-        client.write_message(json.dumps({"log": formatted_message}))
\ No newline at end of file
+    if not LogWebSocketHandler.clients:
+        return
+    # Logs may come from background job threads; websocket writes must
+    # happen on the IOLoop thread.
+    LogWebSocketHandler.io_loop.add_callback(_write_log, formatted_message)
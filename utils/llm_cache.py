@@ -0,0 +1,141 @@
+import hashlib
+import json
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from config.settings import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+)
+from database.connection import llm_cache_collection
+
+# Set to True to skip cache lookups for LLM calls made in the current context.
+# Fresh responses are still written back to the cache.
+llm_cache_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+def _is_empty(generation: Any) -> bool:
+    message = getattr(generation, "message", None)
+    return not generation.text and not getattr(message, "tool_calls", None)
+
+
+class MongoLLMCache(BaseCache):
+    """
+    LangChain cache storing LLM responses in MongoDB.
+
+    Entries are keyed by the model parameters plus a canonical hash of the
+    messages, expire after LLM_CACHE_TTL_SECONDS and are evicted least
+    recently used first once the collection exceeds LLM_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, collection, ttl_seconds: int, max_entries: int):
+        self.collection = collection
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("last_used_at")
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Hash the model parameters and the messages in canonical form"""
+        try:
+            prompt = json.dumps(json.loads(prompt), sort_keys=True)
+        except ValueError:
+            pass
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if llm_cache_bypass.get():
+            self._count("bypassed")
+            return None
+
+        now = datetime.now(timezone.utc)
+        doc = self.collection.find_one_and_update(
+            {"_id": self._key(prompt, llm_string), "expires_at": {"$gt": now}},
+            {"$set": {"last_used_at": now}},
+            projection={"generations": 1},
+        )
+        if not doc:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return [loads(generation) for generation in doc["generations"]]
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        # An empty answer is a failed call, not one worth replaying
+        if all(_is_empty(generation) for generation in return_val):
+            return
+
+        now = datetime.now(timezone.utc)
+        self.collection.replace_one(
+            {"_id": self._key(prompt, llm_string)},
+            {
+                "generations": [dumps(generation) for generation in return_val],
+                "created_at": now,
+                "last_used_at": now,
+                "expires_at": now + self.ttl,
+            },
+            upsert=True,
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries above the size limit"""
+        excess = self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+
+        oldest = self.collection.find({}, {"_id": 1}).sort("last_used_at", 1).limit(excess)
+        self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+    def clear(self, **kwargs: Any) -> None:
+        self.collection.delete_many({})
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": self.collection.estimated_document_count(),
+                "max_entries": self.max_entries,
+                "ttl_seconds": int(self.ttl.total_seconds()),
+            }
+
+
+_llm_cache: Optional[MongoLLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[MongoLLMCache]:
+    """Get the process-wide LLM response cache, or None when caching is disabled"""
+    global _llm_cache
+
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = MongoLLMCache(
+                    llm_cache_collection, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+                )
+    return _llm_cache
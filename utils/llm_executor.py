@@ -0,0 +1,169 @@
+import asyncio
+import contextvars
+import functools
+import json
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from config.settings import LLM_MAX_CONCURRENCY, LLM_EXECUTOR_WORKERS
+from utils.llm_cache import llm_cache_bypass
+
+
+def _parse_json(content: str) -> Any:
+    return json.loads(content.replace("```json", "").replace("```", ""))
+
+
+class LLMExecutor:
+    """Runs LLM calls without blocking the Tornado IOLoop"""
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    _semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """Get the bounded thread pool used for providers without native async"""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=LLM_EXECUTOR_WORKERS,
+                        thread_name_prefix="llm",
+                    )
+        return cls._executor
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """Get the concurrency cap for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = cls._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+            cls._semaphores[loop] = semaphore
+        return semaphore
+
+    @staticmethod
+    def supports_native_async(llm: Any, method: str = "_agenerate") -> bool:
+        """
+        Check whether the LLM implements its own async generation.
+
+        Models that only inherit BaseChatModel._agenerate would run the sync
+        call on the default executor, so they go through our bounded pool instead.
+        """
+        model = getattr(llm, "bound", llm)  # unwrap bind_tools() bindings
+        implementation = getattr(type(model), method, None)
+        return implementation is not None and implementation is not getattr(
+            BaseChatModel, method
+        )
+
+    @classmethod
+    async def ainvoke(
+        cls, llm: Any, messages: Any, use_cache: bool = True, **kwargs
+    ) -> Any:
+        """
+        Invoke an LLM from a coroutine.
+
+        Args:
+            llm: LLM instance returned by LLMHelper.get_llm
+            messages: Messages or prompt to send
+            use_cache (bool): Set to False to skip the response cache lookup
+
+        Returns:
+            The LLM response message
+        """
+        token = None if use_cache else llm_cache_bypass.set(True)
+        try:
+            async with cls._get_semaphore():
+                if cls.supports_native_async(llm):
+                    return await llm.ainvoke(messages, **kwargs)
+
+                # run_in_executor does not carry context variables (such as
+                # the cache bypass flag) over to the worker thread by itself
+                context = contextvars.copy_context()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    cls.get_executor(),
+                    functools.partial(context.run, llm.invoke, messages, **kwargs),
+                )
+        finally:
+            if token is not None:
+                llm_cache_bypass.reset(token)
+
+    @classmethod
+    async def ainvoke_json(cls, llm: Any, messages: Any, **kwargs) -> Any:
+        """
+        Invoke an LLM from a coroutine and parse its answer as JSON.
+
+        An answer that doesn't parse may have come from the response cache,
+        so it is asked for once more past the cache; the fresh answer
+        replaces the cached one.
+
+        Args:
+            llm: LLM instance returned by LLMHelper.get_llm
+            messages: Messages or prompt to send
+
+        Returns:
+            The parsed answer
+
+        Raises:
+            json.JSONDecodeError: If the fresh answer doesn't parse either
+        """
+        response = await cls.ainvoke(llm, messages, **kwargs)
+        try:
+            return _parse_json(response.content)
+        except ValueError:
+            response = await cls.ainvoke(llm, messages, use_cache=False, **kwargs)
+            return _parse_json(response.content)
+
+    @classmethod
+    async def astream(cls, llm: Any, messages: Any, **kwargs) -> AsyncIterator[Any]:
+        """
+        Stream LLM response chunks from a coroutine.
+
+        Args:
+            llm: LLM instance returned by LLMHelper.get_llm
+            messages: Messages or prompt to send
+
+        Yields:
+            Response message chunks as the model produces them
+        """
+        async with cls._get_semaphore():
+            if cls.supports_native_async(llm, "_astream"):
+                async for chunk in llm.astream(messages, **kwargs):
+                    yield chunk
+                return
+
+            # Run the sync stream on the pool and hand chunks back to the loop
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+            done = object()
+
+            def produce():
+                try:
+                    for chunk in llm.stream(messages, **kwargs):
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                except Exception as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+                finally:
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+            context = contextvars.copy_context()
+            loop.run_in_executor(cls.get_executor(), context.run, produce)
+
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """Shut down the executor, e.g. on server shutdown"""
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=wait)
+                cls._executor = None
@@ -1,32 +1,66 @@
 from langchain_openai import ChatOpenAI
 from langchain_aws import ChatBedrock
+from botocore.config import Config
 import boto3
-from typing import Optional, Dict, Any
+import httpx
+import threading
+from typing import Optional, Dict, Any, Tuple
 from config.llm_config import LLM_MODELS, DEFAULT_MODEL
-from config.secrets import get_secrets
+from config.secrets import get_secrets, reload_secrets
+from config.settings import LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_KEEPALIVE_CONNECTIONS
+from utils.llm_cache import get_llm_cache
 
 
 class LLMHelper:
     """Helper class for LLM initialization and management"""
 
-    @staticmethod
-    def get_bedrock_client() -> Any:
-        """Initialize AWS Bedrock client"""
-        aws_secrets = get_secrets("aws")
-        return boto3.client(
-            service_name="bedrock-runtime",
-            region_name=aws_secrets["region"],
-            aws_access_key_id=aws_secrets["access_key_id"],
-            aws_secret_access_key=aws_secrets["secret_access_key"],
-        )
+    # Process-wide registry of LLM instances and the transports they share.
+    # Entries are created lazily and live until invalidate() is called.
+    _llms: Dict[Tuple[str, bool], Any] = {}
+    _transports: Dict[str, Any] = {}
+    _lock = threading.RLock()
 
-    @staticmethod
-    def get_llm(model_name: str = DEFAULT_MODEL) -> Any:
+    @classmethod
+    def get_bedrock_client(cls) -> Any:
+        """Get the shared AWS Bedrock runtime client"""
+        with cls._lock:
+            if "bedrock" not in cls._transports:
+                aws_secrets = get_secrets("aws")
+                cls._transports["bedrock"] = boto3.client(
+                    service_name="bedrock-runtime",
+                    region_name=aws_secrets["region"],
+                    aws_access_key_id=aws_secrets["access_key_id"],
+                    aws_secret_access_key=aws_secrets["secret_access_key"],
+                    config=Config(max_pool_connections=LLM_HTTP_MAX_CONNECTIONS),
+                )
+            return cls._transports["bedrock"]
+
+    @classmethod
+    def get_http_clients(cls) -> Dict[str, Any]:
+        """Get the shared sync and async HTTP connection pools for OpenAI"""
+        with cls._lock:
+            if "openai" not in cls._transports:
+                limits = httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_KEEPALIVE_CONNECTIONS,
+                )
+                cls._transports["openai"] = {
+                    "http_client": httpx.Client(limits=limits),
+                    "http_async_client": httpx.AsyncClient(limits=limits),
+                }
+            return cls._transports["openai"]
+
+    @classmethod
+    def get_llm(cls, model_name: str = DEFAULT_MODEL, cached: bool = False) -> Any:
         """
         Get LLM instance based on model name.
 
+        Instances are cached per model and shared across requests.
+
         Args:
             model_name (str): Name of the model to use (e.g., "claude-3-sonnet", "gpt-4")
+            cached (bool): Serve repeated prompts from the persistent response
+                cache (see utils.llm_cache)
 
         Returns:
             LLM instance
@@ -37,27 +71,46 @@ class LLMHelper:
         if model_name not in LLM_MODELS:
             raise ValueError(f"Unknown model: {model_name}")
 
+        key = (model_name, cached)
+        llm = cls._llms.get(key)
+        if llm is not None:
+            return llm
+
+        with cls._lock:
+            if key not in cls._llms:
+                cls._llms[key] = cls._create_llm(model_name, cached)
+            return cls._llms[key]
+
+    @classmethod
+    def _create_llm(cls, model_name: str, cached: bool) -> Any:
+        """Build a new LLM instance on top of the shared transports"""
         model_config = LLM_MODELS[model_name]
         provider = model_config["provider"]
+        cache = (get_llm_cache() if cached else None) or False
 
         try:
             if provider == "bedrock":
-                bedrock_client = LLMHelper.get_bedrock_client()
                 return ChatBedrock(
                     model_id=model_config["model_id"],
-                    client=bedrock_client,
+                    client=cls.get_bedrock_client(),
                     model_kwargs={"temperature": model_config["temperature"]},
+                    cache=cache,
                 )
 
             elif provider == "openai":
                 openai_secrets = get_secrets("openai")
-                return ChatOpenAI(
-                    model=model_config["model_id"],
-                    temperature=model_config["temperature"],
-                    max_tokens=model_config["max_tokens"],
-                    timeout=model_config["timeout"],
-                    api_key=openai_secrets["api_key"],
-                )
+                llm_kwargs = {
+                    "model": model_config["model_id"],
+                    "max_tokens": model_config["max_tokens"],
+                    "timeout": model_config["timeout"],
+                    "api_key": openai_secrets["api_key"],
+                    "cache": cache,
+                    **cls.get_http_clients(),
+                }
+                # Reasoning models reject the temperature parameter
+                if not model_config["model_id"].startswith(("o1", "o3")):
+                    llm_kwargs["temperature"] = model_config["temperature"]
+                return ChatOpenAI(**llm_kwargs)
 
             else:
                 raise ValueError(f"Unsupported provider: {provider}")
@@ -65,6 +118,28 @@ class LLMHelper:
         except Exception as e:
             raise ValueError(f"Error initializing {model_name}: {str(e)}")
 
+    @classmethod
+    def invalidate(cls, model_name: Optional[str] = None) -> None:
+        """
+        Drop cached LLM instances so they are rebuilt on next use.
+
+        Args:
+            model_name (str, optional): Model to drop. When omitted, every
+                instance and shared transport is dropped and secrets are
+                re-read, which is what credential rotation needs.
+        """
+        with cls._lock:
+            if model_name:
+                cls._llms.pop((model_name, False), None)
+                cls._llms.pop((model_name, True), None)
+                return
+
+            # Old transports are not closed here: calls already in flight
+            # still hold them and they are released once those finish.
+            cls._llms.clear()
+            cls._transports.clear()
+            reload_secrets()
+
     @staticmethod
     def get_available_models() -> Dict:
         """Get list of available models and their configurations"""
@@ -0,0 +1,263 @@
+import re
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+# Mermaid crow's foot markers, as written on the left and on the right of
+# the relationship line. Mirrored forms some generators emit are accepted.
+LEFT_CARDINALITIES = {
+    "|o": "zero_or_one",
+    "o|": "zero_or_one",
+    "||": "exactly_one",
+    "}o": "zero_or_more",
+    "o{": "zero_or_more",
+    "}|": "one_or_more",
+    "|{": "one_or_more",
+}
+RIGHT_CARDINALITIES = {
+    "o|": "zero_or_one",
+    "|o": "zero_or_one",
+    "||": "exactly_one",
+    "o{": "zero_or_more",
+    "}o": "zero_or_more",
+    "|{": "one_or_more",
+    "}|": "one_or_more",
+}
+# Canonical markers used when rendering a diagram
+_LEFT_MARKERS = {
+    "zero_or_one": "|o",
+    "exactly_one": "||",
+    "zero_or_more": "}o",
+    "one_or_more": "}|",
+}
+_RIGHT_MARKERS = {
+    "zero_or_one": "o|",
+    "exactly_one": "||",
+    "zero_or_more": "o{",
+    "one_or_more": "|{",
+}
+
+_NAME = r'[A-Za-z_][\w-]*|"[^"]+"'
+_ENTITY_START = re.compile(
+    rf'^(?P<name>{_NAME})(?:\s*\[\s*"?[^\]"]*"?\s*\])?\s*\{{(?P<rest>.*)$'
+)
+_ATTRIBUTE = re.compile(
+    r"^(?P<type>[A-Za-z_][\w\-\[\]]*(?:\([^)]*\))?)\s+"
+    r"(?P<name>\*?[A-Za-z_][\w-]*)"
+    r"(?:\s+(?P<keys>(?:PK|FK|UK)(?:\s*,\s*(?:PK|FK|UK))*))?"
+    r'(?:\s+"(?P<comment>[^"]*)")?\s*$'
+)
+_RELATIONSHIP = re.compile(
+    rf"^(?P<left>{_NAME})\s*"
+    r"(?P<left_card>[|}o][|o{]|o[|{])"
+    r"(?P<line>--|\.\.)"
+    r"(?P<right_card>[o|}][|{o])\s*"
+    rf"(?P<right>{_NAME})\s*"
+    r'(?::\s*(?P<label>"[^"]*"|.+?))?\s*$'
+)
+
+
+class ERDAttribute(BaseModel):
+    type: str = Field(description="Data type as written in the diagram")
+    name: str
+    keys: List[str] = Field(default_factory=list, description="PK, FK and/or UK")
+    comment: Optional[str] = None
+
+    @property
+    def is_primary_key(self) -> bool:
+        return "PK" in self.keys
+
+    @property
+    def is_foreign_key(self) -> bool:
+        return "FK" in self.keys
+
+
+class ERDEntity(BaseModel):
+    name: str
+    attributes: List[ERDAttribute] = Field(default_factory=list)
+    line: int = Field(0, description="Line number of the entity block")
+
+    @property
+    def primary_keys(self) -> List[ERDAttribute]:
+        return [attr for attr in self.attributes if attr.is_primary_key]
+
+
+class ERDRelationship(BaseModel):
+    left: str
+    right: str
+    left_cardinality: str
+    right_cardinality: str
+    identifying: bool = Field(description="Solid (--) rather than dashed (..) line")
+    label: Optional[str] = None
+
+
+class ERDiagram(BaseModel):
+    """Parsed Mermaid erDiagram"""
+
+    entities: Dict[str, ERDEntity] = Field(default_factory=dict)
+    relationships: List[ERDRelationship] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def related_entities(self, entity_name: str) -> List[str]:
+        """Names of the entities sharing a relationship with `entity_name`"""
+        related = []
+        for rel in self.relationships:
+            if rel.left == entity_name and rel.right not in related:
+                related.append(rel.right)
+            elif rel.right == entity_name and rel.left not in related:
+                related.append(rel.left)
+        return related
+
+    def to_mermaid(self, entity_names: Optional[List[str]] = None) -> str:
+        """
+        Render the diagram, or only some of its entities, back to Mermaid.
+
+        Relationships are kept when both ends are rendered.
+        """
+        names = entity_names or list(self.entities)
+        lines = ["erDiagram"]
+        for name in names:
+            entity = self.entities.get(name)
+            if not entity:
+                continue
+            lines.append(f"    {name} {{")
+            for attr in entity.attributes:
+                parts = [attr.type, attr.name]
+                if attr.keys:
+                    parts.append(", ".join(attr.keys))
+                if attr.comment is not None:
+                    parts.append(f'"{attr.comment}"')
+                lines.append("        " + " ".join(parts))
+            lines.append("    }")
+
+        for rel in self.relationships:
+            if rel.left in names and rel.right in names:
+                line = "--" if rel.identifying else ".."
+                label = rel.label if rel.label is not None else ""
+                lines.append(
+                    f"    {rel.left} {_LEFT_MARKERS[rel.left_cardinality]}{line}"
+                    f"{_RIGHT_MARKERS[rel.right_cardinality]} {rel.right} "
+                    f': "{label}"'
+                )
+        return "\n".join(lines)
+
+
+def _unquote(name: str) -> str:
+    return name[1:-1] if name.startswith('"') else name
+
+
+def parse_mermaid_erd(diagram: str) -> ERDiagram:
+    """
+    Parse a Mermaid erDiagram into entities, attributes and relationships.
+
+    Theme directives, comments and code fences are ignored. Lines that cannot
+    be parsed are reported in `errors` instead of raising, so callers can
+    decide whether to fall back to another strategy.
+
+    Args:
+        diagram (str): Mermaid source
+
+    Returns:
+        ERDiagram
+    """
+    result = ERDiagram()
+    current: Optional[ERDEntity] = None
+    in_directive = False
+    seen_header = False
+
+    for number, raw_line in enumerate(diagram.splitlines(), start=1):
+        line = raw_line.strip()
+
+        # %%{ init: ... }%% directives may span several lines
+        if in_directive:
+            in_directive = "}%%" not in line
+            continue
+        if line.startswith("%%{"):
+            in_directive = "}%%" not in line
+            continue
+
+        if not line or line.startswith("%%") or line.startswith("```"):
+            continue
+
+        if not seen_header:
+            if line == "erDiagram":
+                seen_header = True
+                continue
+            result.errors.append(f"Line {number}: expected 'erDiagram', got '{line}'")
+            seen_header = True
+            continue
+
+        if current is not None:
+            if line == "}":
+                current = None
+                continue
+            closes = line.endswith("}")
+            if closes:
+                line = line[:-1].strip()
+            match = _ATTRIBUTE.match(line)
+            if match:
+                keys = match.group("keys")
+                current.attributes.append(
+                    ERDAttribute(
+                        type=match.group("type"),
+                        name=match.group("name").lstrip("*"),
+                        keys=[key.strip() for key in keys.split(",")] if keys else [],
+                        comment=match.group("comment"),
+                    )
+                )
+            elif line:
+                result.errors.append(
+                    f"Line {number}: cannot parse attribute '{line}' of {current.name}"
+                )
+            if closes:
+                current = None
+            continue
+
+        match = _ENTITY_START.match(line)
+        if match:
+            name = _unquote(match.group("name"))
+            if name in result.entities:
+                result.errors.append(f"Line {number}: entity {name} defined twice")
+            current = ERDEntity(name=name, line=number)
+            result.entities[name] = current
+
+            rest = match.group("rest").strip()
+            if rest == "}":
+                current = None
+            elif rest:
+                result.errors.append(
+                    f"Line {number}: unexpected text after '{{' in {name}"
+                )
+            continue
+
+        match = _RELATIONSHIP.match(line)
+        if match:
+            left_card = LEFT_CARDINALITIES.get(match.group("left_card"))
+            right_card = RIGHT_CARDINALITIES.get(match.group("right_card"))
+            if left_card is None or right_card is None:
+                result.errors.append(f"Line {number}: unknown cardinality in '{line}'")
+                continue
+            label = match.group("label")
+            result.relationships.append(
+                ERDRelationship(
+                    left=_unquote(match.group("left")),
+                    right=_unquote(match.group("right")),
+                    left_cardinality=left_card,
+                    right_cardinality=right_card,
+                    identifying=match.group("line") == "--",
+                    label=_unquote(label.strip()) if label else None,
+                )
+            )
+            continue
+
+        result.errors.append(f"Line {number}: cannot parse '{line}'")
+
+    if current is not None:
+        result.errors.append(f"Entity {current.name} is missing its closing '}}'")
+    if not seen_header:
+        result.errors.append("Diagram is empty")
+
+    return result
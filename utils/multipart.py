@@ -0,0 +1,203 @@
+import hashlib
+import os
+from datetime import datetime
+from email.message import Message
+from typing import Callable, Dict, Optional
+
+
+class UploadedFile:
+    """A file part written to disk while the request body was streaming in"""
+
+    def __init__(self, filename: str, path: str):
+        self.filename = filename
+        self.path = path
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = open(path, "wb")
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the file content"""
+        return self._hash.hexdigest()
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MultipartStreamParser:
+    """
+    Incremental multipart/form-data parser for streamed request bodies.
+
+    Feed the body chunk by chunk with feed(). File parts are written to
+    `upload_dir` as they arrive and hashed on the way; other parts are
+    collected in `fields`. Only the tail of the last chunk is ever buffered,
+    so memory use does not grow with the upload size.
+    """
+
+    MAX_HEADER_BYTES = 16 * 1024
+    MAX_FIELD_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        boundary: bytes,
+        upload_dir: str,
+        validate_filename: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Args:
+            boundary (bytes): Boundary from the Content-Type header
+            upload_dir (str): Directory file parts are written to
+            validate_filename (callable, optional): Called with each file
+                part's filename; raises ValueError to reject the upload
+        """
+        self.upload_dir = upload_dir
+        self.validate_filename = validate_filename
+        self.fields: Dict[str, str] = {}
+        self.files: Dict[str, UploadedFile] = {}
+        self.complete = False
+
+        # Treat the body as if it started with CRLF so the first boundary
+        # matches the same delimiter as every later one
+        self._delimiter = b"\r\n--" + boundary
+        self._buffer = b"\r\n"
+        self._state = "preamble"
+        self._field_name: Optional[str] = None
+        self._field_value = b""
+        self._file: Optional[UploadedFile] = None
+
+    def feed(self, data: bytes) -> None:
+        """
+        Consume the next chunk of the request body.
+
+        Raises:
+            ValueError: If the body is malformed or a part is rejected
+        """
+        self._buffer += data
+        while self._step():
+            pass
+
+    def close(self) -> None:
+        """
+        Finish parsing and close any open files.
+
+        Raises:
+            ValueError: If the body ended before the closing boundary
+        """
+        self._close_part()
+        if not self.complete:
+            raise ValueError("Incomplete multipart body")
+
+    def discard(self) -> None:
+        """Close and delete every file written so far"""
+        self._close_part()
+        for uploaded in self.files.values():
+            if os.path.exists(uploaded.path):
+                os.remove(uploaded.path)
+        self.files.clear()
+
+    def _step(self) -> bool:
+        """Advance the state machine; returns False when more data is needed"""
+        if self._state == "preamble":
+            index = self._buffer.find(self._delimiter)
+            if index == -1:
+                # Keep just enough to match a delimiter split across chunks
+                self._buffer = self._buffer[-len(self._delimiter) :]
+                return False
+            self._buffer = self._buffer[index + len(self._delimiter) :]
+            self._state = "boundary"
+            return True
+
+        if self._state == "boundary":
+            if len(self._buffer) < 2:
+                return False
+            marker, self._buffer = self._buffer[:2], self._buffer[2:]
+            if marker == b"--":
+                self._state = "epilogue"
+                self.complete = True
+            elif marker == b"\r\n":
+                self._state = "headers"
+            else:
+                raise ValueError("Malformed multipart boundary")
+            return True
+
+        if self._state == "headers":
+            index = self._buffer.find(b"\r\n\r\n")
+            if index == -1:
+                if len(self._buffer) > self.MAX_HEADER_BYTES:
+                    raise ValueError("Multipart part headers too large")
+                return False
+            headers = self._buffer[:index].decode("utf-8", errors="replace")
+            self._buffer = self._buffer[index + 4 :]
+            self._open_part(headers)
+            self._state = "body"
+            return True
+
+        if self._state == "body":
+            index = self._buffer.find(self._delimiter)
+            if index == -1:
+                keep = len(self._delimiter) - 1
+                if len(self._buffer) > keep:
+                    self._write(self._buffer[:-keep])
+                    self._buffer = self._buffer[-keep:]
+                return False
+            self._write(self._buffer[:index])
+            self._buffer = self._buffer[index + len(self._delimiter) :]
+            self._close_part()
+            self._state = "boundary"
+            return True
+
+        # Anything after the closing boundary is ignored
+        self._buffer = b""
+        return False
+
+    def _open_part(self, raw_headers: str) -> None:
+        disposition = Message()
+        for line in raw_headers.split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-disposition":
+                disposition["content-disposition"] = value.strip()
+
+        name = disposition.get_param("name", header="content-disposition")
+        if not name:
+            raise ValueError("Multipart part without a name")
+        filename = disposition.get_filename()
+
+        if filename is None:
+            self._field_name = name
+            self._field_value = b""
+            return
+
+        filename = os.path.basename(filename)
+        if self.validate_filename:
+            self.validate_filename(filename)
+
+        # Create unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self._file = UploadedFile(
+            filename, os.path.join(self.upload_dir, f"{timestamp}_{filename}")
+        )
+        self.files[name] = self._file
+
+    def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        if self._file is not None:
+            self._file.write(data)
+            return
+        self._field_value += data
+        if len(self._field_value) > self.MAX_FIELD_BYTES:
+            raise ValueError(f"Form field '{self._field_name}' too large")
+
+    def _close_part(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        elif self._field_name is not None:
+            self.fields[self._field_name] = self._field_value.decode("utf-8")
+            self._field_name = None
@@ -0,0 +1,146 @@
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+import pymysql
+
+# Every column with its key flags and, for FK columns, the referenced column.
+# COLUMN_KEY already tells primary and unique keys apart, so the only join
+# needed is KEY_COLUMN_USAGE for the foreign keys.
+_SCHEMA_QUERY = """
+SELECT c.TABLE_NAME, c.COLUMN_NAME, c.COLUMN_TYPE, c.IS_NULLABLE, c.COLUMN_KEY,
+       k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME
+FROM information_schema.COLUMNS c
+LEFT JOIN information_schema.KEY_COLUMN_USAGE k
+       ON k.TABLE_SCHEMA = c.TABLE_SCHEMA
+      AND k.TABLE_NAME = c.TABLE_NAME
+      AND k.COLUMN_NAME = c.COLUMN_NAME
+      AND k.REFERENCED_TABLE_NAME IS NOT NULL
+WHERE c.TABLE_SCHEMA = %s
+ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+# Cheap check for schema changes: one row per table from the data dictionary
+_FINGERPRINT_QUERY = """
+SELECT TABLE_NAME, CREATE_TIME, UPDATE_TIME
+FROM information_schema.TABLES
+WHERE TABLE_SCHEMA = %s
+ORDER BY TABLE_NAME
+"""
+
+
+class SchemaIntrospector:
+    """
+    Reads table and column metadata of a MySQL database.
+
+    Snapshots are cached per database and keyed by a fingerprint of the table
+    list and each table's CREATE_TIME/UPDATE_TIME, so repeated reads of an
+    unchanged schema cost one light query instead of the full introspection.
+    """
+
+    _cache: Dict[Tuple, Tuple[str, Dict]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(config: Dict) -> Tuple:
+        return (
+            config.get("host"),
+            config.get("port", 3306),
+            config.get("database"),
+        )
+
+    @classmethod
+    def get_tables(cls, config: Dict) -> Dict:
+        """
+        Metadata of every table in the configured database.
+
+        Args:
+            config (dict): pymysql connection arguments, including `database`
+
+        Returns:
+            Dict of table name to {"columns": [...]}, each column having
+            column_name, column_type, is_nullable ("YES"/"NO"), is_unique and
+            relation ("PRIMARY", a FOREIGN KEY description or None). The
+            snapshot is shared between callers and must not be modified.
+        """
+        key = cls._cache_key(config)
+        connection = pymysql.connect(**config, cursorclass=pymysql.cursors.DictCursor)
+        try:
+            with connection.cursor() as cursor:
+                fingerprint = cls._fingerprint(cursor, config["database"])
+                with cls._lock:
+                    cached = cls._cache.get(key)
+                if cached and cached[0] == fingerprint:
+                    return cached[1]
+
+                cursor.execute(_SCHEMA_QUERY, (config["database"],))
+                tables = cls._build_tables(cursor.fetchall())
+        finally:
+            connection.close()
+
+        with cls._lock:
+            cls._cache[key] = (fingerprint, tables)
+        return tables
+
+    @classmethod
+    def invalidate(cls, config: Optional[Dict] = None) -> None:
+        """
+        Drop the cached snapshot of a database, or of every database.
+
+        Needed after DDL that can finish within the same second as the cached
+        read, since CREATE_TIME only has second resolution.
+        """
+        with cls._lock:
+            if config is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(cls._cache_key(config), None)
+
+    @staticmethod
+    def _fingerprint(cursor, database: str) -> str:
+        try:
+            # MySQL 8 serves table times from a stats cache that is refreshed
+            # daily by default; read them from the storage engine instead
+            cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+        except pymysql.MySQLError:
+            pass  # Older servers have no stats cache
+
+        cursor.execute(_FINGERPRINT_QUERY, (database,))
+        digest = hashlib.sha256()
+        for row in cursor.fetchall():
+            digest.update(
+                f"{row['TABLE_NAME']}|{row['CREATE_TIME']}|{row['UPDATE_TIME']}\n".encode(
+                    "utf-8"
+                )
+            )
+        return digest.hexdigest()
+
+    @staticmethod
+    def _build_tables(rows) -> Dict:
+        tables: Dict[str, Dict] = {}
+        columns: Dict[Tuple[str, str], Dict] = {}
+
+        for row in rows:
+            table_name = row["TABLE_NAME"]
+            column_name = row["COLUMN_NAME"]
+
+            column = columns.get((table_name, column_name))
+            if column is None:
+                column = {
+                    "column_name": column_name,
+                    "column_type": row["COLUMN_TYPE"],
+                    "is_nullable": row["IS_NULLABLE"],
+                    "is_unique": row["COLUMN_KEY"] == "UNI",
+                    "relation": "PRIMARY" if row["COLUMN_KEY"] == "PRI" else None,
+                }
+                columns[(table_name, column_name)] = column
+                tables.setdefault(table_name, {"columns": []})["columns"].append(column)
+
+            # A column in several foreign keys yields one row per key; as
+            # before, the last one is reported
+            if row["REFERENCED_TABLE_NAME"]:
+                column["relation"] = (
+                    f"FOREIGN KEY {table_name}({column_name}) -> "
+                    f"{row['REFERENCED_TABLE_NAME']}({row['REFERENCED_COLUMN_NAME']})"
+                )
+
+        return tables
@@ -0,0 +1,287 @@
+import re
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from utils.mermaid_erd import ERDAttribute, ERDEntity, ERDiagram
+
+# Fixed type mapping; the length of plain strings is chosen from the name
+_TYPE_MAP = {
+    "uuid": "CHAR(36)",
+    "guid": "CHAR(36)",
+    "int": "INT",
+    "integer": "INT",
+    "bigint": "BIGINT",
+    "smallint": "SMALLINT",
+    "tinyint": "TINYINT",
+    "serial": "INT",
+    "float": "FLOAT",
+    "double": "DOUBLE",
+    "real": "DOUBLE",
+    "decimal": "DECIMAL(10,2)",
+    "numeric": "DECIMAL(10,2)",
+    "money": "DECIMAL(12,2)",
+    "bool": "BOOLEAN",
+    "boolean": "BOOLEAN",
+    "timestamp": "TIMESTAMP",
+    "timestamptz": "TIMESTAMP",
+    "datetime": "DATETIME",
+    "date": "DATE",
+    "time": "TIME",
+    "year": "YEAR",
+    "text": "TEXT",
+    "mediumtext": "MEDIUMTEXT",
+    "longtext": "LONGTEXT",
+    "json": "JSON",
+    "jsonb": "JSON",
+    "blob": "BLOB",
+    "binary": "BLOB",
+    "bytes": "BLOB",
+}
+_STRING_TYPES = {"string", "str", "varchar", "char"}
+_SIZED_TYPES = {"varchar", "char", "decimal", "numeric", "int", "bigint", "tinyint"}
+_INTEGER_TYPES = {"INT", "BIGINT", "SMALLINT", "TINYINT"}
+
+# Column names (or name endings) and the VARCHAR length they get
+_SHORT_NAMES = ("status", "role", "type", "code", "currency", "gender", "state", "level")
+_MEDIUM_NAMES = ("name", "slug", "username", "phone", "city", "country", "zip", "postal_code")
+_LONG_NAMES = ("email", "title", "subject", "url", "address", "path", "image", "avatar", "link")
+_TEXT_NAMES = ("description", "content", "body", "notes", "note", "bio", "summary", "details")
+
+
+class ForeignKey(BaseModel):
+    entity: str
+    column: str
+    referenced_entity: str
+    referenced_column: str
+
+    @property
+    def table(self) -> str:
+        return table_name(self.entity)
+
+    @property
+    def referenced_table(self) -> str:
+        return table_name(self.referenced_entity)
+
+    @property
+    def constraint_name(self) -> str:
+        return f"fk_{self.table}_{self.column}"[:64]
+
+    def to_clause(self) -> str:
+        """FOREIGN KEY clause usable inside CREATE TABLE or ALTER TABLE"""
+        return (
+            f"CONSTRAINT `{self.constraint_name}` FOREIGN KEY (`{self.column}`) "
+            f"REFERENCES `{self.referenced_table}` (`{self.referenced_column}`) "
+            "ON DELETE CASCADE ON UPDATE CASCADE"
+        )
+
+    def to_sql(self) -> str:
+        return f"ALTER TABLE `{self.table}` ADD {self.to_clause()};"
+
+
+class CompiledSchema(BaseModel):
+    tables: Dict[str, str] = Field(
+        default_factory=dict, description="Entity name to CREATE TABLE statement"
+    )
+    foreign_keys: List[ForeignKey] = Field(default_factory=list)
+    fallback_entities: List[str] = Field(
+        default_factory=list, description="Entities the compiler could not handle"
+    )
+    unresolved_foreign_keys: List[str] = Field(
+        default_factory=list, description="ENTITY.column FKs without a known target"
+    )
+
+
+def table_name(entity_name: str) -> str:
+    """Table name used for an entity"""
+    return entity_name.lower().replace("-", "_")
+
+
+def _normalize(name: str) -> str:
+    name = name.lower().replace("_", "").replace("-", "")
+    for suffix in ("ies", "es", "s"):
+        if name.endswith(suffix) and len(name) > len(suffix) + 2:
+            return name[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return name
+
+
+def _comment_flags(attr: ERDAttribute) -> str:
+    return (attr.comment or "").lower()
+
+
+def _enum_values(comment: str) -> List[str]:
+    match = re.search(r"enum\s*[:(]\s*([^)]+)\)?", comment, re.IGNORECASE)
+    if not match:
+        return []
+    values = re.split(r"[,|/]", match.group(1))
+    return [value.strip().strip("'\"") for value in values if value.strip()]
+
+
+def _varchar_length(column: str) -> int:
+    name = column.lower()
+    if name.endswith(_SHORT_NAMES):
+        return 50
+    if name.endswith(_LONG_NAMES):
+        return 255
+    if name.endswith(_MEDIUM_NAMES):
+        return 100
+    return 150
+
+
+def column_type(attr: ERDAttribute) -> Optional[str]:
+    """
+    MySQL type for an attribute, or None if it cannot be mapped.
+
+    Explicit sizes such as varchar(120) or decimal(12,4) are kept.
+    """
+    match = re.match(r"^([A-Za-z_]+)(?:\(([^)]*)\))?$", attr.type)
+    if not match:
+        return None
+    base, size = match.group(1).lower(), match.group(2)
+
+    if base == "enum":
+        values = [v.strip().strip("'\"") for v in size.split(",")] if size else []
+        values = values or _enum_values(attr.comment or "")
+        if not values:
+            # Allowed values aren't in the diagram; keep it a short string
+            return "VARCHAR(50)"
+        quoted = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+        return f"ENUM({quoted})"
+
+    if size and base in _SIZED_TYPES:
+        return f"{base.upper()}({size})"
+
+    if base in _STRING_TYPES:
+        if attr.name.lower().endswith(_TEXT_NAMES):
+            return "TEXT"
+        return f"VARCHAR({_varchar_length(attr.name)})"
+
+    return _TYPE_MAP.get(base)
+
+
+def _resolve_foreign_key(
+    diagram: ERDiagram, entity: ERDEntity, attr: ERDAttribute
+) -> Optional[ERDEntity]:
+    """Find the entity an FK attribute points to, using names and relationships"""
+    related = [
+        diagram.entities[name]
+        for name in diagram.related_entities(entity.name)
+        if name in diagram.entities
+    ]
+
+    base = re.sub(r"(_id|_uuid|id)$", "", attr.name, flags=re.IGNORECASE)
+    if base:
+        wanted = _normalize(base)
+        for candidates in (related, list(diagram.entities.values())):
+            for candidate in candidates:
+                if _normalize(candidate.name) == wanted:
+                    return candidate
+            # Prefixed names like created_by_user_id or parent_category_id
+            for candidate in candidates:
+                if wanted.endswith(_normalize(candidate.name)):
+                    return candidate
+
+    # A single relationship leaves no doubt about the target
+    others = [candidate for candidate in related if candidate.name != entity.name]
+    if len(others) == 1:
+        return others[0]
+    return None
+
+
+def compile_mysql(diagram: ERDiagram) -> CompiledSchema:
+    """
+    Compile a parsed ERD into MySQL CREATE TABLE and FOREIGN KEY statements.
+
+    Entities using types the compiler doesn't know, and FK columns whose
+    target can't be worked out, are reported instead of guessed so callers
+    can hand just those to another strategy.
+
+    Args:
+        diagram (ERDiagram): Parsed diagram
+
+    Returns:
+        CompiledSchema
+    """
+    schema = CompiledSchema()
+
+    # Referenced key types first, so FK columns can match them exactly
+    key_types: Dict[str, str] = {}
+    for entity in diagram.entities.values():
+        for attr in entity.primary_keys:
+            sql_type = column_type(attr)
+            if sql_type:
+                key_types[f"{entity.name}.{attr.name}"] = sql_type
+
+    for entity in diagram.entities.values():
+        if not entity.attributes:
+            schema.fallback_entities.append(entity.name)
+            continue
+
+        primary_keys = entity.primary_keys
+        foreign_keys: Dict[str, ForeignKey] = {}
+        for attr in entity.attributes:
+            if not attr.is_foreign_key:
+                continue
+            target = _resolve_foreign_key(diagram, entity, attr)
+            if target is None or len(target.primary_keys) != 1:
+                schema.unresolved_foreign_keys.append(f"{entity.name}.{attr.name}")
+                continue
+            foreign_keys[attr.name] = ForeignKey(
+                entity=entity.name,
+                column=attr.name,
+                referenced_entity=target.name,
+                referenced_column=target.primary_keys[0].name,
+            )
+
+        columns, extras = [], []
+        for attr in entity.attributes:
+            fk = foreign_keys.get(attr.name)
+            sql_type = (
+                key_types.get(f"{fk.referenced_entity}.{fk.referenced_column}")
+                if fk
+                else None
+            ) or column_type(attr)
+            if sql_type is None:
+                break
+
+            flags = _comment_flags(attr)
+            parts = [f"`{attr.name}`", sql_type]
+
+            single_pk = attr.is_primary_key and len(primary_keys) == 1
+            if attr.is_primary_key or "not null" in flags or "required" in flags:
+                parts.append("NOT NULL")
+            elif "soft delete" in flags or "nullable" in flags:
+                parts.append("NULL")
+
+            name = attr.name.lower()
+            if sql_type in ("TIMESTAMP", "DATETIME") and name in ("created_at", "updated_at"):
+                parts.append("DEFAULT CURRENT_TIMESTAMP")
+                if name == "updated_at":
+                    parts.append("ON UPDATE CURRENT_TIMESTAMP")
+
+            if single_pk:
+                if sql_type in _INTEGER_TYPES and not attr.is_foreign_key:
+                    parts.append("AUTO_INCREMENT")
+                parts.append("PRIMARY KEY")
+            elif ("UK" in attr.keys or "unique" in flags) and sql_type != "TEXT":
+                parts.append("UNIQUE")
+
+            if "index" in flags and not single_pk and sql_type != "TEXT":
+                index_name = f"idx_{table_name(entity.name)}_{attr.name}"[:64]
+                extras.append(f"INDEX `{index_name}` (`{attr.name}`)")
+
+            columns.append(" ".join(parts))
+        else:
+            if len(primary_keys) > 1:
+                keys = ", ".join(f"`{attr.name}`" for attr in primary_keys)
+                extras.insert(0, f"PRIMARY KEY ({keys})")
+
+            body = ",\n    ".join(columns + extras)
+            schema.tables[entity.name] = (
+                f"CREATE TABLE `{table_name(entity.name)}` (\n    {body}\n);"
+            )
+            schema.foreign_keys.extend(foreign_keys.values())
+            continue
+
+        # An attribute type had no mapping
+        schema.fallback_entities.append(entity.name)
+
+    return schema